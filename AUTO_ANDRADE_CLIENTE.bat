@@ -17,6 +17,9 @@ for /f "tokens=5" %%a in ('netstat -aon ^| findstr :3000') do (
 REM Esperar 3 segundos para que se liberen los puertos
 timeout /t 3 /nobreak >nul
 
+REM Modo produccion: desactiva los logs de depuracion del backend
+set APP_ENV=production
+
 REM Crear archivos VBS para ejecutar comandos completamente invisibles
 echo Set WshShell = CreateObject("WScript.Shell") > start_backend.vbs
 echo WshShell.Run "cmd /c ""py -m uvicorn app.main:app --host 0.0.0.0 --port 8000""", 0, True >> start_backend.vbs
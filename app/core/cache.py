@@ -0,0 +1,346 @@
+"""
+Caché de respuestas de lectura invalidada por versión de tabla.
+
+Cada tabla tiene un contador de versión que aumenta cuando se confirma
+(commit) una transacción que la modificó. Una respuesta cacheada guarda las
+versiones de las tablas que leyó; si alguna cambió, la entrada ya no es válida.
+Así la invalidación es exacta y no depende de un TTL.
+
+Las tablas modificadas se detectan con eventos de la sesión de SQLAlchemy:
+- after_flush: objetos nuevos, modificados y eliminados (y las tablas que
+  dependen de las eliminadas por ON DELETE CASCADE / SET NULL);
+- do_orm_execute: UPDATE/DELETE masivos (query.update(), query.delete()) y
+  sentencias text() de escritura;
+- after_commit / after_rollback: se confirman o descartan las versiones.
+
+Las escrituras hechas fuera de una sesión (engine.begin()) deben avisar con
+invalidar_tablas().
+
+Por defecto (CACHE_URL=memoria://) la caché vive en memoria de cada proceso.
+Con CACHE_URL=redis://... las versiones se comparten entre workers y máquinas y
+se propagan por un canal de pub/sub (ver app.core.cache_compartida); la LRU en
+memoria queda como primer nivel delante de Redis.
+
+Uso:
+    @router.get("/totales")
+    @cache_respuesta("clientes", "carros", "trabajos")
+    def obtener_totales(db: Session = Depends(get_db)): ...
+"""
+import functools
+import inspect
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+from app.core import config
+from app.core.cache_compartida import CacheCompartida, crear_cliente
+
+logger = logging.getLogger(__name__)
+
+CLAVE_TABLAS_SESION = "cache_tablas_modificadas"
+
+_RE_ESCRITURA = re.compile(
+    r"^\s*(?:UPDATE|INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|DELETE\s+FROM)\s+[`\"]?(\w+)",
+    re.IGNORECASE,
+)
+
+
+class VersionesTablas:
+    """Contadores de versión por tabla"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versiones: Dict[str, int] = {}
+
+    def obtener(self, tablas: Iterable[str]) -> Tuple[int, ...]:
+        versiones = self._versiones
+        return tuple(versiones.get(t, 0) for t in tablas)
+
+    def incrementar(self, tablas: Iterable[str]) -> None:
+        with self._lock:
+            for tabla in tablas:
+                self._versiones[tabla] = self._versiones.get(tabla, 0) + 1
+
+    def reiniciar(self) -> None:
+        with self._lock:
+            self._versiones = {}
+
+    def actualizar(self, nuevas: Dict[str, int]) -> None:
+        """Aplica versiones recibidas de la caché compartida (nunca retroceden)"""
+        with self._lock:
+            for tabla, version in nuevas.items():
+                if version > self._versiones.get(tabla, 0):
+                    self._versiones[tabla] = version
+
+
+class CacheRespuestas:
+    """Caché LRU acotada en cantidad de entradas"""
+
+    def __init__(self, max_entradas: int):
+        self.max_entradas = max_entradas
+        self._lock = threading.Lock()
+        self._entradas: "OrderedDict[Hashable, Tuple[Tuple[int, ...], object]]" = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave: Hashable, versiones: Tuple[int, ...]):
+        """Devuelve (True, valor) si hay una entrada vigente para las versiones dadas"""
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and entrada[0] == versiones:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return True, entrada[1]
+            if entrada is not None:
+                del self._entradas[clave]
+            self.fallos += 1
+            return False, None
+
+    def guardar(self, clave: Hashable, versiones: Tuple[int, ...], valor) -> None:
+        with self._lock:
+            self._entradas[clave] = (versiones, valor)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def texto_prometheus(self) -> str:
+        return (
+            "# HELP response_cache_hits_total Respuestas servidas desde la caché\n"
+            "# TYPE response_cache_hits_total counter\n"
+            f"response_cache_hits_total {self.aciertos}\n"
+            "# HELP response_cache_misses_total Respuestas calculadas por no estar en la caché\n"
+            "# TYPE response_cache_misses_total counter\n"
+            f"response_cache_misses_total {self.fallos}\n"
+            "# HELP response_cache_entries Entradas en la caché de respuestas\n"
+            "# TYPE response_cache_entries gauge\n"
+            f"response_cache_entries {len(self)}\n"
+        )
+
+
+versiones = VersionesTablas()
+cache = CacheRespuestas(config.CACHE_MAX_ENTRADAS)
+compartida: Optional[CacheCompartida] = None
+
+
+def configurar_cache_compartida(url: Optional[str] = None) -> Optional[CacheCompartida]:
+    """
+    Conecta la caché compartida según CACHE_URL y empieza a escuchar el canal de
+    invalidación. Se llama al iniciar cada worker (no antes de un fork).
+    """
+    global compartida
+    url = config.CACHE_URL if url is None else url
+    detener_cache_compartida()
+    if not url or url.startswith("memoria://"):
+        return None
+    compartida = CacheCompartida(crear_cliente(url), prefijo=config.CACHE_PREFIJO, ttl=config.CACHE_TTL_SEGUNDOS)
+    # A partir de aquí las versiones locales son una copia de las de Redis
+    versiones.reiniciar()
+    cache.limpiar()
+    compartida.escuchar(versiones.actualizar)
+    return compartida
+
+
+def detener_cache_compartida() -> None:
+    global compartida
+    if compartida is not None:
+        compartida.detener()
+        compartida = None
+
+
+def _incrementar(tablas: Iterable[str]) -> None:
+    if compartida is None:
+        versiones.incrementar(tablas)
+        return
+    try:
+        versiones.actualizar(compartida.incrementar(tablas))
+    except Exception:
+        # Los demás workers no se enteran de esta escritura; al menos este queda coherente.
+        # No se incrementan las versiones locales para no adelantarlas a las de Redis.
+        logger.exception("No se pudo publicar la invalidación de %s", sorted(tablas))
+        cache.limpiar()
+
+
+def invalidar_tablas(*tablas: str) -> None:
+    """Invalida las respuestas que dependen de las tablas (escrituras fuera de una sesión)"""
+    _incrementar(tablas)
+
+
+def texto_prometheus() -> str:
+    texto = cache.texto_prometheus()
+    if compartida is not None:
+        texto += compartida.texto_prometheus()
+    return texto
+
+
+# ========================================
+# DECORADOR
+# ========================================
+
+def _congelar(valor) -> Hashable:
+    if isinstance(valor, (list, tuple, set)):
+        return tuple(_congelar(v) for v in valor)
+    if isinstance(valor, dict):
+        return tuple(sorted((k, _congelar(v)) for k, v in valor.items()))
+    return valor
+
+
+def _clave(funcion, kwargs) -> Hashable:
+    parametros = tuple(sorted(
+        (nombre, _congelar(valor)) for nombre, valor in kwargs.items() if not isinstance(valor, Session)
+    ))
+    return (funcion.__module__, funcion.__qualname__, parametros)
+
+
+def _buscar(clave: Hashable, vigentes: Tuple[int, ...]):
+    encontrado, valor = cache.obtener(clave, vigentes)
+    if not encontrado and compartida is not None:
+        encontrado, valor = compartida.obtener(clave, vigentes)
+        if encontrado:
+            cache.guardar(clave, vigentes, valor)
+    return encontrado, valor
+
+
+def _guardar(clave: Hashable, vigentes: Tuple[int, ...], valor) -> None:
+    cache.guardar(clave, vigentes, valor)
+    if compartida is not None:
+        compartida.guardar(clave, vigentes, valor)
+
+
+def cache_respuesta(*tablas: str):
+    """
+    Cachea el resultado de un endpoint de lectura según sus parámetros y las
+    versiones de las tablas que lee. El resultado se comparte entre peticiones:
+    debe ser un valor que no se modifique después (dicts, listas, modelos Pydantic),
+    no objetos ORM ligados a la sesión. Con la caché compartida además debe
+    poder serializarse con pickle.
+    """
+    def decorador(funcion):
+        if inspect.iscoroutinefunction(funcion):
+            @functools.wraps(funcion)
+            async def envoltura(*args, **kwargs):
+                if not config.CACHE_RESPUESTAS:
+                    return await funcion(*args, **kwargs)
+                clave = _clave(funcion, kwargs)
+                vigentes = versiones.obtener(tablas)
+                encontrado, valor = _buscar(clave, vigentes)
+                if not encontrado:
+                    valor = await funcion(*args, **kwargs)
+                    _guardar(clave, vigentes, valor)
+                return valor
+        else:
+            @functools.wraps(funcion)
+            def envoltura(*args, **kwargs):
+                if not config.CACHE_RESPUESTAS:
+                    return funcion(*args, **kwargs)
+                clave = _clave(funcion, kwargs)
+                # Las versiones se leen antes de consultar: si hay una escritura mientras
+                # tanto, la entrada queda con versiones viejas y no se vuelve a usar
+                vigentes = versiones.obtener(tablas)
+                encontrado, valor = _buscar(clave, vigentes)
+                if not encontrado:
+                    valor = funcion(*args, **kwargs)
+                    _guardar(clave, vigentes, valor)
+                return valor
+
+        envoltura.tablas_cache = tablas
+        return envoltura
+
+    return decorador
+
+
+# ========================================
+# EVENTOS DE LA SESIÓN
+# ========================================
+
+_dependientes: Optional[Dict[str, Set[str]]] = None
+
+
+def _tablas_dependientes(tabla: str) -> Set[str]:
+    """Tablas que cambian en cascada (ON DELETE CASCADE / SET NULL) al eliminar filas de `tabla`"""
+    global _dependientes
+    if _dependientes is None:
+        from app.models.database import Base
+
+        dependientes: Dict[str, Set[str]] = {}
+        for t in Base.metadata.tables.values():
+            for fk in t.foreign_keys:
+                if fk.ondelete:
+                    dependientes.setdefault(fk.column.table.name, set()).add(t.name)
+        _dependientes = dependientes
+
+    resultado, pendientes = set(), [tabla]
+    while pendientes:
+        for dependiente in _dependientes.get(pendientes.pop(), ()):
+            if dependiente not in resultado:
+                resultado.add(dependiente)
+                pendientes.append(dependiente)
+    return resultado
+
+
+def _marcar(session: Session, tablas: Iterable[str]) -> None:
+    session.info.setdefault(CLAVE_TABLAS_SESION, set()).update(tablas)
+
+
+def _despues_de_flush(session, flush_context):
+    tablas = set()
+    for obj in session.new:
+        tablas.add(obj.__table__.name)
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            tablas.add(obj.__table__.name)
+    for obj in session.deleted:
+        tablas.add(obj.__table__.name)
+        tablas |= _tablas_dependientes(obj.__table__.name)
+    if tablas:
+        _marcar(session, tablas)
+
+
+def _al_ejecutar(orm_execute_state):
+    sentencia = orm_execute_state.statement
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        tabla = sentencia.table.name
+        tablas = {tabla}
+        if orm_execute_state.is_delete:
+            tablas |= _tablas_dependientes(tabla)
+        _marcar(orm_execute_state.session, tablas)
+    elif isinstance(sentencia, TextClause):
+        coincidencia = _RE_ESCRITURA.match(sentencia.text)
+        if coincidencia:
+            tabla = coincidencia.group(1)
+            tablas = {tabla}
+            if sentencia.text.lstrip()[:6].upper() == "DELETE":
+                tablas |= _tablas_dependientes(tabla)
+            _marcar(orm_execute_state.session, tablas)
+
+
+def _despues_de_commit(session):
+    tablas = session.info.pop(CLAVE_TABLAS_SESION, None)
+    if tablas:
+        _incrementar(tablas)
+
+
+def _despues_de_rollback(session):
+    session.info.pop(CLAVE_TABLAS_SESION, None)
+
+
+def instalar_eventos_cache() -> None:
+    """Registra los eventos de sesión que versionan las tablas (idempotente)"""
+    if event.contains(Session, "after_flush", _despues_de_flush):
+        return
+    event.listen(Session, "after_flush", _despues_de_flush)
+    event.listen(Session, "do_orm_execute", _al_ejecutar)
+    event.listen(Session, "after_commit", _despues_de_commit)
+    event.listen(Session, "after_rollback", _despues_de_rollback)
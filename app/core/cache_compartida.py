@@ -0,0 +1,182 @@
+"""
+Caché de respuestas compartida entre workers y máquinas (protocolo de Redis).
+
+Con varios workers de uvicorn cada proceso tiene su propia caché en memoria
+(app.core.cache); sin coordinación, una escritura en un worker no invalida las
+respuestas cacheadas en los demás. Con CACHE_URL=redis://... :
+
+- las versiones de las tablas viven en un hash de Redis; al confirmar una
+  transacción el worker las incrementa (HINCRBY) y publica las nuevas versiones
+  en un canal de pub/sub;
+- cada worker escucha el canal en un hilo y actualiza su copia local de las
+  versiones, de modo que leerlas no cuesta un viaje de red por petición;
+- las respuestas calculadas se guardan también en Redis (pickle, con TTL de
+  seguridad), así un worker aprovecha lo que calculó otro.
+
+Para pruebas y desarrollo sin servidor, CACHE_URL=fakeredis:// usa fakeredis
+(pip install fakeredis), que implementa el mismo protocolo en memoria dentro
+del proceso.
+
+Si Redis no responde la caché falla abierta: las lecturas cuentan como fallo y
+las respuestas se calculan normalmente.
+"""
+import hashlib
+import json
+import logging
+import pickle
+import threading
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - dependencia opcional
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Tiempo máximo de espera de Redis en el camino de la petición, en segundos
+TIEMPO_ESPERA = 0.5
+
+_servidor_falso = None
+
+
+def crear_cliente(url: str):
+    """Cliente de Redis para la URL (redis://, rediss://, unix:// o fakeredis://)"""
+    if url.startswith("fakeredis://"):
+        import fakeredis
+
+        global _servidor_falso
+        if _servidor_falso is None:
+            _servidor_falso = fakeredis.FakeServer()
+        return fakeredis.FakeRedis(server=_servidor_falso)
+    if redis is None:
+        raise RuntimeError("CACHE_URL con Redis requiere el paquete redis (pip install redis)")
+    return redis.Redis.from_url(
+        url,
+        socket_timeout=TIEMPO_ESPERA,
+        socket_connect_timeout=TIEMPO_ESPERA,
+        health_check_interval=30,
+    )
+
+
+class CacheCompartida:
+    """Versiones de tablas, entradas y canal de invalidación en Redis"""
+
+    def __init__(self, cliente, prefijo: str = "auto_andrade", ttl: int = 86400):
+        self.cliente = cliente
+        self.ttl = ttl
+        self.clave_versiones = f"{prefijo}:versiones"
+        self.canal = f"{prefijo}:invalidaciones"
+        self.prefijo_entradas = f"{prefijo}:respuesta:"
+        self.aciertos = 0
+        self.fallos = 0
+        self.errores = 0
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    # ========================================
+    # VERSIONES
+    # ========================================
+
+    def versiones(self) -> Dict[str, int]:
+        return {
+            tabla.decode(): int(version)
+            for tabla, version in self.cliente.hgetall(self.clave_versiones).items()
+        }
+
+    def incrementar(self, tablas: Iterable[str]) -> Dict[str, int]:
+        """Incrementa las versiones y publica las nuevas; devuelve {tabla: versión}"""
+        tablas = sorted(tablas)
+        with self.cliente.pipeline() as pipe:
+            for tabla in tablas:
+                pipe.hincrby(self.clave_versiones, tabla, 1)
+            resultados = pipe.execute()
+        nuevas = dict(zip(tablas, resultados))
+        self.cliente.publish(self.canal, json.dumps(nuevas))
+        return nuevas
+
+    # ========================================
+    # ENTRADAS
+    # ========================================
+
+    def _clave(self, clave: Hashable) -> str:
+        return self.prefijo_entradas + hashlib.sha1(repr(clave).encode("utf-8")).hexdigest()
+
+    def obtener(self, clave: Hashable, versiones: Tuple[int, ...]):
+        """Devuelve (True, valor) si hay una entrada vigente para las versiones dadas"""
+        try:
+            datos = self.cliente.get(self._clave(clave))
+            entrada = pickle.loads(datos) if datos is not None else None
+        except Exception as e:
+            self.errores += 1
+            logger.warning("No se pudo leer la caché compartida: %s", e)
+            entrada = None
+        if entrada is not None and entrada[0] == versiones:
+            self.aciertos += 1
+            return True, entrada[1]
+        self.fallos += 1
+        return False, None
+
+    def guardar(self, clave: Hashable, versiones: Tuple[int, ...], valor) -> None:
+        try:
+            datos = pickle.dumps((versiones, valor), protocol=pickle.HIGHEST_PROTOCOL)
+            self.cliente.set(self._clave(clave), datos, ex=self.ttl)
+        except Exception as e:
+            self.errores += 1
+            logger.warning("No se pudo guardar en la caché compartida: %s", e)
+
+    # ========================================
+    # CANAL DE INVALIDACIÓN
+    # ========================================
+
+    def escuchar(self, al_invalidar: Callable[[Dict[str, int]], None]) -> None:
+        """
+        Inicia un hilo que llama a al_invalidar({tabla: versión}) con cada
+        publicación del canal. Al (re)conectar se leen todas las versiones para
+        no perder las publicadas mientras no había suscripción.
+        """
+        if self._hilo is not None:
+            return
+
+        def bucle():
+            while not self._detener.is_set():
+                pubsub = self.cliente.pubsub(ignore_subscribe_messages=True)
+                try:
+                    pubsub.subscribe(self.canal)
+                    al_invalidar(self.versiones())
+                    while not self._detener.is_set():
+                        mensaje = pubsub.get_message(timeout=1.0)
+                        if mensaje is not None and mensaje["type"] == "message":
+                            al_invalidar({t: int(v) for t, v in json.loads(mensaje["data"]).items()})
+                except Exception as e:
+                    self.errores += 1
+                    logger.warning("Canal de invalidación desconectado, reintentando: %s", e)
+                    self._detener.wait(1.0)
+                finally:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+        self._detener.clear()
+        self._hilo = threading.Thread(target=bucle, name="cache-invalidaciones", daemon=True)
+        self._hilo.start()
+
+    def detener(self) -> None:
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout=5)
+            self._hilo = None
+
+    def texto_prometheus(self) -> str:
+        return (
+            "# HELP response_cache_shared_hits_total Respuestas servidas desde la caché compartida\n"
+            "# TYPE response_cache_shared_hits_total counter\n"
+            f"response_cache_shared_hits_total {self.aciertos}\n"
+            "# HELP response_cache_shared_misses_total Consultas a la caché compartida sin entrada vigente\n"
+            "# TYPE response_cache_shared_misses_total counter\n"
+            f"response_cache_shared_misses_total {self.fallos}\n"
+            "# HELP response_cache_shared_errors_total Errores de comunicación con la caché compartida\n"
+            "# TYPE response_cache_shared_errors_total counter\n"
+            f"response_cache_shared_errors_total {self.errores}\n"
+        )
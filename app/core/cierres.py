@@ -0,0 +1,181 @@
+"""
+Protección de los periodos cerrados (meses y quincenas con cierre).
+
+Una escritura que cambia los montos de un periodo cerrado se rechaza con
+PeriodoCerradoError (HTTP 409). Se revisan con eventos de la sesión:
+- before_flush: objetos nuevos, modificados y eliminados del ORM; en los
+  modificados se revisan la fecha nueva y la anterior;
+- do_orm_execute: UPDATE/DELETE masivos; antes de ejecutarlos se consultan
+  las fechas de las filas afectadas.
+
+La fecha que decide el periodo es la misma del estado de resultados:
+trabajos.fecha (también para sus detalles_gastos y comisiones_mecanicos),
+gastos_taller.fecha_gasto y pagos_salarios.fecha_pago. En las modificaciones
+del ORM solo cuentan las columnas que forman parte de la foto del cierre
+(COLUMNAS_CIERRE): cambiar la descripción de un trabajo cerrado está permitido.
+
+Los rangos cerrados se leen de cierres_periodo en cada flush (o UPDATE/DELETE
+masivo) que toca una tabla protegida; la tabla es chica y así todos los
+workers ven un cierre nuevo sin depender de una caché compartida. Las demás
+escrituras y las lecturas no agregan consultas.
+
+La lectura es con bloqueo compartido (FOR SHARE): CierreService.cerrar inserta
+su fila en cierres_periodo antes de calcular la foto, así que espera a que
+terminen las transacciones que ya revisaron los rangos, y las que revisan
+después esperan al cierre y lo ven.
+"""
+from datetime import date, datetime
+from typing import Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.models.cierres import CierrePeriodo
+from app.models.comisiones_mecanicos import ComisionMecanico
+from app.models.detalle_gastos import DetalleGasto
+from app.models.gastos_taller import GastoTaller
+from app.models.pagos_salarios import PagoSalario
+from app.models.trabajos import Trabajo
+
+# Columna de fecha de cada tabla protegida; None: se usa la fecha del trabajo
+COLUMNAS_FECHA = {
+    "trabajos": "fecha",
+    "detalles_gastos": None,
+    "comisiones_mecanicos": None,
+    "gastos_taller": "fecha_gasto",
+    "pagos_salarios": "fecha_pago",
+}
+# Columnas que alimentan los montos congelados del cierre
+COLUMNAS_CIERRE = {
+    "trabajos": ("fecha", "costo", "mano_obra", "markup_repuestos", "aplica_iva"),
+    "detalles_gastos": ("id_trabajo", "monto"),
+    "comisiones_mecanicos": ("id_trabajo", "id_mecanico", "monto_comision", "estado_comision"),
+    "gastos_taller": ("fecha_gasto", "monto", "estado"),
+    "pagos_salarios": ("fecha_pago", "id_mecanico", "monto_salario"),
+}
+_MODELOS = {
+    "trabajos": Trabajo,
+    "detalles_gastos": DetalleGasto,
+    "comisiones_mecanicos": ComisionMecanico,
+    "gastos_taller": GastoTaller,
+    "pagos_salarios": PagoSalario,
+}
+
+
+Rango = Tuple[str, date, date]  # (periodo, inicio, fin exclusivo)
+
+
+class PeriodoCerradoError(HTTPException):
+    """Escritura que modificaría un periodo cerrado"""
+
+    def __init__(self, periodo: str):
+        super().__init__(
+            status_code=409,
+            detail=f"El periodo {periodo} está cerrado; registre la corrección como un ajuste en un periodo abierto",
+        )
+        self.periodo = periodo
+
+
+def rangos_cerrados(session: Session, bloquear: bool = False) -> List[Rango]:
+    """
+    Rangos de cierres_periodo; con bloquear=True se leen con bloqueo compartido hasta
+    el fin de la transacción. Un error de la lectura (espera de bloqueo agotada,
+    deadlock, tabla inexistente) se propaga y aborta la escritura: sin saber qué
+    periodos están cerrados no se deja pasar ninguna.
+    """
+    consulta = select(CierrePeriodo.periodo, CierrePeriodo.inicio, CierrePeriodo.fin)
+    if bloquear:
+        consulta = consulta.with_for_update(read=True)
+    return [(f.periodo, f.inicio, f.fin) for f in session.connection().execute(consulta)]
+
+
+def _como_fecha(valor) -> Optional[date]:
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    return None
+
+
+def periodo_cerrado(rangos: List[Rango], fecha) -> Optional[str]:
+    """Periodo cerrado que contiene la fecha, o None"""
+    dia = _como_fecha(fecha)
+    if dia is None:
+        return None
+    for periodo, inicio, fin in rangos:
+        if inicio <= dia < fin:
+            return periodo
+    return None
+
+
+def _verificar(rangos: List[Rango], fechas: Iterable) -> None:
+    for fecha in fechas:
+        periodo = periodo_cerrado(rangos, fecha)
+        if periodo is not None:
+            raise PeriodoCerradoError(periodo)
+
+
+def _fechas_objeto(session, obj, tabla: str, con_anterior: bool) -> List:
+    columna = COLUMNAS_FECHA[tabla]
+    if columna is None:
+        # Los objetos nuevos creados solo con id_trabajo no cargan la relación
+        trabajo = obj.trabajo
+        if trabajo is None and obj.id_trabajo is not None:
+            trabajo = session.get(Trabajo, obj.id_trabajo)
+        return [trabajo.fecha] if trabajo is not None else []
+    fechas = [getattr(obj, columna)]
+    if con_anterior:
+        fechas.extend(inspect(obj).attrs[columna].history.deleted)
+    return fechas
+
+
+def _cambia_cierre(obj, tabla: str) -> bool:
+    atributos = inspect(obj).attrs
+    return any(atributos[columna].history.has_changes() for columna in COLUMNAS_CIERRE[tabla])
+
+
+def _antes_de_flush(session, flush_context, instances):
+    nuevos = [o for o in session.new if o.__table__.name in COLUMNAS_FECHA]
+    modificados = [o for o in session.dirty if o.__table__.name in COLUMNAS_FECHA and _cambia_cierre(o, o.__table__.name)]
+    eliminados = [o for o in session.deleted if o.__table__.name in COLUMNAS_FECHA]
+    if not (nuevos or modificados or eliminados):
+        return
+    rangos = rangos_cerrados(session, bloquear=True)
+    if not rangos:
+        return
+    for obj in nuevos:
+        _verificar(rangos, _fechas_objeto(session, obj, obj.__table__.name, con_anterior=False))
+    for obj in modificados + eliminados:
+        _verificar(rangos, _fechas_objeto(session, obj, obj.__table__.name, con_anterior=True))
+
+
+def _al_ejecutar(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    sentencia = orm_execute_state.statement
+    tabla = sentencia.table.name
+    if tabla not in COLUMNAS_FECHA:
+        return
+    session = orm_execute_state.session
+    rangos = rangos_cerrados(session, bloquear=True)
+    if not rangos:
+        return
+
+    columna = COLUMNAS_FECHA[tabla]
+    modelo = _MODELOS[tabla]
+    if columna is None:
+        consulta = select(Trabajo.fecha).join(modelo, modelo.id_trabajo == Trabajo.id)
+    else:
+        consulta = select(getattr(modelo, columna))
+    if sentencia.whereclause is not None:
+        consulta = consulta.where(sentencia.whereclause)
+    _verificar(rangos, session.connection().execute(consulta.distinct()).scalars())
+
+
+def instalar_proteccion_cierres() -> None:
+    """Registra los eventos de sesión que rechazan escrituras en periodos cerrados (idempotente)"""
+    if event.contains(Session, "before_flush", _antes_de_flush):
+        return
+    event.listen(Session, "before_flush", _antes_de_flush)
+    event.listen(Session, "do_orm_execute", _al_ejecutar)
@@ -0,0 +1,199 @@
+"""
+Compresión de respuestas con gzip o Brotli según Accept-Encoding.
+
+Los listados completos (trabajos, clientes) son JSON grande y repetitivo: con
+gzip ocupan alrededor de un 10% y con Brotli menos. El middleware:
+- negocia la codificación con Accept-Encoding (valores q, `*` y q=0): Brotli
+  si está instalado (pip install brotli) y el cliente lo acepta, si no gzip;
+- solo comprime tipos de texto (JSON, HTML, CSV, ...) y desde
+  COMPRESION_MINIMO_BYTES: en respuestas chicas el costo no compensa;
+- comprime en un hilo los cuerpos grandes para no bloquear el event loop;
+- en respuestas por partes (StreamingResponse, exportaciones) comprime cada
+  parte y la envía de inmediato (flush), sin juntar la respuesta completa;
+- nunca toca text/event-stream: los eventos de GET /api/eventos tienen que
+  llegar en cuanto se generan.
+
+Cuando el cliente acepta gzip o Brotli, las respuestas comprimibles llevan
+`Vary: Accept-Encoding` y un ETag débil (W/"..."): la versión comprimida no es
+idéntica byte a byte a la original. La comparación de If-None-Match ya es
+débil (app.core.etag.coincide_etag), así que los 304 siguen funcionando.
+"""
+import zlib
+from typing import List, Optional
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependencia opcional
+    brotli = None
+
+# Tipos que se comprimen (prefijos); text/event-stream se excluye aparte
+TIPOS_COMPRIMIBLES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+TIPOS_SIN_COMPRESION = ("text/event-stream",)
+
+# Cuerpos desde este tamaño se comprimen en un hilo
+MINIMO_BYTES_HILO = 128 * 1024
+
+
+def elegir_codificacion(accept_encoding: str) -> Optional[str]:
+    """"br", "gzip" o None según Accept-Encoding; con la misma calidad se prefiere Brotli"""
+    calidades = {}
+    for parte in accept_encoding.split(","):
+        nombre, _, parametros = parte.partition(";")
+        nombre = nombre.strip().lower()
+        if not nombre:
+            continue
+        calidad = 1.0
+        clave, _, valor = parametros.strip().partition("=")
+        if clave.strip().lower() == "q":
+            try:
+                calidad = float(valor)
+            except ValueError:
+                calidad = 0.0
+        calidades[nombre] = calidad
+
+    disponibles = ("br", "gzip") if brotli is not None else ("gzip",)
+    elegida, mejor = None, 0.0
+    for codificacion in disponibles:
+        calidad = calidades.get(codificacion, calidades.get("*", 0.0))
+        if calidad > mejor:
+            elegida, mejor = codificacion, calidad
+    return elegida
+
+
+def es_comprimible(content_type: str) -> bool:
+    tipo = content_type.partition(";")[0].strip().lower()
+    return tipo.startswith(TIPOS_COMPRIMIBLES) and not tipo.startswith(TIPOS_SIN_COMPRESION)
+
+
+class Compresor:
+    """Compresor incremental: comprimir() por parte, vaciar() para enviar lo pendiente, terminar() al final"""
+
+    def __init__(self, codificacion: str, nivel_gzip: int = 6, calidad_brotli: int = 4):
+        if codificacion == "br":
+            self._brotli = brotli.Compressor(quality=calidad_brotli, mode=brotli.MODE_TEXT)
+            self._zlib = None
+        else:
+            # wbits 16 + MAX_WBITS: formato gzip (encabezado y CRC)
+            self._zlib = zlib.compressobj(nivel_gzip, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._brotli = None
+
+    def comprimir(self, datos: bytes) -> bytes:
+        return self._brotli.process(datos) if self._brotli else self._zlib.compress(datos)
+
+    def vaciar(self) -> bytes:
+        return self._brotli.flush() if self._brotli else self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def terminar(self) -> bytes:
+        return self._brotli.finish() if self._brotli else self._zlib.flush()
+
+    def todo(self, datos: bytes) -> bytes:
+        return self.comprimir(datos) + self.terminar()
+
+
+def _etag_debil(encabezados: MutableHeaders) -> None:
+    etag = encabezados.get("etag")
+    if etag and not etag.startswith("W/"):
+        encabezados["etag"] = "W/" + etag
+
+
+class CompresionMiddleware:
+    """
+    Middleware ASGI que comprime las respuestas con gzip o Brotli según
+    Accept-Encoding, el tipo de contenido y el tamaño.
+    """
+
+    def __init__(self, app, minimo_bytes: int = 1024, nivel_gzip: int = 6, calidad_brotli: int = 4):
+        self.app = app
+        self.minimo_bytes = minimo_bytes
+        self.nivel_gzip = nivel_gzip
+        self.calidad_brotli = calidad_brotli
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        codificacion = elegir_codificacion(Headers(scope=scope).get("accept-encoding", ""))
+        if codificacion is None:
+            await self.app(scope, receive, send)
+            return
+
+        inicio = None  # http.response.start retenido hasta ver el cuerpo
+        compresor: Optional[Compresor] = None
+        directo = False
+
+        async def enviar_inicio(comprimido: bool, quitar_longitud: bool = False, longitud: int = 0) -> None:
+            encabezados = MutableHeaders(raw=inicio["headers"])
+            encabezados.add_vary_header("Accept-Encoding")
+            _etag_debil(encabezados)
+            if comprimido:
+                encabezados["Content-Encoding"] = codificacion
+                if quitar_longitud:
+                    del encabezados["Content-Length"]
+                else:
+                    encabezados["Content-Length"] = str(longitud)
+            await send(inicio)
+
+        async def send_comprimido(message):
+            nonlocal inicio, compresor, directo
+            tipo = message["type"]
+
+            if tipo == "http.response.start":
+                encabezados = Headers(raw=message.get("headers", []))
+                message["headers"] = list(message.get("headers", []))
+                if message["status"] in (204, 304):
+                    # Sin cuerpo (ni Content-Type), pero el ETag tiene que coincidir con el de la respuesta comprimida
+                    inicio, directo = message, True
+                    await enviar_inicio(comprimido=False)
+                elif (
+                    message["status"] == 206  # rangos de la representación sin comprimir
+                    or "content-encoding" in encabezados
+                    or not es_comprimible(encabezados.get("content-type", ""))
+                ):
+                    directo = True
+                    await send(message)
+                else:
+                    inicio = message
+                return
+
+            if directo or tipo != "http.response.body":
+                await send(message)
+                return
+
+            cuerpo = message.get("body", b"")
+            mas = message.get("more_body", False)
+
+            if compresor is None and not mas:
+                # Respuesta completa en un solo mensaje
+                if len(cuerpo) < self.minimo_bytes:
+                    directo = True
+                    await enviar_inicio(comprimido=False)
+                    await send(message)
+                    return
+                comprimir = Compresor(codificacion, self.nivel_gzip, self.calidad_brotli).todo
+                if len(cuerpo) >= MINIMO_BYTES_HILO:
+                    cuerpo = await anyio.to_thread.run_sync(comprimir, cuerpo)
+                else:
+                    cuerpo = comprimir(cuerpo)
+                await enviar_inicio(comprimido=True, longitud=len(cuerpo))
+                await send({"type": "http.response.body", "body": cuerpo, "more_body": False})
+                return
+
+            # Respuesta por partes: cada parte se comprime y se envía sin esperar a las siguientes
+            if compresor is None:
+                compresor = Compresor(codificacion, self.nivel_gzip, self.calidad_brotli)
+                await enviar_inicio(comprimido=True, quitar_longitud=True)
+            partes: List[bytes] = [compresor.comprimir(cuerpo)]
+            partes.append(compresor.vaciar() if mas else compresor.terminar())
+            await send({"type": "http.response.body", "body": b"".join(partes), "more_body": mas})
+
+        await self.app(scope, receive, send_comprimido)
@@ -0,0 +1,63 @@
+"""
+Configuración de la aplicación leída desde variables de entorno.
+
+APP_ENV controla el modo de ejecución: "development" (por defecto) o "production".
+"""
+import os
+
+APP_ENV = os.getenv("APP_ENV", "development")
+ES_PRODUCCION = APP_ENV == "production"
+
+# Nivel de logging del paquete app y niveles por módulo, ej: "app.routes=DEBUG,sqlalchemy.engine=INFO".
+# INFO por defecto aunque falte APP_ENV; DEBUG se activa explícitamente con LOG_LEVEL=DEBUG
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+# "json" para registros estructurados, "texto" para lectura en consola
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+
+# Instrumentación SQL de desarrollo (detector de N+1 y consultas lentas); se activa explícitamente:
+# APP_ENV es "development" por defecto y un despliegue sin APP_ENV no debe pagar su costo
+SQL_INSTRUMENTACION = os.getenv("SQL_INSTRUMENTACION", "0") == "1"
+# Veces que una misma forma de sentencia puede repetirse en una petición antes de avisar
+SQL_UMBRAL_REPETICIONES = int(os.getenv("SQL_UMBRAL_REPETICIONES", "10"))
+# Sentencias más lentas que este umbral se registran junto con su EXPLAIN
+SQL_LENTA_MS = float(os.getenv("SQL_LENTA_MS", "200"))
+
+# Perfilador por petición con ?__profile=1 o X-Profile: 1 (solo desarrollo, se activa explícitamente)
+PERFILADOR = os.getenv("PERFILADOR", "0") == "1"
+
+# Caché de respuestas de lectura invalidada por versión de tabla
+CACHE_RESPUESTAS = os.getenv("CACHE_RESPUESTAS", "1") == "1"
+CACHE_MAX_ENTRADAS = int(os.getenv("CACHE_MAX_ENTRADAS", "1000"))
+# "memoria://" (por proceso), "redis://host:6379/0" (compartida entre workers) o "fakeredis://" (pruebas)
+CACHE_URL = os.getenv("CACHE_URL", "memoria://")
+CACHE_PREFIJO = os.getenv("CACHE_PREFIJO", "auto_andrade")
+# Vencimiento de seguridad de las entradas en Redis; la invalidación normal es por versión
+CACHE_TTL_SEGUNDOS = int(os.getenv("CACHE_TTL_SEGUNDOS", "86400"))
+
+# Sincronización incremental (GET /api/sync): antigüedad a partir de la cual un hueco en la
+# bitácora se considera un rollback y no una transacción todavía abierta
+SYNC_MARGEN_SEGUNDOS = int(os.getenv("SYNC_MARGEN_SEGUNDOS", "30"))
+# Cada cuánto lee la bitácora el canal de eventos GET /api/eventos (solo con conexiones abiertas)
+EVENTOS_INTERVALO_SEGUNDOS = float(os.getenv("EVENTOS_INTERVALO_SEGUNDOS", "2"))
+
+# Estado de resultados: días después del fin de un periodo a partir de los cuales se considera
+# consolidado y sus montos se cachean hasta la siguiente escritura en las tablas que lee
+# (margen para registrar gastos y aprobar comisiones tardías)
+RESULTADOS_DIAS_CIERRE = int(os.getenv("RESULTADOS_DIAS_CIERRE", "15"))
+# Máximo de periodos consolidados guardados en memoria (LRU)
+RESULTADOS_CACHE_MAX_PERIODOS = int(os.getenv("RESULTADOS_CACHE_MAX_PERIODOS", "2000"))
+
+# Contadores de filas (clientes, carros, trabajos): cada cuántos minutos se comparan con COUNT(*)
+# para corregir las escrituras que no pasaron por la sesión; 0 desactiva la tarea de fondo
+CONTADORES_RECONCILIAR_MINUTOS = float(os.getenv("CONTADORES_RECONCILIAR_MINUTOS", "60"))
+
+# Montos Decimal en las respuestas JSON: "numero" (número con los mismos dígitos) o "texto" ("1234.56")
+JSON_DECIMALES = os.getenv("JSON_DECIMALES", "numero")
+
+# Compresión gzip/Brotli de las respuestas (app.core.compresion)
+COMPRESION = os.getenv("COMPRESION", "1") == "1"
+# Tamaño mínimo del cuerpo para comprimir; por debajo el costo no compensa
+COMPRESION_MINIMO_BYTES = int(os.getenv("COMPRESION_MINIMO_BYTES", "1024"))
+COMPRESION_NIVEL_GZIP = int(os.getenv("COMPRESION_NIVEL_GZIP", "6"))
+COMPRESION_CALIDAD_BROTLI = int(os.getenv("COMPRESION_CALIDAD_BROTLI", "4"))
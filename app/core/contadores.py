@@ -0,0 +1,226 @@
+"""
+Contadores exactos de filas para los totales del dashboard.
+
+COUNT(*) sobre clientes, carros y trabajos recorre un índice completo en InnoDB
+y tarda más a medida que crecen las tablas. La tabla contadores guarda el total
+de cada una y se actualiza en la misma transacción que la escritura, con
+eventos de la sesión de SQLAlchemy:
+- after_flush: objetos nuevos (+1) y eliminados (-1) por el ORM, incluidas las
+  cascadas del ORM (ej: los trabajos de un carro eliminado);
+- do_orm_execute: INSERT masivos (las filas que informa el driver o, si no
+  las informa, los juegos de parámetros o de VALUES) y DELETE masivos; antes de
+  ejecutarlos se cuentan las filas afectadas y las que se eliminan por ON
+  DELETE CASCADE (los trabajos de los carros eliminados).
+
+Los cambios de toda la transacción se acumulan en la sesión y se aplican en
+before_commit con `total = total + n`: dos transacciones concurrentes no se
+pisan. Las filas de los contadores se bloquean recién al confirmar y siempre en
+el mismo orden, aunque la transacción haya escrito las tablas en otro orden
+(varios flush), así no se provocan deadlocks. Un rollback descarta los cambios.
+
+Las escrituras con text() o fuera de una sesión no se cuentan: reconciliar()
+compara cada contador con COUNT(*) y corrige la diferencia. Se ejecuta cada
+CONTADORES_RECONCILIAR_MINUTOS en cada worker y a mano con:
+
+    python -m app.core.contadores
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import event, func, insert, select, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.core.cache import invalidar_tablas
+from app.models.contadores import Contador
+from app.models.database import Base, ahora_utc
+
+logger = logging.getLogger(__name__)
+
+# En orden alfabético: es el orden en que se bloquean las filas de contadores
+TABLAS_CONTADAS = ("carros", "clientes", "trabajos")
+
+CLAVE_CAMBIOS_SESION = "contadores_cambios"
+
+_contadores = Contador.__table__
+
+
+def _filas_insertadas(orm_execute_state, resultado) -> int:
+    """Filas de un INSERT ya ejecutado"""
+    filas = getattr(resultado, "rowcount", -1)
+    if filas is not None and filas >= 0:
+        return filas
+    # Con RETURNING o con el INSERT masivo del ORM el resultado no informa rowcount
+    parametros = orm_execute_state.parameters
+    if isinstance(parametros, (list, tuple)):
+        return len(parametros)
+    valores_multiples = orm_execute_state.statement._multi_values  # insert().values([{...}, {...}])
+    if valores_multiples:
+        return len(valores_multiples[0])
+    return 1
+
+
+def _cascadas(tabla: str):
+    """Llaves foráneas de tablas contadas que eliminan en cascada filas al eliminar de `tabla`"""
+    for nombre in TABLAS_CONTADAS:
+        for fk in Base.metadata.tables[nombre].foreign_keys:
+            if fk.ondelete == "CASCADE" and fk.column.table.name == tabla:
+                yield nombre, fk
+
+
+def _acumular(session: Session, cambios: Dict[str, int]) -> None:
+    acumulados = session.info.setdefault(CLAVE_CAMBIOS_SESION, defaultdict(int))
+    for tabla, cambio in cambios.items():
+        acumulados[tabla] += cambio
+
+
+def sumar(session: Session, cambios: Dict[str, int]) -> None:
+    """Suma los cambios a los contadores dentro de la transacción de la sesión, en orden alfabético"""
+    conexion = session.connection()
+    for tabla in sorted(cambios):
+        if cambios[tabla]:
+            conexion.execute(
+                update(_contadores)
+                .where(_contadores.c.tabla == tabla)
+                .values(total=_contadores.c.total + cambios[tabla])
+            )
+
+
+def _despues_de_flush(session, flush_context):
+    cambios = defaultdict(int)
+    for obj in session.new:
+        tabla = obj.__table__.name
+        if tabla in TABLAS_CONTADAS:
+            cambios[tabla] += 1
+    for obj in session.deleted:
+        tabla = obj.__table__.name
+        if tabla in TABLAS_CONTADAS:
+            cambios[tabla] -= 1
+    if cambios:
+        _acumular(session, cambios)
+
+
+def _al_ejecutar(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_delete):
+        return
+    sentencia = orm_execute_state.statement
+    tabla = sentencia.table
+    session = orm_execute_state.session
+
+    if orm_execute_state.is_insert:
+        if tabla.name not in TABLAS_CONTADAS:
+            return
+        resultado = orm_execute_state.invoke_statement()
+        _acumular(session, {tabla.name: _filas_insertadas(orm_execute_state, resultado)})
+        return resultado
+
+    cambios = {}
+    if tabla.name in TABLAS_CONTADAS:
+        consulta = select(func.count()).select_from(tabla)
+        if sentencia.whereclause is not None:
+            consulta = consulta.where(sentencia.whereclause)
+        cambios[tabla.name] = -session.connection().execute(consulta).scalar()
+    for dependiente, fk in _cascadas(tabla.name):
+        llaves = select(fk.column)
+        if sentencia.whereclause is not None:
+            llaves = llaves.where(sentencia.whereclause)
+        consulta = select(func.count()).select_from(fk.parent.table).where(fk.parent.in_(llaves))
+        cambios[dependiente] = cambios.get(dependiente, 0) - session.connection().execute(consulta).scalar()
+    if cambios:
+        _acumular(session, cambios)
+
+
+def _antes_de_commit(session):
+    # before_commit corre antes del flush final del commit: se hace aquí para contar los pendientes
+    session.flush()
+    cambios = session.info.pop(CLAVE_CAMBIOS_SESION, None)
+    if cambios:
+        sumar(session, cambios)
+
+
+def _despues_de_rollback(session):
+    session.info.pop(CLAVE_CAMBIOS_SESION, None)
+
+
+def leer_totales(session: Session, tablas: Iterable[str] = TABLAS_CONTADAS) -> Dict[str, int]:
+    """Totales de filas desde la tabla contadores (una consulta por índice primario)"""
+    tablas = tuple(tablas)
+    totales = dict(session.execute(
+        select(_contadores.c.tabla, _contadores.c.total).where(_contadores.c.tabla.in_(tablas))
+    ).all())
+    faltantes = [t for t in tablas if t not in totales]
+    if faltantes:
+        # Sin contador todavía (falta migracion_contadores.sql o la primera reconciliación)
+        logger.warning("Sin contador para %s; se usa COUNT(*)", ", ".join(faltantes))
+        fila = session.execute(select(*(
+            select(func.count()).select_from(Base.metadata.tables[t]).scalar_subquery().label(t) for t in faltantes
+        ))).one()
+        totales.update(fila._mapping)
+    return totales
+
+
+def reconciliar_tabla(conexion: Connection, tabla: str) -> int:
+    """Corrige el contador de una tabla con COUNT(*); devuelve la diferencia encontrada"""
+    # Primero se bloquea el contador: una escritura concurrente que todavía no lo actualizó
+    # espera, y su incremento se suma al total corregido
+    anterior = conexion.execute(
+        select(_contadores.c.total).where(_contadores.c.tabla == tabla).with_for_update()
+    ).scalar()
+    real = conexion.execute(select(func.count()).select_from(Base.metadata.tables[tabla])).scalar()
+    if anterior is None:
+        conexion.execute(insert(_contadores).values(tabla=tabla, total=real, reconciliado=ahora_utc()))
+    else:
+        conexion.execute(
+            update(_contadores).where(_contadores.c.tabla == tabla).values(total=real, reconciliado=ahora_utc())
+        )
+    return real - (anterior or 0)
+
+
+def reconciliar(engine: Optional[Engine] = None) -> Dict[str, int]:
+    """Reconcilia todos los contadores, cada uno en su propia transacción; devuelve las diferencias"""
+    if engine is None:
+        from app.models.database import engine
+
+    diferencias = {}
+    for tabla in TABLAS_CONTADAS:
+        with engine.begin() as conexion:
+            diferencias[tabla] = reconciliar_tabla(conexion, tabla)
+    corregidas = [t for t, diferencia in diferencias.items() if diferencia]
+    if corregidas:
+        logger.warning("Contadores corregidos: %s", {t: diferencias[t] for t in corregidas})
+        invalidar_tablas(*corregidas)
+    return diferencias
+
+
+async def reconciliar_periodicamente(minutos: float) -> None:
+    """Reconcilia los contadores cada `minutos` (tarea de fondo del ciclo de vida de la app)"""
+    while True:
+        await asyncio.sleep(minutos * 60)
+        try:
+            await asyncio.to_thread(reconciliar)
+        except Exception:
+            logger.exception("Error al reconciliar los contadores")
+
+
+def instalar_contadores() -> None:
+    """Registra los eventos de sesión que mantienen los contadores (idempotente)"""
+    if event.contains(Session, "after_flush", _despues_de_flush):
+        return
+    event.listen(Session, "after_flush", _despues_de_flush)
+    event.listen(Session, "do_orm_execute", _al_ejecutar)
+    event.listen(Session, "before_commit", _antes_de_commit)
+    event.listen(Session, "after_rollback", _despues_de_rollback)
+
+
+def main() -> None:
+    from app.core.logging_config import configurar_logging
+
+    configurar_logging()
+    for tabla, diferencia in reconciliar().items():
+        logger.info("%s: diferencia %+d", tabla, diferencia)
+
+
+if __name__ == "__main__":
+    main()
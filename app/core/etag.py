@@ -0,0 +1,88 @@
+"""
+GET condicionales con ETag para listados y detalles.
+
+El ETag de una respuesta se calcula a partir de las tablas que lee el endpoint:
+por cada tabla, la cantidad de filas y el máximo de updated_at (o de la llave
+primaria si la tabla no tiene updated_at), junto con la URL. Cualquier
+inserción, modificación o eliminación cambia el ETag. La huella de todas las
+tablas se obtiene en una sola consulta sobre la base principal (get_db), así un
+cliente que acaba de escribir nunca recibe un 304 por datos anteriores a su
+escritura. Si una escritura se confirma entre la huella y la consulta del
+endpoint, el ETag queda más viejo que el contenido y la siguiente petición
+simplemente vuelve a descargarlo.
+
+Con una réplica de lectura (DATABASE_READ_URL), el endpoint lee de la réplica:
+antes de enviar un ETag se compara la huella de la réplica con la de la
+principal. Si la réplica está atrasada, la respuesta sale sin ETag (el
+contenido no corresponde a la huella) y el cliente vuelve a descargar en la
+siguiente petición, hasta que la réplica se pone al día.
+
+Si el cliente envía If-None-Match con el ETag vigente se responde 304 sin
+ejecutar el endpoint. Last-Modified se envía como referencia, pero
+If-Modified-Since no produce 304: eliminar una fila no cambia max(updated_at).
+
+Uso:
+    @router.get("/carros/", dependencies=[etag_tablas("carros", "clientes")])
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, Optional
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.database import Base, get_db, get_read_db
+
+
+def _sentencia_huella(tablas):
+    columnas = []
+    for nombre in tablas:
+        tabla = Base.metadata.tables[nombre]
+        marca = tabla.c.updated_at if "updated_at" in tabla.c else next(iter(tabla.primary_key.columns))
+        columnas.append(select(func.count()).select_from(tabla).scalar_subquery())
+        columnas.append(select(func.max(marca)).scalar_subquery())
+    return select(*columnas)
+
+
+def coincide_etag(if_none_match: str, etag: str) -> bool:
+    """Comparación débil de If-None-Match (RFC 9110): se ignora el prefijo W/"""
+    if if_none_match.strip() == "*":
+        return True
+    return etag in {e.strip().removeprefix("W/") for e in if_none_match.split(",")}
+
+
+def _ultima_modificacion(valores) -> Dict[str, str]:
+    fechas = [v if v.tzinfo else v.replace(tzinfo=timezone.utc) for v in valores if isinstance(v, datetime)]
+    if not fechas:
+        return {}
+    return {"Last-Modified": format_datetime(max(fechas).astimezone(timezone.utc), usegmt=True)}
+
+
+def etag_tablas(*tablas: str):
+    """Dependencia que agrega ETag/Last-Modified y responde 304 si el cliente ya tiene la versión vigente"""
+    sentencia = None
+
+    def verificar_etag(request: Request, response: Response, db: Session = Depends(get_db),
+                       db_lectura: Session = Depends(get_read_db)) -> Optional[str]:
+        nonlocal sentencia
+        if sentencia is None:
+            sentencia = _sentencia_huella(tablas)
+        huella = tuple(db.execute(sentencia).one())
+
+        contenido = f"{request.url.path}?{request.url.query}|{huella!r}"
+        etag = '"' + hashlib.sha1(contenido.encode("utf-8")).hexdigest() + '"'
+        encabezados = {"ETag": etag, "Cache-Control": "private, no-cache", **_ultima_modificacion(huella[1::2])}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and coincide_etag(if_none_match, etag):
+            raise HTTPException(status_code=304, headers=encabezados)
+        if db_lectura.get_bind().url != db.get_bind().url and tuple(db_lectura.execute(sentencia).one()) != huella:
+            # Réplica atrasada: el contenido que se va a devolver no corresponde a la huella
+            response.headers["Cache-Control"] = "private, no-cache"
+            return None
+        response.headers.update(encabezados)
+        return etag
+
+    return Depends(verificar_etag)
@@ -0,0 +1,192 @@
+"""
+Canal de eventos de cambios para el dashboard (Server-Sent Events).
+
+GET /api/eventos mantiene la conexión abierta y envía un evento por cada lote
+de cambios confirmados:
+
+    id: 1842
+    event: cambios
+    data: {"token": 1842, "cambios": [{"entidad": "trabajos", "id": 90, "op": "ACTUALIZAR"}]}
+
+Los eventos salen de la bitácora registro_cambios, así que llegan sin importar
+qué worker o máquina hizo la escritura: cada proceso la consulta cada
+EVENTOS_INTERVALO_SEGUNDOS (una consulta para todas sus conexiones, y solo
+mientras tenga conexiones) y se despierta al instante cuando un commit del
+mismo proceso escribe en ella.
+
+El id del evento es el token de GET /api/sync: al reconectar, el navegador
+envía Last-Event-ID y se reenvían los cambios que se perdieron.
+"""
+import asyncio
+import contextvars
+import json
+import logging
+from typing import Iterable, Optional, Set
+
+import anyio
+
+from app.core import config
+from app.core.registro_cambios import observadores_commit
+from app.models.database import SessionLocal
+from app.services.sincronizacion import SincronizacionService, leer_registros, tipo_llave, token_seguro
+
+logger = logging.getLogger(__name__)
+
+# Cambios leídos de la bitácora por consulta
+LOTE_REGISTROS = 1000
+# Eventos pendientes por conexión; si un cliente no los consume se le pide recargar
+MAX_PENDIENTES = 100
+# Comentario periódico para que proxies y navegador no cierren la conexión inactiva
+SEGUNDOS_LATIDO = 15.0
+
+
+def _leer(desde: int, limite: int = LOTE_REGISTROS):
+    db = SessionLocal()
+    try:
+        registros = leer_registros(db, desde, limite)
+        return registros, token_seguro(desde, registros)
+    finally:
+        db.close()
+
+
+def _token_actual() -> int:
+    db = SessionLocal()
+    try:
+        return SincronizacionService(db).token_actual()
+    finally:
+        db.close()
+
+
+def _evento(registros) -> Optional[dict]:
+    """Evento compacto de un lote de la bitácora; un cambio por fila (el último)"""
+    if not registros:
+        return None
+    cambios = {}
+    for registro in registros:
+        cambios[(registro.tabla, registro.id_fila)] = registro.operacion
+    return {
+        "token": registros[-1].id,
+        "cambios": [
+            {"entidad": tabla, "id": tipo_llave(tabla)(id_fila), "op": operacion.value}
+            for (tabla, id_fila), operacion in cambios.items()
+        ],
+    }
+
+
+def formatear(evento: dict, tablas: Optional[Set[str]] = None) -> Optional[str]:
+    """Mensaje SSE del evento, filtrado por tablas; None si no queda nada que enviar"""
+    if evento.get("recargar"):
+        return "event: recargar\ndata: {}\n\n"
+    cambios = evento["cambios"]
+    if tablas:
+        cambios = [c for c in cambios if c["entidad"] in tablas]
+        if not cambios:
+            return None
+    datos = json.dumps({"token": evento["token"], "cambios": cambios}, separators=(",", ":"))
+    return f"id: {evento['token']}\nevent: cambios\ndata: {datos}\n\n"
+
+
+class DifusorCambios:
+    """Lee la bitácora en un solo bucle por proceso y reparte los eventos a las conexiones"""
+
+    def __init__(self, intervalo: float):
+        self.intervalo = intervalo
+        self._suscriptores: Set[asyncio.Queue] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._despertar: Optional[asyncio.Event] = None
+        self._tarea: Optional[asyncio.Task] = None
+        self._token: Optional[int] = None
+        self._emitidos: Set[int] = set()
+
+    def suscribir(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._despertar, self._tarea = loop, asyncio.Event(), None
+        cola: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDIENTES)
+        self._suscriptores.add(cola)
+        if self._tarea is None or self._tarea.done():
+            # Contexto vacío: las consultas del bucle no deben contarse en la petición que lo inició
+            self._tarea = loop.create_task(self._bucle(), context=contextvars.Context())
+        return cola
+
+    def desuscribir(self, cola: asyncio.Queue) -> None:
+        self._suscriptores.discard(cola)
+
+    def notificar(self) -> None:
+        """Despierta el bucle; se puede llamar desde cualquier hilo (ej: after_commit)"""
+        loop, despertar = self._loop, self._despertar
+        if self._suscriptores and loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(despertar.set)
+
+    def _repartir(self, evento: dict) -> None:
+        for cola in list(self._suscriptores):
+            try:
+                cola.put_nowait(evento)
+            except asyncio.QueueFull:
+                # El cliente no da abasto: se descartan sus pendientes y se le pide recargar
+                while not cola.empty():
+                    cola.get_nowait()
+                cola.put_nowait({"recargar": True})
+
+    async def _bucle(self) -> None:
+        try:
+            while self._suscriptores:
+                hay_mas = False
+                try:
+                    if self._token is None:
+                        self._token = await anyio.to_thread.run_sync(_token_actual)
+                    registros, seguro = await anyio.to_thread.run_sync(_leer, self._token)
+                except Exception:
+                    logger.exception("No se pudo leer la bitácora de cambios")
+                else:
+                    # Lo posterior a un hueco reciente se emite ya, pero el token no avanza sobre
+                    # el hueco; esos ids se recuerdan para no repetirlos en la siguiente lectura
+                    evento = _evento([r for r in registros if r.id not in self._emitidos])
+                    if evento is not None:
+                        self._repartir(evento)
+                    self._emitidos = {r.id for r in registros if r.id > seguro}
+                    hay_mas = len(registros) == LOTE_REGISTROS and seguro > self._token
+                    self._token = seguro
+
+                if hay_mas:
+                    continue
+                try:
+                    await asyncio.wait_for(self._despertar.wait(), self.intervalo)
+                except asyncio.TimeoutError:
+                    pass
+                self._despertar.clear()
+        finally:
+            # Sin conexiones no se sigue la bitácora; la próxima empieza desde el token actual
+            self._token, self._emitidos = None, set()
+
+
+difusor = DifusorCambios(config.EVENTOS_INTERVALO_SEGUNDOS)
+observadores_commit.append(difusor.notificar)
+
+
+async def flujo_eventos(tablas: Optional[Iterable[str]] = None, desde: Optional[int] = None):
+    """Generador del cuerpo SSE de una conexión"""
+    tablas = set(tablas) if tablas else None
+    cola = difusor.suscribir()
+    try:
+        yield "retry: 3000\n\n"
+        if desde is not None:
+            # Reconexión: cambios desde el último evento recibido
+            registros, _ = await anyio.to_thread.run_sync(_leer, desde, LOTE_REGISTROS + 1)
+            if len(registros) > LOTE_REGISTROS:
+                yield formatear({"recargar": True})
+            elif registros:
+                mensaje = formatear(_evento(registros), tablas)
+                if mensaje:
+                    yield mensaje
+        while True:
+            try:
+                evento = await asyncio.wait_for(cola.get(), SEGUNDOS_LATIDO)
+            except asyncio.TimeoutError:
+                yield ": latido\n\n"
+                continue
+            mensaje = formatear(evento, tablas)
+            if mensaje:
+                yield mensaje
+    finally:
+        difusor.desuscribir(cola)
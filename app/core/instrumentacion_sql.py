@@ -0,0 +1,165 @@
+"""
+Instrumentación SQL para desarrollo.
+
+Registra cada sentencia ejecutada durante una petición con su huella (la
+sentencia normalizada, sin valores) y al terminar la petición:
+- avisa cuando una misma forma de sentencia se repite más de
+  SQL_UMBRAL_REPETICIONES veces (patrón N+1), indicando la ruta de origen;
+- registra las sentencias más lentas que SQL_LENTA_MS junto con su EXPLAIN.
+
+Se activa con SQL_INSTRUMENTACION=1 (desactivada por defecto).
+"""
+import logging
+import re
+import time
+from collections import Counter
+from typing import List, NamedTuple, Optional
+
+import anyio
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core import config
+from app.core.metricas import estadisticas_var, nombre_ruta
+
+logger = logging.getLogger(__name__)
+
+_RE_CADENA = re.compile(r"'(?:[^']|'')*'")
+_RE_PARAMETRO = re.compile(r"%\(\w+\)s|%s|:\w+|\?")
+_RE_NUMERO = re.compile(r"\b\d+(?:\.\d+)?\b")
+_RE_LISTA_IN = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_RE_ESPACIOS = re.compile(r"\s+")
+
+
+class Sentencia(NamedTuple):
+    """Sentencia ejecutada durante una petición"""
+    huella: str
+    sql: str
+    parametros: object
+    duracion: float
+    engine: Optional[Engine]
+
+
+def huella(sql: str) -> str:
+    """
+    Normaliza una sentencia para agrupar las que solo difieren en sus valores:
+    literales y parámetros pasan a ?, y las listas IN (?, ?, ...) a IN (?).
+    """
+    texto = _RE_CADENA.sub("?", sql)
+    texto = _RE_PARAMETRO.sub("?", texto)
+    texto = _RE_NUMERO.sub("?", texto)
+    texto = _RE_LISTA_IN.sub("(?)", texto)
+    return _RE_ESPACIOS.sub(" ", texto).strip()
+
+
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("instrumentacion_inicio", []).append(time.perf_counter())
+
+
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    inicios = conn.info.get("instrumentacion_inicio")
+    if not inicios:
+        return
+    duracion = time.perf_counter() - inicios.pop()
+    stats = estadisticas_var.get()
+    # Solo se registran las sentencias de las peticiones que lo pidieron (sentencias = [])
+    if stats is None or stats.sentencias is None:
+        return
+    stats.sentencias.append(Sentencia(
+        huella=huella(statement),
+        sql=statement,
+        parametros=None if executemany else parameters,
+        duracion=duracion,
+        engine=conn.engine,
+    ))
+
+
+def _error_de_ejecucion(contexto_excepcion):
+    conn = contexto_excepcion.connection
+    if conn is not None and conn.info.get("instrumentacion_inicio"):
+        conn.info["instrumentacion_inicio"].pop()
+
+
+def instrumentacion_instalada() -> bool:
+    return event.contains(Engine, "before_cursor_execute", _antes_de_ejecutar)
+
+
+def instalar_instrumentacion() -> None:
+    """Registra los eventos de instrumentación en todos los engines (idempotente)"""
+    if instrumentacion_instalada():
+        return
+    event.listen(Engine, "before_cursor_execute", _antes_de_ejecutar)
+    event.listen(Engine, "after_cursor_execute", _despues_de_ejecutar)
+    event.listen(Engine, "handle_error", _error_de_ejecucion)
+
+
+def desinstalar_instrumentacion() -> None:
+    """Quita los eventos de instrumentación (ej: para medir rendimiento sin su costo)"""
+    if not instrumentacion_instalada():
+        return
+    event.remove(Engine, "before_cursor_execute", _antes_de_ejecutar)
+    event.remove(Engine, "after_cursor_execute", _despues_de_ejecutar)
+    event.remove(Engine, "handle_error", _error_de_ejecucion)
+
+
+def sentencias_repetidas(sentencias: List[Sentencia], umbral: int) -> List[tuple]:
+    """Huellas ejecutadas más de `umbral` veces, con su cantidad, de mayor a menor"""
+    conteo = Counter(s.huella for s in sentencias)
+    return [(h, n) for h, n in conteo.most_common() if n > umbral]
+
+
+def explicar(sentencia: Sentencia) -> str:
+    """Obtiene el plan de ejecución de una sentencia SELECT en una conexión aparte"""
+    if sentencia.engine is None or not sentencia.sql.lstrip().upper().startswith("SELECT"):
+        return "(sin EXPLAIN)"
+    prefijo = "EXPLAIN QUERY PLAN " if sentencia.engine.dialect.name == "sqlite" else "EXPLAIN "
+    try:
+        with sentencia.engine.connect() as conn:
+            filas = conn.exec_driver_sql(prefijo + sentencia.sql, sentencia.parametros or ()).fetchall()
+        return "\n".join(" | ".join(str(valor) for valor in fila) for fila in filas)
+    except Exception as e:
+        return f"(EXPLAIN falló: {e})"
+
+
+def analizar_peticion(metodo: str, ruta: str, sentencias: List[Sentencia]) -> None:
+    """Registra patrones N+1 y sentencias lentas de una petición terminada"""
+    # Los EXPLAIN no deben contarse como consultas de la petición
+    estadisticas_var.set(None)
+
+    for texto, cantidad in sentencias_repetidas(sentencias, config.SQL_UMBRAL_REPETICIONES):
+        logger.warning("Posible N+1 en %s %s: sentencia ejecutada %d veces: %s", metodo, ruta, cantidad, texto)
+
+    limite = config.SQL_LENTA_MS / 1000
+    for sentencia in sentencias:
+        if sentencia.duracion > limite:
+            logger.warning(
+                "Sentencia lenta en %s %s (%.1f ms): %s\nEXPLAIN:\n%s",
+                metodo, ruta, sentencia.duracion * 1000, sentencia.sql, explicar(sentencia)
+            )
+
+
+class InstrumentacionSQLMiddleware:
+    """
+    Middleware ASGI que analiza las sentencias de cada petición al terminar.
+    Debe quedar dentro de MetricasMiddleware, que crea las estadísticas de la petición.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = estadisticas_var.get()
+        if stats is not None and stats.sentencias is None:
+            stats.sentencias = []
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if stats is not None and stats.sentencias:
+                # El EXPLAIN usa la base de datos: se ejecuta fuera del event loop
+                await anyio.to_thread.run_sync(
+                    analizar_peticion, scope["method"], nombre_ruta(scope), stats.sentencias
+                )
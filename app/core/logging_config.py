@@ -0,0 +1,155 @@
+"""
+Logging estructurado de la aplicación.
+
+Los registros se formatean como JSON y se escriben desde un hilo aparte
+(QueueHandler + QueueListener): el hilo que atiende la petición solo encola
+el registro y nunca se bloquea escribiendo en stdout. Cada registro lleva el
+request_id de la petición en curso para poder correlacionarlos.
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from app.core import config
+
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+# Niveles por defecto para librerías ruidosas (se pueden sobreescribir con LOG_LEVELS)
+NIVELES_POR_DEFECTO = {
+    "sqlalchemy.engine": "WARNING",
+    "multipart": "WARNING",
+}
+
+_listener = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Agrega a cada registro el request_id de la petición en curso"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatea cada registro como una línea JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        datos = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            datos["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            datos["exc_info"] = record.exc_text
+        return json.dumps(datos, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que conserva la traza de la excepción por separado del mensaje"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parsear_niveles(texto: str) -> dict:
+    """Convierte "modulo=NIVEL,otro=NIVEL" en un diccionario"""
+    niveles = {}
+    for par in texto.split(","):
+        if "=" not in par:
+            continue
+        modulo, nivel = par.split("=", 1)
+        niveles[modulo.strip()] = nivel.strip().upper()
+    return niveles
+
+
+def configurar_logging() -> None:
+    """Configura el logging de la aplicación (idempotente)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    if config.LOG_FORMAT == "texto":
+        formatter = logging.Formatter("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s")
+    else:
+        formatter = JsonFormatter()
+
+    salida = logging.StreamHandler(sys.stdout)
+    salida.setFormatter(formatter)
+
+    cola = queue.SimpleQueue()
+    handler = _QueueHandler(cola)
+    handler.addFilter(RequestIdFilter())
+
+    raiz = logging.getLogger()
+    raiz.handlers = [handler]
+    raiz.setLevel(logging.INFO)
+
+    niveles = dict(NIVELES_POR_DEFECTO)
+    niveles["app"] = config.LOG_LEVEL.upper()
+    niveles.update(parsear_niveles(config.LOG_LEVELS))
+    for modulo, nivel in niveles.items():
+        logging.getLogger(modulo).setLevel(nivel)
+
+    _listener = logging.handlers.QueueListener(cola, salida, respect_handler_level=True)
+    _listener.start()
+    atexit.register(detener_logging)
+
+
+def detener_logging() -> None:
+    """Vacía la cola y detiene el hilo escritor"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestIdMiddleware:
+    """
+    Middleware ASGI que asigna un request_id a cada petición (o reutiliza el
+    encabezado X-Request-ID recibido) y lo devuelve en la respuesta.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for nombre, valor in scope.get("headers", []):
+            if nombre == b"x-request-id":
+                request_id = valor.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+
+        async def send_con_request_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_con_request_id)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,218 @@
+"""
+Métricas de rendimiento por petición.
+
+- Histograma de latencia por ruta (plantilla de la ruta, no la URL concreta).
+- Conteo de consultas SQL y tiempo en base de datos por petición, medido con
+  eventos de SQLAlchemy sobre todos los engines.
+- Exposición en formato de texto de Prometheus (/metrics) y en el encabezado
+  Server-Timing de cada respuesta.
+
+Las métricas se guardan en memoria del proceso; con varios workers de uvicorn
+cada uno expone las suyas.
+"""
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTAS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class EstadisticasPeticion:
+    """Consultas SQL y tiempo en base de datos acumulados durante una petición"""
+
+    __slots__ = ("consultas", "tiempo_db", "ruta", "sentencias")
+
+    def __init__(self):
+        self.consultas = 0
+        self.tiempo_db = 0.0
+        self.ruta = None
+        # Detalle de cada sentencia; solo se llena con la instrumentación de desarrollo
+        self.sentencias = None
+
+
+estadisticas_var: ContextVar[Optional[EstadisticasPeticion]] = ContextVar("estadisticas_peticion", default=None)
+
+
+class Histograma:
+    """Histograma acumulativo al estilo Prometheus"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.conteos = [0] * len(buckets)
+        self.suma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float) -> None:
+        for i, limite in enumerate(self.buckets):
+            if valor <= limite:
+                self.conteos[i] += 1
+        self.suma += valor
+        self.total += 1
+
+
+class RegistroMetricas:
+    """Almacén en memoria de las métricas HTTP y SQL del proceso"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencias: Dict[Tuple[str, str, str], Histograma] = {}
+        self.consultas: Dict[Tuple[str, str], Histograma] = {}
+        self.tiempo_db: Dict[Tuple[str, str], float] = {}
+        # Funciones llamadas al terminar cada petición (ej: el plugin de pytest de presupuesto de consultas)
+        self.observadores: List[Callable[[str, str, int, float, EstadisticasPeticion], None]] = []
+
+    def registrar(self, metodo: str, ruta: str, estado: int, duracion: float, stats: EstadisticasPeticion) -> None:
+        with self._lock:
+            clave = (metodo, ruta, str(estado))
+            if clave not in self.latencias:
+                self.latencias[clave] = Histograma(BUCKETS_LATENCIA)
+            self.latencias[clave].observar(duracion)
+
+            clave_ruta = (metodo, ruta)
+            if clave_ruta not in self.consultas:
+                self.consultas[clave_ruta] = Histograma(BUCKETS_CONSULTAS)
+            self.consultas[clave_ruta].observar(stats.consultas)
+            self.tiempo_db[clave_ruta] = self.tiempo_db.get(clave_ruta, 0.0) + stats.tiempo_db
+        for observador in list(self.observadores):
+            observador(metodo, ruta, estado, duracion, stats)
+
+    def reiniciar(self) -> None:
+        with self._lock:
+            self.latencias.clear()
+            self.consultas.clear()
+            self.tiempo_db.clear()
+
+    def texto_prometheus(self) -> str:
+        """Genera la exposición en formato de texto de Prometheus"""
+        lineas: List[str] = []
+        with self._lock:
+            lineas.append("# HELP http_request_duration_seconds Latencia de las peticiones HTTP por ruta")
+            lineas.append("# TYPE http_request_duration_seconds histogram")
+            for (metodo, ruta, estado), hist in sorted(self.latencias.items()):
+                etiquetas = f'method="{metodo}",route="{_escapar(ruta)}",status="{estado}"'
+                _lineas_histograma(lineas, "http_request_duration_seconds", etiquetas, hist)
+
+            lineas.append("# HELP db_queries_per_request Consultas SQL ejecutadas por petición")
+            lineas.append("# TYPE db_queries_per_request histogram")
+            for (metodo, ruta), hist in sorted(self.consultas.items()):
+                etiquetas = f'method="{metodo}",route="{_escapar(ruta)}"'
+                _lineas_histograma(lineas, "db_queries_per_request", etiquetas, hist)
+
+            lineas.append("# HELP db_time_seconds_total Tiempo acumulado en base de datos por ruta")
+            lineas.append("# TYPE db_time_seconds_total counter")
+            for (metodo, ruta), segundos in sorted(self.tiempo_db.items()):
+                etiquetas = f'method="{metodo}",route="{_escapar(ruta)}"'
+                lineas.append(f"db_time_seconds_total{{{etiquetas}}} {segundos:.6f}")
+        return "\n".join(lineas) + "\n"
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _lineas_histograma(lineas: List[str], nombre: str, etiquetas: str, hist: Histograma) -> None:
+    for limite, conteo in zip(hist.buckets, hist.conteos):
+        lineas.append(f'{nombre}_bucket{{{etiquetas},le="{limite}"}} {conteo}')
+    lineas.append(f'{nombre}_bucket{{{etiquetas},le="+Inf"}} {hist.total}')
+    lineas.append(f"{nombre}_sum{{{etiquetas}}} {hist.suma:.6f}")
+    lineas.append(f"{nombre}_count{{{etiquetas}}} {hist.total}")
+
+
+registro = RegistroMetricas()
+
+
+# ========================================
+# EVENTOS DE SQLALCHEMY
+# ========================================
+
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metricas_inicio", []).append(time.perf_counter())
+
+
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    inicios = conn.info.get("metricas_inicio")
+    if not inicios:
+        return
+    duracion = time.perf_counter() - inicios.pop()
+    stats = estadisticas_var.get()
+    if stats is not None:
+        stats.consultas += 1
+        stats.tiempo_db += duracion
+
+
+def _error_de_ejecucion(contexto_excepcion):
+    conn = contexto_excepcion.connection
+    if conn is not None and conn.info.get("metricas_inicio"):
+        conn.info["metricas_inicio"].pop()
+
+
+def instalar_eventos_sql() -> None:
+    """Registra los eventos de medición SQL en todos los engines (idempotente)"""
+    if event.contains(Engine, "before_cursor_execute", _antes_de_ejecutar):
+        return
+    event.listen(Engine, "before_cursor_execute", _antes_de_ejecutar)
+    event.listen(Engine, "after_cursor_execute", _despues_de_ejecutar)
+    event.listen(Engine, "handle_error", _error_de_ejecucion)
+
+
+# ========================================
+# MIDDLEWARE
+# ========================================
+
+def nombre_ruta(scope) -> str:
+    """Plantilla de la ruta atendida (ej: /api/trabajos/trabajo/{id})"""
+    ruta = scope.get("route")
+    plantilla = getattr(ruta, "path_format", None) or getattr(ruta, "path", None)
+    if not plantilla:
+        return "sin_ruta"
+
+    # Según la versión de FastAPI, la ruta puede venir sin el prefijo del router (/api)
+    concreta = plantilla
+    for nombre, valor in scope.get("path_params", {}).items():
+        concreta = concreta.replace("{" + nombre + "}", str(valor))
+    path = scope.get("path", "")
+    if path != concreta and path.endswith(concreta):
+        return path[:-len(concreta)] + plantilla
+    return plantilla
+
+
+class MetricasMiddleware:
+    """
+    Middleware ASGI que mide la latencia de cada petición, el número de consultas
+    SQL y el tiempo en base de datos, y agrega el encabezado Server-Timing.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = EstadisticasPeticion()
+        token = estadisticas_var.set(stats)
+        inicio = time.perf_counter()
+        estado = 500
+
+        async def send_con_tiempos(message):
+            nonlocal estado
+            if message["type"] == "http.response.start":
+                estado = message["status"]
+                app_ms = (time.perf_counter() - inicio) * 1000
+                db_ms = stats.tiempo_db * 1000
+                valor = f'app;dur={app_ms:.1f}, db;dur={db_ms:.1f};desc="{stats.consultas} consultas"'
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", valor.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_con_tiempos)
+        finally:
+            estadisticas_var.reset(token)
+            stats.ruta = nombre_ruta(scope)
+            registro.registrar(scope["method"], stats.ruta, estado, time.perf_counter() - inicio, stats)
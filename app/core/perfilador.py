@@ -0,0 +1,244 @@
+"""
+Perfilador por petición para desarrollo.
+
+Con ?__profile=1 (o el encabezado X-Profile: 1) la petición se ejecuta bajo un
+perfilador y en lugar de la respuesta normal se devuelve:
+- html (por defecto): el perfil (flame graph de pyinstrument o tabla de cProfile)
+  junto con las sentencias SQL de la petición y sus tiempos;
+- speedscope (?__profile=speedscope): el perfil en formato JSON de speedscope.app,
+  con las sentencias SQL en la clave "sql" (requiere pyinstrument).
+
+Se usa pyinstrument si está instalado (pip install pyinstrument) y cProfile si no.
+Los endpoints síncronos corren en el threadpool, así que se perfila la función del
+endpoint en su propio hilo envolviendo las funciones de los endpoints (instalar_perfilador).
+
+Se activa con PERFILADOR=1 (desactivado por defecto). Solo se perfilan peticiones
+GET: el endpoint se ejecuta de verdad y una escritura perfilada se confirmaría
+aunque su respuesta se descarte, así que los demás métodos se rechazan con 405.
+"""
+import cProfile
+import functools
+import html
+import inspect
+import io
+import json
+import logging
+import pstats
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from urllib.parse import parse_qs
+
+from fastapi.routing import APIRoute
+
+from app.core.metricas import estadisticas_var, nombre_ruta
+
+try:
+    import pyinstrument
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # pragma: no cover - dependencia opcional
+    pyinstrument = None
+
+logger = logging.getLogger(__name__)
+
+PARAMETRO = "__profile"
+ENCABEZADO = b"x-profile"
+FORMATOS = ("html", "speedscope")
+METODOS = ("GET",)
+
+
+class PerfilPeticion:
+    """Perfilador de una petición; se comparte con el hilo del endpoint por contextvar"""
+
+    def __init__(self, formato: str):
+        self.formato = formato
+        self.perfil = None
+
+    @contextmanager
+    def perfilar(self, asincrono: bool = False):
+        if pyinstrument is not None:
+            perfilador = pyinstrument.Profiler(interval=0.001, async_mode="enabled" if asincrono else "disabled")
+            perfilador.start()
+            try:
+                yield
+            finally:
+                perfilador.stop()
+                self.perfil = perfilador
+        else:
+            perfilador = cProfile.Profile()
+            perfilador.enable()
+            try:
+                yield
+            finally:
+                perfilador.disable()
+                self.perfil = perfilador
+
+    def renderizar_html(self) -> str:
+        if self.perfil is None:
+            return "<p>El endpoint no se ejecutó (error de validación o de dependencias).</p>"
+        if pyinstrument is not None:
+            return f'<iframe srcdoc="{html.escape(self.perfil.output_html(), quote=True)}"></iframe>'
+        salida = io.StringIO()
+        pstats.Stats(self.perfil, stream=salida).sort_stats("cumulative").print_stats(60)
+        return f"<pre>{html.escape(salida.getvalue())}</pre>"
+
+    def renderizar_speedscope(self) -> dict:
+        if self.perfil is None:
+            return {}
+        return json.loads(self.perfil.output(renderer=SpeedscopeRenderer()))
+
+
+perfil_var: ContextVar[Optional[PerfilPeticion]] = ContextVar("perfil_peticion", default=None)
+
+
+def _envolver_endpoint(funcion):
+    """Envuelve la función de un endpoint para perfilarla cuando la petición lo pide"""
+    if inspect.iscoroutinefunction(funcion):
+        @functools.wraps(funcion)
+        async def envoltura(*args, **kwargs):
+            perfil = perfil_var.get()
+            if perfil is None:
+                return await funcion(*args, **kwargs)
+            with perfil.perfilar(asincrono=True):
+                return await funcion(*args, **kwargs)
+    else:
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            perfil = perfil_var.get()
+            if perfil is None:
+                return funcion(*args, **kwargs)
+            with perfil.perfilar():
+                return funcion(*args, **kwargs)
+
+    envoltura.perfilada = True
+    return envoltura
+
+
+def _envolver_rutas(rutas) -> None:
+    for ruta in rutas:
+        if isinstance(ruta, APIRoute):
+            if not getattr(ruta.endpoint, "perfilada", False):
+                ruta.endpoint = _envolver_endpoint(ruta.endpoint)
+            if not getattr(ruta.dependant.call, "perfilada", False):
+                ruta.dependant.call = _envolver_endpoint(ruta.dependant.call)
+        elif hasattr(ruta, "original_router"):
+            # Versiones recientes de FastAPI guardan los routers incluidos sin copiar sus rutas
+            _envolver_rutas(ruta.original_router.routes)
+
+
+def instalar_perfilador(app) -> None:
+    """
+    Envuelve los endpoints de todas las rutas registradas. Llamar después de
+    registrar las rutas y antes de atender peticiones.
+    """
+    _envolver_rutas(app.routes)
+
+
+def _formato_solicitado(scope) -> Optional[str]:
+    valor = parse_qs(scope.get("query_string", b"").decode("latin-1")).get(PARAMETRO, [None])[0]
+    if valor is None:
+        valor = dict(scope.get("headers", [])).get(ENCABEZADO, b"").decode("latin-1") or None
+    if valor is None or valor in ("0", "false"):
+        return None
+    return valor if valor in FORMATOS else "html"
+
+
+def _tabla_sql(sentencias) -> str:
+    if sentencias is None:
+        return "<p>Sentencias SQL no disponibles.</p>"
+    filas = "".join(
+        f"<tr><td>{i}</td><td>{s.duracion * 1000:.2f}</td><td><code>{html.escape(s.sql)}</code></td></tr>"
+        for i, s in enumerate(sentencias, 1)
+    )
+    return f"<table><tr><th>#</th><th>ms</th><th>SQL</th></tr>{filas}</table>"
+
+
+async def _rechazar(scope, send) -> None:
+    """Responde 405 sin ejecutar el endpoint: perfilar una escritura la aplicaría"""
+    cuerpo = json.dumps({
+        "detail": f"El perfilador solo atiende peticiones {', '.join(METODOS)}; {scope['method']} no se ejecutó",
+    }).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": 405,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(cuerpo)).encode("latin-1")),
+            (b"allow", ", ".join(METODOS).encode("latin-1")),
+        ],
+    })
+    await send({"type": "http.response.body", "body": cuerpo})
+
+
+class PerfiladorMiddleware:
+    """
+    Middleware ASGI que atiende las peticiones con ?__profile=1 o X-Profile: 1.
+    Debe quedar dentro de MetricasMiddleware, que crea las estadísticas de la petición.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        formato = _formato_solicitado(scope) if scope["type"] == "http" else None
+        if formato is None:
+            await self.app(scope, receive, send)
+            return
+        if scope["method"] not in METODOS:
+            await _rechazar(scope, send)
+            return
+
+        perfil = PerfilPeticion(formato)
+        token = perfil_var.set(perfil)
+        stats = estadisticas_var.get()
+        if stats is not None and stats.sentencias is None:
+            stats.sentencias = []
+        estado = 500
+
+        async def send_descartar(message):
+            # La respuesta original se descarta; solo interesa su código de estado
+            nonlocal estado
+            if message["type"] == "http.response.start":
+                estado = message["status"]
+
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_descartar)
+        except Exception:
+            logger.exception("Error en la petición perfilada")
+        finally:
+            perfil_var.reset(token)
+        duracion = time.perf_counter() - inicio
+
+        ruta = nombre_ruta(scope)
+        sentencias = stats.sentencias if stats is not None else None
+        if formato == "speedscope" and pyinstrument is not None:
+            contenido = perfil.renderizar_speedscope()
+            contenido["sql"] = [
+                {"sql": s.sql, "duracion_ms": round(s.duracion * 1000, 3)} for s in (sentencias or [])
+            ]
+            cuerpo = json.dumps(contenido).encode("utf-8")
+            tipo = b"application/json"
+        else:
+            tiempo_sql = sum(s.duracion for s in sentencias or [])
+            cuerpo = (
+                "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+                f"<title>Perfil {html.escape(scope['method'])} {html.escape(ruta)}</title>"
+                "<style>body{font-family:sans-serif;margin:1em}iframe{width:100%;height:70vh;border:1px solid #ccc}"
+                "table{border-collapse:collapse;font-size:12px}td,th{border:1px solid #ddd;padding:2px 6px;"
+                "vertical-align:top;text-align:left}</style></head><body>"
+                f"<h2>Perfil {html.escape(scope['method'])} {html.escape(ruta)}</h2>"
+                f"<p>Estado {estado} · {duracion * 1000:.1f} ms · "
+                f"{len(sentencias or [])} consultas SQL ({tiempo_sql * 1000:.1f} ms) · "
+                f"perfilador: {'pyinstrument' if pyinstrument is not None else 'cProfile'}</p>"
+                f"{perfil.renderizar_html()}<h3>Sentencias SQL</h3>{_tabla_sql(sentencias)}</body></html>"
+            ).encode("utf-8")
+            tipo = b"text/html; charset=utf-8"
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", tipo), (b"content-length", str(len(cuerpo)).encode("latin-1"))],
+        })
+        await send({"type": "http.response.body", "body": cuerpo})
@@ -0,0 +1,117 @@
+"""
+Bitácora de cambios para la sincronización incremental (GET /api/sync).
+
+Cada inserción, modificación o eliminación de una fila de las tablas
+sincronizadas agrega una fila a registro_cambios dentro de la misma
+transacción, así la bitácora solo contiene cambios confirmados. Se registran
+con eventos de la sesión de SQLAlchemy:
+- after_flush: objetos nuevos, modificados y eliminados por el ORM (incluye las
+  cascadas del ORM, ej: los gastos y comisiones de un trabajo eliminado);
+- do_orm_execute: UPDATE/DELETE masivos (query.update(), query.delete()); antes
+  de ejecutarlos se consultan las llaves de las filas afectadas.
+
+Las escrituras con text() o fuera de una sesión deben registrarse con
+registrar_cambios().
+
+Después de cada commit que escribió en la bitácora se llama a las funciones de
+observadores_commit (ej: el canal de eventos del dashboard).
+"""
+import logging
+from collections import defaultdict
+from typing import Callable, Iterable, List
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.models.database import ahora_utc
+from app.models.registro_cambios import OperacionCambio, RegistroCambio
+
+logger = logging.getLogger(__name__)
+
+TABLAS_SINCRONIZADAS = frozenset({
+    "trabajos", "detalles_gastos", "clientes", "carros", "comisiones_mecanicos", "gastos_taller",
+})
+CLAVE_CAMBIOS_SESION = "registro_cambios_pendiente"
+
+observadores_commit: List[Callable[[], None]] = []
+
+
+def registrar_cambios(session: Session, tabla: str, ids: Iterable, operacion: OperacionCambio) -> None:
+    """Agrega a la bitácora un cambio por cada llave (en la transacción de la sesión)"""
+    fecha = ahora_utc()
+    filas = [{"tabla": tabla, "id_fila": str(i), "operacion": operacion, "fecha": fecha} for i in ids]
+    if filas:
+        session.connection().execute(RegistroCambio.__table__.insert(), filas)
+        session.info[CLAVE_CAMBIOS_SESION] = True
+
+
+def _llave(obj):
+    return inspect(obj).mapper.primary_key_from_instance(obj)[0]
+
+
+def _despues_de_flush(session, flush_context):
+    cambios = defaultdict(list)
+    for obj in session.new:
+        tabla = obj.__table__.name
+        if tabla in TABLAS_SINCRONIZADAS:
+            cambios[(tabla, OperacionCambio.CREAR)].append(_llave(obj))
+    for obj in session.dirty:
+        tabla = obj.__table__.name
+        if tabla not in TABLAS_SINCRONIZADAS or not session.is_modified(obj, include_collections=False):
+            continue
+        # La identidad se actualiza después de este evento: si cambió la llave, es la anterior
+        identidad = inspect(obj).identity
+        nueva = _llave(obj)
+        anterior = identidad[0] if identidad else nueva
+        if anterior != nueva:
+            cambios[(tabla, OperacionCambio.ELIMINAR)].append(anterior)
+            cambios[(tabla, OperacionCambio.CREAR)].append(nueva)
+        else:
+            cambios[(tabla, OperacionCambio.ACTUALIZAR)].append(nueva)
+    for obj in session.deleted:
+        tabla = obj.__table__.name
+        if tabla in TABLAS_SINCRONIZADAS:
+            cambios[(tabla, OperacionCambio.ELIMINAR)].append(_llave(obj))
+
+    for (tabla, operacion), ids in cambios.items():
+        registrar_cambios(session, tabla, ids, operacion)
+
+
+def _al_ejecutar(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    sentencia = orm_execute_state.statement
+    tabla = sentencia.table
+    if tabla.name not in TABLAS_SINCRONIZADAS:
+        return
+
+    consulta = select(next(iter(tabla.primary_key.columns)))
+    if sentencia.whereclause is not None:
+        consulta = consulta.where(sentencia.whereclause)
+    session = orm_execute_state.session
+    ids = session.execute(consulta).scalars().all()
+    operacion = OperacionCambio.ELIMINAR if orm_execute_state.is_delete else OperacionCambio.ACTUALIZAR
+    registrar_cambios(session, tabla.name, ids, operacion)
+
+
+def _despues_de_commit(session):
+    if session.info.pop(CLAVE_CAMBIOS_SESION, False):
+        for observador in observadores_commit:
+            try:
+                observador()
+            except Exception:
+                logger.exception("Error en un observador de la bitácora de cambios")
+
+
+def _despues_de_rollback(session):
+    session.info.pop(CLAVE_CAMBIOS_SESION, None)
+
+
+def instalar_registro_cambios() -> None:
+    """Registra los eventos de sesión que alimentan la bitácora de cambios (idempotente)"""
+    if event.contains(Session, "after_flush", _despues_de_flush):
+        return
+    event.listen(Session, "after_flush", _despues_de_flush)
+    event.listen(Session, "do_orm_execute", _al_ejecutar)
+    event.listen(Session, "after_commit", _despues_de_commit)
+    event.listen(Session, "after_rollback", _despues_de_rollback)
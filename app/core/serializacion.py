@@ -0,0 +1,37 @@
+"""
+Serialización JSON de los montos Decimal de las respuestas.
+
+Los montos se guardan como DECIMAL y llegan a Python como Decimal. En lugar de
+convertirlos a mano con float() en cada ruta, los modelos de respuesta los
+declaran como Dinero y se escriben al serializar según JSON_DECIMALES:
+- "numero" (por defecto): número JSON con los mismos dígitos del Decimal. Las
+  columnas de dinero son DECIMAL(10, 2) y caben exactas en un double: 1234.56
+  se escribe 1234.56, no 1234.5599999999999.
+- "texto": cadena con el valor exacto ("1234.56"), para clientes que lo leen
+  con una librería decimal.
+
+Los listados declaran su modelo de respuesta y usan la clase de respuesta por
+defecto: FastAPI los serializa directo a bytes con el TypeAdapter del modelo
+(pydantic-core), sin el recorrido en Python de jsonable_encoder. Una clase de
+respuesta propia para toda la app (ORJSONResponse) desactiva ese camino: el
+resultado se convierte primero a dicts de Python y después a JSON, con más
+memoria por petición. Los endpoints sin modelo de respuesta siguen pasando por
+jsonable_encoder, que convierte los Decimal a número.
+"""
+from decimal import Decimal
+from typing import Annotated, Union
+
+from pydantic import PlainSerializer
+
+from app.core import config
+
+
+def decimal_json(valor: Decimal) -> Union[float, str]:
+    """Valor JSON de un Decimal según JSON_DECIMALES"""
+    if config.JSON_DECIMALES == "texto":
+        return format(valor, "f")
+    return float(valor)
+
+
+# Monto de dinero en los modelos de respuesta: se valida como Decimal y se escribe con decimal_json
+Dinero = Annotated[Decimal, PlainSerializer(decimal_json, when_used="json")]
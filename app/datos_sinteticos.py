@@ -0,0 +1,449 @@
+"""
+Generador determinista de datos sintéticos del taller.
+
+Crea clientes (PERSONA/EMPRESA), carros con historial de dueños, trabajos con
+sus detalles de gastos, mecánicos con asignaciones y comisiones por quincena,
+gastos del taller y pagos de salarios. Con la misma semilla y los mismos
+parámetros se generan exactamente los mismos datos.
+
+Los registros se insertan por lotes con inserciones masivas de SQLAlchemy Core
+(executemany) y con ids explícitos, sin pasar por el ORM, para poder generar
+millones de trabajos en pocos minutos. Al final se reconcilian los contadores
+de filas (app.core.contadores) en la misma transacción.
+
+Uso:
+    python -m app.datos_sinteticos --trabajos 100000 --semilla 42
+    DATABASE_URL=sqlite:///carga.db python -m app.datos_sinteticos --trabajos 1000000 --crear-tablas
+"""
+import argparse
+import calendar
+import logging
+import random
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.contadores import TABLAS_CONTADAS, reconciliar_tabla
+from app.models import (
+    Carro, Cliente, ComisionMecanico, DetalleGasto, GastoTaller, HistorialDueno,
+    Mecanico, PagoSalario, Trabajo, TrabajoMecanico,
+)
+from app.models.clientes import TipoCliente
+from app.models.comisiones_mecanicos import EstadoComision
+from app.models.gastos_taller import EstadoGasto
+
+logger = logging.getLogger(__name__)
+
+MARCAS = {
+    "Toyota": ["Corolla", "Hilux", "RAV4", "Yaris", "Land Cruiser"],
+    "Hyundai": ["Tucson", "Accent", "Elantra", "Santa Fe"],
+    "Nissan": ["Sentra", "Frontier", "X-Trail", "Versa"],
+    "Honda": ["Civic", "CR-V", "Fit", "Accord"],
+    "Suzuki": ["Swift", "Vitara", "Jimny"],
+    "Mitsubishi": ["L200", "Montero", "ASX"],
+    "Kia": ["Rio", "Sportage", "Picanto"],
+}
+NOMBRES = ["Ana", "Carlos", "María", "José", "Laura", "Luis", "Sofía", "Andrés", "Daniela", "Jorge",
+           "Valeria", "Diego", "Fernanda", "Pablo", "Gabriela", "Mario", "Lucía", "Ricardo"]
+APELLIDOS = ["Rodríguez", "Vargas", "Jiménez", "Mora", "Rojas", "Araya", "Solís", "Castro",
+             "Chaves", "Quesada", "Alvarado", "Ramírez", "Hernández", "Salazar"]
+EMPRESAS = ["Transportes", "Distribuidora", "Constructora", "Servicios", "Inversiones", "Agrícola"]
+TRABAJOS = ["Cambio de aceite", "Cambio de pastillas de freno", "Alineado y balanceo",
+            "Reparación de suspensión", "Cambio de embrague", "Diagnóstico eléctrico",
+            "Afinado de motor", "Cambio de faja de distribución", "Reparación de aire acondicionado"]
+REPUESTOS = ["Aceite 5W-30", "Filtro de aceite", "Pastillas de freno", "Discos de freno",
+             "Amortiguadores", "Kit de embrague", "Bujías", "Faja de distribución", "Batería"]
+CATEGORIAS_GASTO = ["Alquiler", "Electricidad", "Agua", "Herramientas", "Limpieza", "Internet", "Seguros"]
+
+
+@dataclass
+class ParametrosGeneracion:
+    """Volúmenes y rango de fechas de los datos a generar"""
+    trabajos: int = 10_000
+    clientes: Optional[int] = None  # Por defecto: trabajos / 10
+    carros: Optional[int] = None  # Por defecto: clientes * 1.3
+    mecanicos: int = 8
+    meses: int = 24
+    hasta: date = date(2025, 12, 31)
+    semilla: int = 42
+    lote: int = 10_000
+
+    def __post_init__(self):
+        if self.clientes is None:
+            self.clientes = max(1, self.trabajos // 10)
+        if self.carros is None:
+            self.carros = max(1, int(self.clientes * 1.3))
+
+
+def _monto(centimos: int) -> Decimal:
+    return Decimal(centimos).scaleb(-2)
+
+
+def _quincena(fecha: datetime) -> str:
+    """Misma regla que la API: Q1 días 1-15, Q2 días 16-31"""
+    return f"{fecha.year}-Q1" if fecha.day <= 15 else f"{fecha.year}-Q2"
+
+
+class GeneradorDatos:
+    """Genera e inserta los datos sintéticos; cada entidad en su propio método"""
+
+    def __init__(self, conn: Connection, parametros: ParametrosGeneracion):
+        self.conn = conn
+        self.p = parametros
+        self.rnd = random.Random(parametros.semilla)
+        self.fin = datetime.combine(parametros.hasta, datetime.max.time()).replace(microsecond=0)
+        self.inicio = self.fin - timedelta(days=30 * parametros.meses)
+        self.segundos_rango = int((self.fin - self.inicio).total_seconds())
+        self.ids_clientes: List[int] = []
+        self.ids_carros: List[int] = []
+        self.ids_mecanicos: List[int] = []
+        self.conteos: Dict[str, int] = {}
+
+    # ========================================
+    # UTILIDADES
+    # ========================================
+
+    def _insertar(self, modelo, filas: List[dict]) -> None:
+        if filas:
+            self.conn.execute(modelo.__table__.insert(), filas)
+            tabla = modelo.__tablename__
+            self.conteos[tabla] = self.conteos.get(tabla, 0) + len(filas)
+
+    def _insertar_por_lotes(self, modelo, filas: Iterator[dict]) -> None:
+        lote: List[dict] = []
+        for fila in filas:
+            lote.append(fila)
+            if len(lote) >= self.p.lote:
+                self._insertar(modelo, lote)
+                lote = []
+        self._insertar(modelo, lote)
+
+    def _siguiente_id(self, modelo) -> int:
+        return (self.conn.execute(select(func.max(modelo.__table__.c.id))).scalar() or 0) + 1
+
+    def _fecha_aleatoria(self) -> datetime:
+        return self.inicio + timedelta(seconds=self.rnd.randrange(self.segundos_rango))
+
+    # ========================================
+    # ENTIDADES
+    # ========================================
+
+    def generar(self) -> Dict[str, int]:
+        self.generar_clientes()
+        self.generar_carros()
+        self.generar_mecanicos()
+        self.generar_trabajos()
+        self.generar_gastos_taller()
+        self.generar_pagos_salarios()
+        return self.conteos
+
+    def generar_clientes(self) -> None:
+        rnd = self.rnd
+        primer_id = self._siguiente_id(Cliente)
+
+        def filas():
+            for i in range(1, self.p.clientes + 1):
+                id_cliente = primer_id + i - 1
+                if rnd.random() < 0.15:
+                    yield {
+                        "id": id_cliente,
+                        "id_nacional": f"3101{i:06d}",
+                        "nombre": f"{rnd.choice(EMPRESAS)} {rnd.choice(APELLIDOS)} S.A.",
+                        "apellido": None,
+                        "correo": f"contacto{i}@empresa.example",
+                        "telefono": f"2{rnd.randrange(10**7):07d}",
+                        "tipo_cliente": TipoCliente.EMPRESA,
+                        "updated_at": self.inicio,
+                    }
+                else:
+                    yield {
+                        "id": id_cliente,
+                        "id_nacional": f"1{i:08d}",
+                        "nombre": rnd.choice(NOMBRES),
+                        "apellido": f"{rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)}",
+                        "correo": f"cliente{i}@correo.example" if rnd.random() < 0.7 else None,
+                        "telefono": f"8{rnd.randrange(10**7):07d}",
+                        "tipo_cliente": TipoCliente.PERSONA,
+                        "updated_at": self.inicio,
+                    }
+                self.ids_clientes.append(id_cliente)
+
+        self._insertar_por_lotes(Cliente, filas())
+
+    def generar_carros(self) -> None:
+        """Carros con 1 a 3 dueños; el último dueño es el actual"""
+        rnd = self.rnd
+        primer_id = self._siguiente_id(Carro)
+        id_historial = self._siguiente_id(HistorialDueno)
+
+        for desde in range(1, self.p.carros + 1, self.p.lote):
+            carros, historial = [], []
+            for i in range(desde, min(desde + self.p.lote, self.p.carros + 1)):
+                id_carro = primer_id + i - 1
+                marca = rnd.choice(list(MARCAS))
+                duenos = [rnd.choice(self.ids_clientes) for _ in range(rnd.choice((1, 1, 1, 2, 2, 3)))]
+
+                fecha_inicio = self._fecha_aleatoria() - timedelta(days=rnd.randrange(365, 365 * 5))
+                for n, id_cliente in enumerate(duenos):
+                    fecha_fin = None
+                    if n < len(duenos) - 1:
+                        fecha_fin = fecha_inicio + timedelta(days=rnd.randrange(180, 900))
+                    historial.append({
+                        "id": id_historial,
+                        "id_carro": id_carro,
+                        "id_cliente": id_cliente,
+                        "fecha_inicio": fecha_inicio,
+                        "fecha_fin": fecha_fin,
+                    })
+                    id_historial += 1
+                    fecha_inicio = fecha_fin
+
+                carros.append({
+                    "id": id_carro,
+                    "matricula": f"SIN{i:07d}",
+                    "marca": marca,
+                    "modelo": rnd.choice(MARCAS[marca]),
+                    "anio": rnd.randrange(1995, self.p.hasta.year + 1),
+                    "id_cliente": duenos[-1],
+                    "updated_at": self.inicio,
+                })
+                self.ids_carros.append(id_carro)
+
+            self._insertar(Carro, carros)
+            self._insertar(HistorialDueno, historial)
+
+    def generar_mecanicos(self) -> None:
+        rnd = self.rnd
+        primer_id = self._siguiente_id(Mecanico)
+        filas = []
+        for i in range(self.p.mecanicos):
+            id_mecanico = primer_id + i
+            contratacion = self.inicio - timedelta(days=rnd.randrange(0, 365 * 3))
+            filas.append({
+                "id": id_mecanico,
+                "id_nacional": f"MEC{id_mecanico:07d}",
+                "nombre": f"{rnd.choice(NOMBRES)} {rnd.choice(APELLIDOS)}",
+                "correo": None,
+                "telefono": f"8{rnd.randrange(10**7):07d}",
+                "porcentaje_comision": Decimal("2.00"),
+                "fecha_contratacion": contratacion,
+                "activo": True,
+                "created_at": contratacion,
+                "updated_at": contratacion,
+            })
+            self.ids_mecanicos.append(id_mecanico)
+        self._insertar(Mecanico, filas)
+
+    def generar_trabajos(self) -> None:
+        """
+        Trabajos con 0 a 4 repuestos y 1 o 2 mecánicos. Las comisiones (2% de la mano
+        de obra repartido entre los mecánicos) quedan aprobadas o denegadas salvo las
+        de los últimos dos meses, que quedan pendientes como en operación normal.
+        """
+        rnd = self.rnd
+        id_trabajo = self._siguiente_id(Trabajo)
+        id_detalle = self._siguiente_id(DetalleGasto)
+        id_asignacion = self._siguiente_id(TrabajoMecanico)
+        id_comision = self._siguiente_id(ComisionMecanico)
+        limite_pendientes = self.fin - timedelta(days=60)
+
+        restantes = self.p.trabajos
+        while restantes > 0:
+            cantidad = min(self.p.lote, restantes)
+            restantes -= cantidad
+            trabajos, detalles, asignaciones, comisiones = [], [], [], []
+
+            for _ in range(cantidad):
+                fecha = self._fecha_aleatoria()
+                mano_obra = rnd.randrange(10_000, 250_000) * 100
+                gastos = cobrado = 0
+                for _ in range(rnd.choice((0, 1, 1, 2, 2, 3, 4))):
+                    monto = rnd.randrange(2_000, 150_000) * 100
+                    monto_cobrado = int(monto * rnd.uniform(1.1, 1.4))
+                    gastos += monto
+                    cobrado += monto_cobrado
+                    detalles.append({
+                        "id": id_detalle,
+                        "id_trabajo": id_trabajo,
+                        "descripcion": rnd.choice(REPUESTOS),
+                        "monto": _monto(monto),
+                        "monto_cobrado": _monto(monto_cobrado),
+                        "updated_at": fecha,
+                    })
+                    id_detalle += 1
+
+                markup = cobrado - gastos
+                trabajos.append({
+                    "id": id_trabajo,
+                    "id_carro": rnd.choice(self.ids_carros),
+                    "descripcion": rnd.choice(TRABAJOS),
+                    "fecha": fecha,
+                    "fecha_registro": fecha,
+                    "costo": _monto(mano_obra + cobrado),
+                    "mano_obra": _monto(mano_obra),
+                    "markup_repuestos": _monto(markup),
+                    "ganancia": _monto(max(mano_obra + markup - gastos, 0)),
+                    "aplica_iva": rnd.random() < 0.8,
+                    "updated_at": fecha,
+                })
+
+                mecanicos = rnd.sample(self.ids_mecanicos, min(len(self.ids_mecanicos), rnd.choice((1, 1, 1, 2))))
+                comision = mano_obra * 2 // 100 // len(mecanicos)
+                if fecha >= limite_pendientes:
+                    estado = EstadoComision.PENDIENTE
+                else:
+                    estado = EstadoComision.APROBADA if rnd.random() < 0.9 else EstadoComision.DENEGADA
+                for id_mecanico in mecanicos:
+                    asignaciones.append({
+                        "id": id_asignacion,
+                        "id_trabajo": id_trabajo,
+                        "id_mecanico": id_mecanico,
+                        "porcentaje_comision": Decimal("2.00"),
+                        "monto_comision": _monto(comision),
+                        "created_at": fecha,
+                    })
+                    comisiones.append({
+                        "id": id_comision,
+                        "id_trabajo": id_trabajo,
+                        "id_mecanico": id_mecanico,
+                        "ganancia_trabajo": _monto(mano_obra),
+                        "porcentaje_comision": Decimal("2.00"),
+                        "monto_comision": _monto(0 if estado == EstadoComision.DENEGADA else comision),
+                        "fecha_calculo": fecha,
+                        "mes_reporte": fecha.strftime("%Y-%m"),
+                        "estado_comision": estado,
+                        "quincena": _quincena(fecha),
+                        "updated_at": fecha,
+                    })
+                    id_asignacion += 1
+                    id_comision += 1
+                id_trabajo += 1
+
+            self._insertar(Trabajo, trabajos)
+            self._insertar(DetalleGasto, detalles)
+            self._insertar(TrabajoMecanico, asignaciones)
+            self._insertar(ComisionMecanico, comisiones)
+            logger.info("Trabajos generados: %d/%d", self.p.trabajos - restantes, self.p.trabajos)
+
+    def _meses(self) -> Iterator[date]:
+        mes = date(self.inicio.year, self.inicio.month, 1)
+        while mes <= self.p.hasta:
+            yield mes
+            mes = date(mes.year + mes.month // 12, mes.month % 12 + 1, 1)
+
+    def generar_gastos_taller(self) -> None:
+        """Gastos fijos mensuales más algunos gastos variables"""
+        rnd = self.rnd
+        id_gasto = self._siguiente_id(GastoTaller)
+        filas = []
+        for mes in self._meses():
+            ultimo_dia = calendar.monthrange(mes.year, mes.month)[1]
+            for categoria in CATEGORIAS_GASTO + [rnd.choice(CATEGORIAS_GASTO) for _ in range(rnd.randrange(0, 6))]:
+                fecha = datetime(mes.year, mes.month, rnd.randrange(1, ultimo_dia + 1), 9)
+                pagado = fecha < self.fin - timedelta(days=30) or rnd.random() < 0.5
+                filas.append({
+                    "id": id_gasto,
+                    "descripcion": f"{categoria} {mes:%Y-%m}",
+                    "monto": _monto(rnd.randrange(1_000, 500_000) * 100),
+                    "categoria": categoria,
+                    "fecha_gasto": fecha,
+                    "fecha_pago": fecha + timedelta(days=rnd.randrange(0, 10)) if pagado else None,
+                    "estado": EstadoGasto.PAGADO if pagado else EstadoGasto.PENDIENTE,
+                    "created_at": fecha,
+                    "updated_at": fecha,
+                })
+                id_gasto += 1
+        self._insertar(GastoTaller, filas)
+
+    def generar_pagos_salarios(self) -> None:
+        """Un pago semanal (semanas 1 a 4 de cada mes) por mecánico"""
+        rnd = self.rnd
+        id_pago = self._siguiente_id(PagoSalario)
+        salarios = {m: rnd.randrange(90_000, 180_000) * 100 for m in self.ids_mecanicos}
+        filas = []
+        for mes in self._meses():
+            for semana in range(1, 5):
+                fecha_pago = date(mes.year, mes.month, min(semana * 7, 28))
+                if fecha_pago > self.p.hasta:
+                    break
+                for id_mecanico, salario in salarios.items():
+                    filas.append({
+                        "id": id_pago,
+                        "id_mecanico": id_mecanico,
+                        "monto_salario": _monto(salario),
+                        "semana_pago": str(semana),
+                        "fecha_pago": fecha_pago,
+                        "created_at": datetime.combine(fecha_pago, datetime.min.time()),
+                        "updated_at": datetime.combine(fecha_pago, datetime.min.time()),
+                    })
+                    id_pago += 1
+        self._insertar_por_lotes(PagoSalario, iter(filas))
+
+
+def _preparar_conexion(conn: Connection) -> None:
+    """Ajustes de sesión que aceleran la carga masiva"""
+    if conn.dialect.name == "sqlite":
+        conn.exec_driver_sql("PRAGMA synchronous = OFF")
+    elif conn.dialect.name == "mysql":
+        conn.exec_driver_sql("SET unique_checks = 0")
+        conn.exec_driver_sql("SET foreign_key_checks = 0")
+
+
+def generar_datos(engine: Engine, parametros: ParametrosGeneracion, crear_tablas: bool = False) -> Dict[str, int]:
+    """
+    Genera los datos sintéticos en una sola transacción.
+    Falla si ya existen clientes, para no mezclar datos reales con sintéticos.
+    Devuelve la cantidad de filas insertadas por tabla.
+    """
+    from app.models.database import Base
+
+    if crear_tablas:
+        Base.metadata.create_all(engine)
+
+    with engine.begin() as conn:
+        if conn.execute(select(func.count()).select_from(Cliente.__table__)).scalar():
+            raise ValueError("La base de datos ya tiene clientes; use una base vacía para los datos sintéticos")
+        _preparar_conexion(conn)
+        conteos = GeneradorDatos(conn, parametros).generar()
+        for tabla in TABLAS_CONTADAS:
+            reconciliar_tabla(conn, tabla)
+        return conteos
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos deterministas del taller")
+    parser.add_argument("--trabajos", type=int, default=10_000)
+    parser.add_argument("--clientes", type=int, default=None, help="Por defecto: trabajos / 10")
+    parser.add_argument("--carros", type=int, default=None, help="Por defecto: clientes * 1.3")
+    parser.add_argument("--mecanicos", type=int, default=8)
+    parser.add_argument("--meses", type=int, default=24, help="Meses de historia hasta --hasta")
+    parser.add_argument("--hasta", type=date.fromisoformat, default=date(2025, 12, 31), help="Fecha final (AAAA-MM-DD)")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--lote", type=int, default=10_000, help="Filas por inserción masiva")
+    parser.add_argument("--crear-tablas", action="store_true", help="Crea las tablas si no existen")
+    args = parser.parse_args(argv)
+
+    from app.core.logging_config import configurar_logging
+    from app.models.database import engine
+
+    configurar_logging()
+    parametros = ParametrosGeneracion(
+        trabajos=args.trabajos, clientes=args.clientes, carros=args.carros, mecanicos=args.mecanicos,
+        meses=args.meses, hasta=args.hasta, semilla=args.semilla, lote=args.lote,
+    )
+
+    inicio = time.perf_counter()
+    conteos = generar_datos(engine, parametros, crear_tablas=args.crear_tablas)
+    duracion = time.perf_counter() - inicio
+    for tabla, cantidad in conteos.items():
+        logger.info("%s: %d filas", tabla, cantidad)
+    logger.info("Datos generados en %.1f s (%d filas)", duracion, sum(conteos.values()))
+
+
+if __name__ == "__main__":
+    main()
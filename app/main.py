@@ -1,8 +1,46 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import clientes, carros, trabajos, historial_duenos, detalle_gastos, reportes, mecanicos, gastos_taller, pagos_salarios
+from fastapi.responses import PlainTextResponse
+from app.core.logging_config import configurar_logging, RequestIdMiddleware
+from app.core import config
+from app.core.metricas import MetricasMiddleware, instalar_eventos_sql, registro as registro_metricas
+from app.core.instrumentacion_sql import InstrumentacionSQLMiddleware, instalar_instrumentacion
+from app.core.perfilador import PerfiladorMiddleware, instalar_perfilador
+from app.core.compresion import CompresionMiddleware
+from app.core import cache as cache_respuestas
+from app.core.registro_cambios import instalar_registro_cambios
+from app.core.cierres import instalar_proteccion_cierres
+from app.core.contadores import instalar_contadores, reconciliar_periodicamente
+from app.routes import clientes, carros, trabajos, historial_duenos, detalle_gastos, reportes, mecanicos, gastos_taller, pagos_salarios, sincronizacion, eventos, dashboard, cierres
+
+configurar_logging()
+instalar_eventos_sql()
+cache_respuestas.instalar_eventos_cache()
+instalar_registro_cambios()
+instalar_proteccion_cierres()
+instalar_contadores()
+if config.SQL_INSTRUMENTACION or config.PERFILADOR:
+    instalar_instrumentacion()
+
+
+@asynccontextmanager
+async def ciclo_de_vida(app: FastAPI):
+    # ✅ Caché compartida entre workers (CACHE_URL=redis://...); se conecta en cada worker
+    cache_respuestas.configurar_cache_compartida()
+    # ✅ Reconciliación periódica de los contadores de filas con COUNT(*)
+    reconciliacion = None
+    if config.CONTADORES_RECONCILIAR_MINUTOS > 0:
+        reconciliacion = asyncio.create_task(reconciliar_periodicamente(config.CONTADORES_RECONCILIAR_MINUTOS))
+    yield
+    if reconciliacion is not None:
+        reconciliacion.cancel()
+    cache_respuestas.detener_cache_compartida()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=ciclo_de_vida)
 
 # ✅ Activar CORS
 app.add_middleware(
@@ -11,8 +49,32 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", "Server-Timing", "ETag", "Last-Modified"],
 )
 
+# ✅ Compresión gzip/Brotli de las respuestas (no toca los eventos SSE)
+if config.COMPRESION:
+    app.add_middleware(
+        CompresionMiddleware,
+        minimo_bytes=config.COMPRESION_MINIMO_BYTES,
+        nivel_gzip=config.COMPRESION_NIVEL_GZIP,
+        calidad_brotli=config.COMPRESION_CALIDAD_BROTLI,
+    )
+
+# ✅ Detector de N+1 y consultas lentas (solo desarrollo)
+if config.SQL_INSTRUMENTACION:
+    app.add_middleware(InstrumentacionSQLMiddleware)
+
+# ✅ Perfilador con ?__profile=1 (solo desarrollo)
+if config.PERFILADOR:
+    app.add_middleware(PerfiladorMiddleware)
+
+# ✅ Latencia, consultas SQL por petición y encabezado Server-Timing
+app.add_middleware(MetricasMiddleware)
+
+# ✅ Correlación de logs por petición
+app.add_middleware(RequestIdMiddleware)
+
 # ✅ Registrar rutas
 app.include_router(clientes.router, prefix="/api")
 app.include_router(carros.router, prefix="/api")
@@ -23,7 +85,23 @@ app.include_router(reportes.router, prefix="/api")
 app.include_router(mecanicos.router, prefix="/api")
 app.include_router(gastos_taller.router, prefix="/api")
 app.include_router(pagos_salarios.router, prefix="/api")
+app.include_router(sincronizacion.router, prefix="/api")
+app.include_router(eventos.router, prefix="/api")
+app.include_router(dashboard.router, prefix="/api")
+app.include_router(cierres.router, prefix="/api")
 
 @app.get("/")
 def root():
     return {"message": "Bienvenido a Auto Andrade API"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metricas():
+    """Métricas de latencia y consultas SQL en formato de texto de Prometheus"""
+    contenido = registro_metricas.texto_prometheus() + cache_respuestas.texto_prometheus()
+    return PlainTextResponse(contenido, media_type="text/plain; version=0.0.4")
+
+
+# ✅ Perfilar los endpoints (después de registrar todas las rutas)
+if config.PERFILADOR:
+    instalar_perfilador(app)
@@ -10,6 +10,9 @@ from .comisiones_mecanicos import ComisionMecanico
 from .admin_taller import AdminTaller
 from .gastos_taller import GastoTaller
 from .pagos_salarios import PagoSalario
+from .registro_cambios import RegistroCambio, OperacionCambio
+from .cierres import CierrePeriodo, CierreComision, TipoCierre
+from .contadores import Contador
 
 
 def obtener_cliente_por_id(db: Session, id_cliente: str):
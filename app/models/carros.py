@@ -1,16 +1,18 @@
 from sqlalchemy import Column, String, Integer, ForeignKey
 from sqlalchemy.orm import relationship
-from .database import Base
+from .database import Base, columna_updated_at
 from sqlalchemy import DateTime
 from datetime import datetime
 class Carro(Base):
     __tablename__ = "carros"
 
-    matricula = Column(String(20), primary_key=True, unique=True, index=True)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    matricula = Column(String(20), unique=True, nullable=False, index=True)  # Llave de negocio, editable
     marca = Column(String(50))
     modelo = Column(String(50))
     anio = Column(Integer)
-    id_cliente_actual = Column(String(20), ForeignKey("clientes.id_nacional", ondelete="SET NULL"))
+    id_cliente = Column(Integer, ForeignKey("clientes.id", ondelete="SET NULL"), index=True)  # Dueño actual
+    updated_at = columna_updated_at()
 
     # ✅ Relación con Cliente
     cliente_actual = relationship("Cliente", back_populates="carros")
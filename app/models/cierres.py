@@ -0,0 +1,49 @@
+from sqlalchemy import Column, Integer, String, Date, DECIMAL, Enum, ForeignKey
+from sqlalchemy.orm import relationship
+from app.models.database import Base, FechaHoraMicro, ahora_utc
+from app.models.comisiones_mecanicos import EstadoComision
+import enum
+
+
+class TipoCierre(str, enum.Enum):
+    MES = "MES"
+    QUINCENA = "QUINCENA"
+
+
+class CierrePeriodo(Base):
+    """Montos congelados de un mes o quincena cerrado; no se modifican después del cierre"""
+    __tablename__ = "cierres_periodo"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    periodo = Column(String(10), nullable=False, unique=True)  # YYYY-MM o YYYY-MM-Q1 / YYYY-MM-Q2
+    tipo = Column(Enum(TipoCierre), nullable=False)
+    inicio = Column(Date, nullable=False)
+    fin = Column(Date, nullable=False)  # Exclusivo: primer día después del periodo
+    fecha_cierre = Column(FechaHoraMicro, nullable=False, default=ahora_utc)
+
+    ingresos = Column(DECIMAL(12, 2), nullable=False, default=0)
+    iva = Column(DECIMAL(12, 2), nullable=False, default=0)
+    mano_obra = Column(DECIMAL(12, 2), nullable=False, default=0)
+    markup_repuestos = Column(DECIMAL(12, 2), nullable=False, default=0)
+    costo_repuestos = Column(DECIMAL(12, 2), nullable=False, default=0)
+    comisiones = Column(DECIMAL(12, 2), nullable=False, default=0)  # Solo APROBADAS
+    gastos_taller = Column(DECIMAL(12, 2), nullable=False, default=0)  # Solo PAGADOS
+    salarios = Column(DECIMAL(12, 2), nullable=False, default=0)
+    cantidad_trabajos = Column(Integer, nullable=False, default=0)
+
+    comisiones_mecanicos = relationship("CierreComision", back_populates="cierre", cascade="all, delete-orphan")
+
+
+class CierreComision(Base):
+    """Comisiones de un periodo cerrado por mecánico y estado"""
+    __tablename__ = "cierres_comisiones"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id_cierre = Column(Integer, ForeignKey("cierres_periodo.id", ondelete="CASCADE"), nullable=False, index=True)
+    id_mecanico = Column(Integer, nullable=False)  # Sin llave foránea: la foto no depende del mecánico
+    nombre_mecanico = Column(String(100), nullable=False)
+    estado_comision = Column(Enum(EstadoComision), nullable=False)
+    cantidad = Column(Integer, nullable=False)
+    total = Column(DECIMAL(12, 2), nullable=False)
+
+    cierre = relationship("CierrePeriodo", back_populates="comisiones_mecanicos")
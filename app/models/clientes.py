@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Enum
+from sqlalchemy import Column, Integer, String, Enum
 from sqlalchemy.orm import relationship
-from .database import Base
+from .database import Base, columna_updated_at
 import enum
 
 class TipoCliente(str, enum.Enum):
@@ -10,12 +10,14 @@ class TipoCliente(str, enum.Enum):
 class Cliente(Base):
     __tablename__ = "clientes"
 
-    id_nacional = Column(String(20), primary_key=True, unique=True, index=True)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id_nacional = Column(String(20), unique=True, nullable=False, index=True)  # Cédula: llave de negocio, editable
     nombre = Column(String(100))
     apellido = Column(String(100), nullable=True)
     correo = Column(String(100), nullable=True)
     telefono = Column(String(20), nullable=True)
     tipo_cliente = Column(Enum(TipoCliente), nullable=False, default=TipoCliente.PERSONA)
+    updated_at = columna_updated_at()
 
     # ✅ Relación con Carros
     carros = relationship("Carro", back_populates="cliente_actual")
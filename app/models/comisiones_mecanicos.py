@@ -1,6 +1,6 @@
 from sqlalchemy import Column, Integer, ForeignKey, DateTime, DECIMAL, String, Enum
 from sqlalchemy.orm import relationship
-from .database import Base
+from .database import Base, columna_updated_at
 from datetime import datetime, timezone
 from decimal import Decimal
 import enum
@@ -24,6 +24,7 @@ class ComisionMecanico(Base):
     mes_reporte = Column(String(7), nullable=False)  # Formato: YYYY-MM para reportes mensuales
     estado_comision = Column(Enum(EstadoComision), nullable=False, default=EstadoComision.PENDIENTE)
     quincena = Column(String(7), nullable=True)  # Formato: YYYY-Q1, YYYY-Q2
+    updated_at = columna_updated_at()
 
     # Relaciones
     trabajo = relationship("Trabajo", back_populates="comisiones_mecanicos")
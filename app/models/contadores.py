@@ -0,0 +1,11 @@
+from sqlalchemy import Column, BigInteger, String
+from app.models.database import Base, FechaHoraMicro
+
+
+class Contador(Base):
+    """Cantidad de filas de una tabla, mantenida en la misma transacción que sus inserciones y eliminaciones"""
+    __tablename__ = "contadores"
+
+    tabla = Column(String(50), primary_key=True)
+    total = Column(BigInteger, nullable=False, default=0)
+    reconciliado = Column(FechaHoraMicro, nullable=True)  # Última vez que se comparó con COUNT(*)
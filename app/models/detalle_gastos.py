@@ -1,7 +1,7 @@
 from sqlalchemy import Column, Integer, String, ForeignKey, DECIMAL, DateTime
 from datetime import datetime, timezone
 from sqlalchemy.orm import relationship
-from app.models.database import Base
+from app.models.database import Base, columna_updated_at
 
 class DetalleGasto(Base):
     __tablename__ = "detalles_gastos"
@@ -11,5 +11,6 @@ class DetalleGasto(Base):
     descripcion = Column(String(255), nullable=False)
     monto = Column(DECIMAL(10, 2), nullable=False)  # Costo real del repuesto
     monto_cobrado = Column(DECIMAL(10, 2), nullable=True)  # Precio cobrado al cliente
+    updated_at = columna_updated_at()
 
     trabajo = relationship("Trabajo", back_populates="detalle_gastos")
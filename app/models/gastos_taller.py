@@ -1,6 +1,6 @@
 from sqlalchemy import Column, Integer, String, DECIMAL, DateTime, Text, Enum
 from datetime import datetime, timezone
-from app.models.database import Base
+from app.models.database import Base, columna_updated_at
 import enum
 
 class EstadoGasto(enum.Enum):
@@ -18,4 +18,4 @@ class GastoTaller(Base):
     fecha_pago = Column(DateTime, nullable=True)  # Nueva columna para fecha de pago
     estado = Column(Enum(EstadoGasto), nullable=False, default=EstadoGasto.PENDIENTE)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    updated_at = columna_updated_at()
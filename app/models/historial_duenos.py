@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Integer
+from sqlalchemy import Column, ForeignKey, DateTime, Integer
 from sqlalchemy.orm import relationship
 from .database import Base
 from datetime import datetime
@@ -7,8 +7,8 @@ class HistorialDueno(Base):
     __tablename__ = "historial_duenos"
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    matricula_carro = Column(String(20), ForeignKey("carros.matricula", ondelete="CASCADE"))
-    id_cliente = Column(String(20), ForeignKey("clientes.id_nacional", ondelete="SET NULL"))
+    id_carro = Column(Integer, ForeignKey("carros.id", ondelete="CASCADE"), index=True)
+    id_cliente = Column(Integer, ForeignKey("clientes.id", ondelete="SET NULL"), index=True)
     fecha_inicio = Column(DateTime, default=datetime.utcnow)
     fecha_fin = Column(DateTime, nullable=True)
 
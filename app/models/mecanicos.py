@@ -1,6 +1,6 @@
 from sqlalchemy import Column, String, Integer, DateTime, Boolean, DECIMAL
 from sqlalchemy.orm import relationship
-from .database import Base
+from .database import Base, columna_updated_at
 from datetime import datetime
 
 class Mecanico(Base):
@@ -15,7 +15,7 @@ class Mecanico(Base):
     fecha_contratacion = Column(DateTime, default=datetime.utcnow)
     activo = Column(Boolean, nullable=False, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = columna_updated_at()
 
     # Relaciones
     trabajos_mecanicos = relationship("TrabajoMecanico", back_populates="mecanico", cascade="all, delete-orphan")
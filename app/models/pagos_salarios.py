@@ -1,7 +1,7 @@
 from sqlalchemy import Column, Integer, String, DECIMAL, DateTime, ForeignKey, Date
 from datetime import datetime, timezone
 from sqlalchemy.orm import relationship
-from app.models.database import Base
+from app.models.database import Base, columna_updated_at
 
 class PagoSalario(Base):
     __tablename__ = "pagos_salarios"
@@ -12,6 +12,7 @@ class PagoSalario(Base):
     semana_pago = Column(String(10), nullable=False)  # MySQL usa VARCHAR(10) como en tu dump
     fecha_pago = Column(Date, nullable=False)  # MySQL usa DATE, no DATETIME
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = columna_updated_at()
 
     # Relaciones
     mecanico = relationship("Mecanico", back_populates="pagos_salarios")
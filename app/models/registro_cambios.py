@@ -0,0 +1,21 @@
+from sqlalchemy import Column, BigInteger, Integer, String, Enum
+from app.models.database import Base, FechaHoraMicro, ahora_utc
+import enum
+
+
+class OperacionCambio(str, enum.Enum):
+    CREAR = "CREAR"
+    ACTUALIZAR = "ACTUALIZAR"
+    ELIMINAR = "ELIMINAR"
+
+
+class RegistroCambio(Base):
+    """Bitácora de cambios solo de inserción; su id es el token de GET /api/sync"""
+    __tablename__ = "registro_cambios"
+
+    # BIGINT en MySQL; SQLite solo autoincrementa llaves INTEGER
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    tabla = Column(String(50), nullable=False)
+    id_fila = Column(String(50), nullable=False)  # Llave primaria de la fila como texto
+    operacion = Column(Enum(OperacionCambio), nullable=False)
+    fecha = Column(FechaHoraMicro, nullable=False, default=ahora_utc)
@@ -1,4 +1,5 @@
 import hashlib
+import logging
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.models.database import get_db
@@ -6,6 +7,7 @@ from app.models.admin_taller import AdminTaller
 from app.schemas.auth import AuthRequest, AuthResponse
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 @router.post("/auth", response_model=AuthResponse)
 def autenticar_usuario(auth_data: AuthRequest, db: Session = Depends(get_db)):
@@ -39,7 +41,7 @@ def autenticar_usuario(auth_data: AuthRequest, db: Session = Depends(get_db)):
             )
             
     except Exception as e:
-        print(f"Error en autenticación: {str(e)}")
+        logger.exception("Error en autenticación")
         return AuthResponse(
             success=False,
             message="Error interno del servidor"
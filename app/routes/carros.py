@@ -1,58 +1,73 @@
 from datetime import datetime
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.models.database import get_db
+from app.models.database import get_db, get_read_db
+from app.core.etag import etag_tablas
 from app.models.carros import Carro
 from app.models.historial_duenos import HistorialDueno
 from app.models.clientes import Cliente
 from app.models.trabajos import Trabajo
 from app.models.detalle_gastos import DetalleGasto
-from app.schemas.carros import CarroSchema
+from app.schemas.carros import CarroSchema, CarroListado
+from app.services import lecturas
+import logging
+
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
-#Obtener todos los carros
-@router.get("/carros/")
-def obtener_todos_los_carros(db: Session = Depends(get_db)):
-    carros = db.query(Carro).all()
-
-    resultado = []
-    for carro in carros:
-        cliente = db.query(Cliente).filter(Cliente.id_nacional == carro.id_cliente_actual).first()
-        resultado.append({
-            "matricula": carro.matricula,
-            "marca": carro.marca,
-            "modelo": carro.modelo,
-            "anio": carro.anio,
-            "id_cliente_actual": carro.id_cliente_actual,
-            "nombre_cliente": f"{cliente.nombre} {cliente.apellido}".strip() if cliente else "Sin propietario"
-        })
+def _cliente_por_cedula(db: Session, id_nacional: Optional[str]) -> Optional[Cliente]:
+    """Cliente con esa cédula (None si no se indicó); 400 si no existe"""
+    if not id_nacional:
+        return None
+    cliente = db.query(Cliente).filter(Cliente.id_nacional == id_nacional).first()
+    if not cliente:
+        raise HTTPException(status_code=400, detail="El cliente especificado no existe")
+    return cliente
+
+
+def _carro_respuesta(carro: Carro) -> dict:
+    return {
+        "id": carro.id,
+        "matricula": carro.matricula,
+        "marca": carro.marca,
+        "modelo": carro.modelo,
+        "anio": carro.anio,
+        "id_cliente_actual": carro.cliente_actual.id_nacional if carro.cliente_actual else None,
+    }
 
-    return resultado
+
+#Obtener todos los carros
+@router.get("/carros/", response_model=List[CarroListado], dependencies=[etag_tablas("carros", "clientes")])
+def obtener_todos_los_carros(db: Session = Depends(get_read_db)):
+    # ✅ Una sola consulta con JOIN al cliente, sin hidratar entidades
+    return lecturas.carros(db)
 
 #OBTENER HISTORIAL COMPLETO DE UN CARRO
-@router.get("/carros/historial/{matricula}")
-def obtener_historial_carro(matricula: str, db: Session = Depends(get_db)):
+@router.get("/carros/historial/{matricula}", dependencies=[etag_tablas("carros", "clientes", "historial_duenos", "trabajos", "detalles_gastos")])
+def obtener_historial_carro(matricula: str, db: Session = Depends(get_read_db)):
     carro = db.query(Carro).filter(Carro.matricula == matricula).first()
     if not carro:
         raise HTTPException(status_code=404, detail="Carro no encontrado")
 
-    cliente_actual = db.query(Cliente).filter(Cliente.id_nacional == carro.id_cliente_actual).first()
+    cliente_actual = carro.cliente_actual
     dueno_actual = {
         "id_cliente": cliente_actual.id_nacional if cliente_actual else None,
         "nombre": f"{cliente_actual.nombre} {cliente_actual.apellido}".strip() if cliente_actual else "Sin dueño"
     }
 
     historial_duenos = (
-        db.query(HistorialDueno, Cliente.nombre)
-        .outerjoin(Cliente, HistorialDueno.id_cliente == Cliente.id_nacional)
-        .filter(HistorialDueno.matricula_carro == carro.matricula)
+        db.query(HistorialDueno, Cliente.id_nacional, Cliente.nombre)
+        .outerjoin(Cliente, HistorialDueno.id_cliente == Cliente.id)
+        .filter(HistorialDueno.id_carro == carro.id)
         .all()
     )
 
     lista_duenos = [
         {
-            "id_cliente": d.HistorialDueno.id_cliente,
+            "id_cliente": d.id_nacional,
             "nombre": d.nombre if d.nombre else "Desconocido",
             "fecha_inicio": d.HistorialDueno.fecha_inicio,
             "fecha_fin": d.HistorialDueno.fecha_fin
@@ -60,7 +75,7 @@ def obtener_historial_carro(matricula: str, db: Session = Depends(get_db)):
         for d in historial_duenos
     ]
     historial_trabajos = (
-        db.query(Trabajo).filter(Trabajo.matricula_carro == carro.matricula).all()
+        db.query(Trabajo).filter(Trabajo.id_carro == carro.id).all()
     )
 
     lista_trabajos = []
@@ -102,24 +117,21 @@ def crear_carro(carro: CarroSchema, db: Session = Depends(get_db)):
     if carro_existente:
         raise HTTPException(status_code=400, detail="Ya existe un carro con esta matrícula")
 
-    if carro.id_cliente_actual:
-        cliente_existente = db.query(Cliente).filter(Cliente.id_nacional == carro.id_cliente_actual).first()
-        if not cliente_existente:
-            raise HTTPException(status_code=400, detail="El cliente especificado no existe")
+    dueno = _cliente_por_cedula(db, carro.id_cliente_actual)
 
     nuevo_carro = Carro(
         matricula=carro.matricula,
         marca=carro.marca,
         modelo=carro.modelo,
         anio=carro.anio,
-        id_cliente_actual=carro.id_cliente_actual
+        cliente_actual=dueno
     )
     db.add(nuevo_carro)
 
-    if carro.id_cliente_actual:
+    if dueno:
         historial = HistorialDueno(
-            matricula_carro=nuevo_carro.matricula,
-            id_cliente=carro.id_cliente_actual,
+            carro=nuevo_carro,
+            cliente=dueno,
             fecha_inicio=datetime.utcnow(),
             fecha_fin=None
         )
@@ -127,7 +139,7 @@ def crear_carro(carro: CarroSchema, db: Session = Depends(get_db)):
 
     db.commit()
     db.refresh(nuevo_carro)
-    return {"message": "Carro creado correctamente", "carro": nuevo_carro}
+    return {"message": "Carro creado correctamente", "carro": _carro_respuesta(nuevo_carro)}
 
 
 # ✅ ACTUALIZAR DUEÑO DE UN CARRO
@@ -137,25 +149,33 @@ def actualizar_info_carro(matricula: str, data: CarroSchema, db: Session = Depen
     if not carro_db:
         raise HTTPException(status_code=404, detail="Carro no encontrado")
 
+    # Si la matrícula cambió, verificar que no exista otro carro con la nueva matrícula
+    if data.matricula != matricula:
+        if db.query(Carro).filter(Carro.matricula == data.matricula).first():
+            raise HTTPException(status_code=400, detail="Ya existe un carro con esta matrícula")
+
+    nuevo_dueno = _cliente_por_cedula(db, data.id_cliente_actual)
+
     # Verificar si el dueño cambió
     dueño_cambio = False
-    if carro_db.id_cliente_actual != data.id_cliente_actual:
+    if carro_db.id_cliente != (nuevo_dueno.id if nuevo_dueno else None):
         dueño_cambio = True
-        print(f"🔄 Dueño cambió de {carro_db.id_cliente_actual} a {data.id_cliente_actual}")
+        logger.debug("Dueño cambió de %s a %s", carro_db.id_cliente, data.id_cliente_actual)
 
-    # Actualizar información básica del carro
+    # Actualizar información básica del carro (✅ trabajos e historial apuntan al id: la matrícula se edita en esta fila)
+    carro_db.matricula = data.matricula
     carro_db.marca = data.marca
     carro_db.modelo = data.modelo
     carro_db.anio = data.anio
     
     # Si cambió el dueño, manejar el historial
-    if dueño_cambio and carro_db.id_cliente_actual:
+    if dueño_cambio and carro_db.id_cliente:
         # 1. Cerrar el historial del dueño anterior
         historial_anterior = (
             db.query(HistorialDueno)
             .filter(
-                HistorialDueno.matricula_carro == matricula,
-                HistorialDueno.id_cliente == carro_db.id_cliente_actual,
+                HistorialDueno.id_carro == carro_db.id,
+                HistorialDueno.id_cliente == carro_db.id_cliente,
                 HistorialDueno.fecha_fin == None
             )
             .first()
@@ -163,20 +183,20 @@ def actualizar_info_carro(matricula: str, data: CarroSchema, db: Session = Depen
         
         if historial_anterior:
             historial_anterior.fecha_fin = datetime.utcnow()
-            print(f"✅ Historial anterior cerrado: {historial_anterior.id}")
+            logger.debug("Historial anterior cerrado: %s", historial_anterior.id)
         
         # 2. Crear nuevo historial para el nuevo dueño
         nuevo_historial = HistorialDueno(
-            matricula_carro=matricula,
-            id_cliente=data.id_cliente_actual,
+            id_carro=carro_db.id,
+            id_cliente=nuevo_dueno.id if nuevo_dueno else None,
             fecha_inicio=datetime.utcnow(),
             fecha_fin=None
         )
         db.add(nuevo_historial)
-        print(f"✅ Nuevo historial creado para: {data.id_cliente_actual}")
+        logger.debug("Nuevo historial creado para: %s", data.id_cliente_actual)
     
     # Actualizar el dueño actual
-    carro_db.id_cliente_actual = data.id_cliente_actual
+    carro_db.cliente_actual = nuevo_dueno
 
     db.commit()
     db.refresh(carro_db)
@@ -195,7 +215,7 @@ def eliminar_carro(matricula: str, db: Session = Depends(get_db)):
     if not carro_db:
         raise HTTPException(status_code=404, detail="Carro no encontrado")
 
-    trabajos = db.query(Trabajo).filter(Trabajo.matricula_carro == matricula).all()
+    trabajos = db.query(Trabajo).filter(Trabajo.id_carro == carro_db.id).all()
     for trabajo in trabajos:
         db.query(DetalleGasto).filter(DetalleGasto.id_trabajo == trabajo.id).delete()
         db.delete(trabajo)
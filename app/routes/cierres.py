@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+from app.models.database import get_db
+from app.core.etag import coincide_etag
+from app.services.cierres import CierreService, CierreError, CierreExistenteError
+
+router = APIRouter(prefix="/cierres", tags=["Cierres"])
+
+# La foto de un periodo cerrado no cambia nunca: el navegador y los proxies pueden guardarla sin volver a preguntar
+CACHE_INMUTABLE = "private, max-age=31536000, immutable"
+
+
+# ✅ Cerrar un mes (YYYY-MM) o una quincena (YYYY-MM-Q1 / YYYY-MM-Q2)
+@router.post("/{periodo}", status_code=201)
+def cerrar_periodo(periodo: str, db: Session = Depends(get_db)):
+    """
+    Congela los montos del estado de resultados y las comisiones por mecánico del periodo.
+    Después del cierre se rechaza (409) toda escritura que cambie esos montos.
+    """
+    try:
+        return CierreService(db).cerrar(periodo)
+    except CierreExistenteError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except CierreError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/")
+def listar_cierres(db: Session = Depends(get_db)):
+    return CierreService(db).listar()
+
+
+@router.get("/{periodo}")
+def obtener_cierre(periodo: str, request: Request, response: Response, db: Session = Depends(get_db)):
+    """Foto congelada del periodo; se sirve con Cache-Control: immutable"""
+    cierre = CierreService(db).obtener(periodo)
+    if cierre is None:
+        raise HTTPException(status_code=404, detail=f"El periodo {periodo} no está cerrado")
+
+    etag = f'"cierre-{cierre.id}"'
+    encabezados = {"ETag": etag, "Cache-Control": CACHE_INMUTABLE}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and coincide_etag(if_none_match, etag):
+        raise HTTPException(status_code=304, headers=encabezados)
+    response.headers.update(encabezados)
+    return CierreService.a_dict(cierre)
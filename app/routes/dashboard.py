@@ -0,0 +1,38 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.models.database import get_db
+from app.core.cache import cache_respuesta
+from app.services.dashboard import DashboardService
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+# ✅ Resumen del dashboard: todos los indicadores del mes en una sola petición
+@router.get("/resumen")
+def obtener_resumen(
+    mes: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="Mes en formato YYYY-MM (por defecto el actual)"),
+    db: Session = Depends(get_db),
+):
+    """
+    Totales generales, trabajos e ingresos del mes, gastos del taller pagados, salarios,
+    comisiones por quincena y estado, comisiones por mecánico y el resumen financiero.
+    """
+    if mes is None:
+        ahora = datetime.now()
+        anio, numero_mes = ahora.year, ahora.month
+    else:
+        anio, numero_mes = (int(parte) for parte in mes.split("-"))
+        if not 1 <= numero_mes <= 12:
+            raise HTTPException(status_code=400, detail=f"Mes inválido: {mes}")
+    # ✅ El mes actual se resuelve antes de la caché: forma parte de la clave y cambia al cambiar de mes
+    return _resumen(anio=anio, mes=numero_mes, db=db)
+
+
+@cache_respuesta(
+    "clientes", "carros", "trabajos", "detalles_gastos", "gastos_taller",
+    "pagos_salarios", "comisiones_mecanicos", "mecanicos",
+)
+def _resumen(anio: int, mes: int, db: Session):
+    return DashboardService(db).resumen(anio, mes)
@@ -1,26 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.models.database import get_db
+from app.models.database import get_db, get_read_db
+from app.core.etag import etag_tablas
 from app.models.detalle_gastos import DetalleGasto
-from app.schemas.detalle_gastos import DetalleGastoSchema
+from app.schemas.detalle_gastos import DetalleGastoSchema, DetalleGastoListado
+from app.services import lecturas
 from typing import List
 
 router = APIRouter()
 
-@router.get("/detalles-gastos")
-def obtener_detalles_gastos(db: Session = Depends(get_db)):
+@router.get("/detalles-gastos", response_model=List[DetalleGastoListado], dependencies=[etag_tablas("detalles_gastos")])
+def obtener_detalles_gastos(db: Session = Depends(get_read_db)):
     """Obtener todos los detalles de gastos"""
-    detalles = db.query(DetalleGasto).all()
-    return [
-        {
-            "id": detalle.id,
-            "id_trabajo": detalle.id_trabajo,
-            "descripcion": detalle.descripcion,
-            "monto": float(detalle.monto),
-            "monto_cobrado": float(detalle.monto_cobrado) if detalle.monto_cobrado else None
-        }
-        for detalle in detalles
-    ]
+    return lecturas.detalles_gastos(db)
 
 @router.put("/detalle_gastos/{id_gasto}")
 def actualizar_detalle_gasto(id_gasto: int, gasto_update: DetalleGastoSchema, db: Session = Depends(get_db)):
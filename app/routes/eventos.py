@@ -0,0 +1,35 @@
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.core.eventos_cambios import flujo_eventos
+from app.core.registro_cambios import TABLAS_SINCRONIZADAS
+
+router = APIRouter(tags=["Eventos"])
+
+
+# ✅ Canal de eventos (SSE): el dashboard refresca solo lo que cambió en lugar de consultar periódicamente
+@router.get("/eventos")
+async def eventos_cambios(
+    tablas: Optional[str] = Query(None, description="Tablas separadas por coma, ej: trabajos,comisiones_mecanicos"),
+    since: Optional[int] = Query(None, ge=0, description="Token desde el cual reenviar cambios al conectar"),
+    last_event_id: Optional[int] = Header(None, ge=0),
+):
+    """
+    Server-Sent Events con los cambios confirmados de trabajos, detalles_gastos, clientes,
+    carros, comisiones_mecanicos y gastos_taller: {"token", "cambios": [{"entidad", "id", "op"}]}.
+    Con el evento `recargar` el cliente debe volver a cargar todo (o usar GET /api/sync).
+    """
+    filtro = None
+    if tablas:
+        filtro = {t.strip() for t in tablas.split(",") if t.strip()}
+        desconocidas = filtro - TABLAS_SINCRONIZADAS
+        if desconocidas:
+            raise HTTPException(status_code=400, detail=f"Tablas no sincronizadas: {', '.join(sorted(desconocidas))}")
+
+    # El navegador envía Last-Event-ID al reconectar
+    desde = last_event_id if last_event_id is not None else since
+    return StreamingResponse(
+        flujo_eventos(filtro, desde),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
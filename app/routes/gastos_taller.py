@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from app.models.database import get_db
+from app.models.database import get_db, get_read_db
+from app.core.cache import cache_respuesta
+from app.core.etag import etag_tablas
 from app.models.gastos_taller import GastoTaller as GastoTallerModel, EstadoGasto
 from app.schemas.gastos_taller import GastoTallerCreate, GastoTallerUpdate, GastoTaller, EstadoGasto as EstadoGastoSchema
+from app.services import lecturas
 from typing import List, Optional
 from datetime import datetime, timedelta
 
@@ -30,11 +33,13 @@ def crear_gasto_taller(gasto: GastoTallerCreate, db: Session = Depends(get_db)):
         db.commit()
         db.refresh(db_gasto)
         return db_gasto
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error al crear gasto: {str(e)}")
 
-@router.get("/", response_model=List[GastoTaller])
+@router.get("/", response_model=List[GastoTaller], dependencies=[etag_tablas("gastos_taller")])
 def listar_gastos_taller(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
@@ -42,36 +47,16 @@ def listar_gastos_taller(
     estado: Optional[EstadoGastoSchema] = Query(None),
     fecha_inicio: Optional[datetime] = Query(None),
     fecha_fin: Optional[datetime] = Query(None),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Listar gastos del taller con filtros opcionales"""
     try:
-        query = db.query(GastoTallerModel)
-        
-        # Aplicar filtros
-        if categoria:
-            query = query.filter(GastoTallerModel.categoria.ilike(f"%{categoria}%"))
-        
-        if estado:
-            query = query.filter(GastoTallerModel.estado == estado)
-        
-        if fecha_inicio:
-            query = query.filter(GastoTallerModel.fecha_gasto >= fecha_inicio)
-        
-        if fecha_fin:
-            query = query.filter(GastoTallerModel.fecha_gasto <= fecha_fin)
-        
-        # Ordenar por fecha más reciente
-        query = query.order_by(GastoTallerModel.fecha_gasto.desc())
-        
-        # Aplicar paginación
-        gastos = query.offset(skip).limit(limit).all()
-        return gastos
+        return lecturas.gastos_taller(db, skip, limit, categoria, estado, fecha_inicio, fecha_fin)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al listar gastos: {str(e)}")
 
-@router.get("/{gasto_id}", response_model=GastoTaller)
-def obtener_gasto_taller(gasto_id: int, db: Session = Depends(get_db)):
+@router.get("/{gasto_id}", response_model=GastoTaller, dependencies=[etag_tablas("gastos_taller")])
+def obtener_gasto_taller(gasto_id: int, db: Session = Depends(get_read_db)):
     """Obtener un gasto específico por ID"""
     try:
         gasto = db.query(GastoTallerModel).filter(GastoTallerModel.id == gasto_id).first()
@@ -167,6 +152,7 @@ def cambiar_estado_gasto(
         raise HTTPException(status_code=500, detail=f"Error al cambiar estado del gasto: {str(e)}")
 
 @router.get("/estadisticas/resumen")
+@cache_respuesta("gastos_taller")
 def obtener_estadisticas_gastos(
     fecha_inicio: Optional[datetime] = Query(None),
     fecha_fin: Optional[datetime] = Query(None),
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Body
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func
-from app.models.database import get_db
+from app.models.database import get_db, get_read_db
+from app.core.cache import cache_respuesta
+from app.core.etag import etag_tablas
 from app.models.mecanicos import Mecanico as MecanicoModel
 from app.models.trabajos_mecanicos import TrabajoMecanico
 from app.models.comisiones_mecanicos import ComisionMecanico
@@ -13,12 +15,18 @@ from app.schemas.mecanicos import (
     Mecanico as MecanicoSchema,
     MecanicoConEstadisticas,
     AsignacionMecanico,
-    AsignacionMecanicoResponse
+    AsignacionMecanicoResponse,
+    AprobacionComisionesLote,
+    ComisionListado
 )
 from app.services.mecanicos import MecanicoService
+from app.services import lecturas
 from typing import List, Optional
 from datetime import datetime
 import calendar
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/mecanicos", tags=["mecanicos"])
 
@@ -56,7 +64,8 @@ def crear_mecanico(mecanico: MecanicoCreate, db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/", response_model=List[MecanicoSchema])
+@router.get("/", response_model=List[MecanicoSchema], dependencies=[etag_tablas("mecanicos")])
+@cache_respuesta("mecanicos")
 def listar_mecanicos(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
@@ -64,37 +73,18 @@ def listar_mecanicos(
     db: Session = Depends(get_db)
 ):
     """Listar todos los mecánicos con paginación"""
-    service = MecanicoService(db)
-    mecanicos = service.obtener_todos_los_mecanicos()
-    
-    # Aplicar filtros
-    if activo is not None:
-        # Por ahora todos los mecánicos se consideran activos
-        pass
-    
-    # Aplicar paginación
-    mecanicos_paginados = mecanicos[skip:skip + limit]
-    
-    # Convertir al formato esperado
-    resultado = []
-    for mecanico in mecanicos_paginados:
-        resultado.append(MecanicoSchema(
-            id=mecanico["id"],
-            id_nacional=mecanico.get("id_nacional", ""),
-            nombre=mecanico["nombre"],
-            telefono=mecanico.get("telefono"),
-            porcentaje_comision=mecanico.get("porcentaje_comision"),
-            fecha_contratacion=mecanico.get("fecha_contratacion"),
-            activo=True
-        ))
-    
-    return resultado
+    # Por ahora todos los mecánicos se consideran activos: el filtro `activo` no se aplica
+    return lecturas.mecanicos(db, skip, limit)
 
-@router.get("/{mecanico_id}/estadisticas", response_model=MecanicoConEstadisticas)
+@router.get(
+    "/{mecanico_id}/estadisticas",
+    response_model=MecanicoConEstadisticas,
+    dependencies=[etag_tablas("mecanicos", "comisiones_mecanicos", "trabajos")],
+)
 def obtener_estadisticas_mecanico(
     mecanico_id: int,
     mes: Optional[str] = Query(None, description="Formato: YYYY-MM"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Obtener estadísticas de un mecánico (trabajos, ganancias, comisiones)"""
     try:
@@ -107,8 +97,8 @@ def obtener_estadisticas_mecanico(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/{mecanico_id}", response_model=MecanicoSchema)
-def obtener_mecanico(mecanico_id: int, db: Session = Depends(get_db)):
+@router.get("/{mecanico_id}", response_model=MecanicoSchema, dependencies=[etag_tablas("mecanicos")])
+def obtener_mecanico(mecanico_id: int, db: Session = Depends(get_read_db)):
     """Obtener un mecánico específico por ID"""
     service = MecanicoService(db)
     mecanico = service.obtener_mecanico_por_id(mecanico_id)
@@ -180,7 +170,7 @@ def test_debug(db: Session = Depends(get_db)):
 
 
 @router.get("/reporte/mensual/{mes}", response_model=List[MecanicoConEstadisticas])
-def obtener_reporte_mensual(mes: str, db: Session = Depends(get_db)):
+def obtener_reporte_mensual(mes: str, db: Session = Depends(get_read_db)):
     """Obtener reporte mensual de todos los mecánicos"""
     try:
         service = MecanicoService(db)
@@ -212,11 +202,11 @@ def obtener_reporte_mensual(mes: str, db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/buscar/", response_model=List[MecanicoSchema])
+@router.get("/buscar/", response_model=List[MecanicoSchema], dependencies=[etag_tablas("mecanicos")])
 def buscar_mecanicos(
     q: str = Query(..., min_length=1, description="Término de búsqueda"),
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Buscar mecánicos por nombre o especialidad"""
     service = MecanicoService(db)
@@ -245,45 +235,25 @@ def asignar_mecanicos_a_trabajo(
     db: Session = Depends(get_db)
 ):
     """Asignar múltiples mecánicos a un trabajo y calcular comisiones automáticamente"""
-    print(f"🚨🚨🚨 ENDPOINT LLAMADO - Trabajo {trabajo_id} - Mecánicos: {mecanicos}")
-    print(f"🔍 API: Endpoint llamado para trabajo {trabajo_id}")
-    print(f"🔍 API: Mecánicos recibidos: {mecanicos}")
-    print(f"🔍 API: Tipo de trabajo_id: {type(trabajo_id)}")
-    print(f"🔍 API: Tipo de mecanicos: {type(mecanicos)}")
-    print(f"🔍 API: Longitud de mecanicos: {len(mecanicos) if mecanicos else 0}")
-    
-    if mecanicos:
-        print(f"🔍 API: Primer mecánico: {mecanicos[0]}")
-        print(f"🔍 API: Tipo del primer mecánico: {type(mecanicos[0])}")
-        print(f"🔍 API: Atributos del primer mecánico: {mecanicos[0].__dict__ if hasattr(mecanicos[0], '__dict__') else 'No tiene __dict__'}")
-        
-        # Log detallado de cada campo
-        primer_mecanico = mecanicos[0]
-        print(f"🔍 API: id_mecanico: {primer_mecanico.id_mecanico} (tipo: {type(primer_mecanico.id_mecanico)})")
-        print(f"🔍 API: porcentaje_comision: {primer_mecanico.porcentaje_comision} (tipo: {type(primer_mecanico.porcentaje_comision)})")
+    logger.debug("Asignando mecánicos al trabajo %s: %s", trabajo_id, mecanicos)
     
     try:
-        print(f"🔍 API: Iniciando procesamiento...")
         mecanicos_ids = [m.id_mecanico for m in mecanicos]
-        print(f"🔍 API: IDs de mecánicos extraídos: {mecanicos_ids}")
-        print(f"🔍 API: Tipo de mecanicos_ids: {type(mecanicos_ids)}")
         
         # Verificar que el trabajo existe antes de continuar
         trabajo = db.query(Trabajo).filter(Trabajo.id == trabajo_id).first()
         if not trabajo:
-            print(f"❌ API: Trabajo {trabajo_id} no encontrado en la base de datos")
+            logger.debug("Trabajo %s no encontrado en la base de datos", trabajo_id)
             raise HTTPException(status_code=404, detail=f"Trabajo {trabajo_id} no encontrado")
         
-        print(f"✅ API: Trabajo {trabajo_id} encontrado - Descripción: {trabajo.descripcion}")
-        
-        print(f"🔍 API: Llamando al servicio para {len(mecanicos_ids)} mecánicos...")
+        logger.debug("Trabajo %s encontrado, asignando %d mecánicos", trabajo_id, len(mecanicos_ids))
         service = MecanicoService(db)
         resultado = service.asignar_multiples_mecanicos_trabajo(trabajo_id, mecanicos_ids)
         
         if "error" in resultado:
             raise HTTPException(status_code=400, detail=resultado["error"])
         
-        print(f"🔍 API: Resultado del servicio: {resultado}")
+        logger.debug("Resultado del servicio: %s", resultado)
         
         # Construir respuesta para todos los mecánicos
         respuesta = []
@@ -301,17 +271,15 @@ def asignar_mecanicos_a_trabajo(
                 ganancia_trabajo=resultado["ganancia_base"]
             ))
         
-        print(f"✅ API: Respuesta final con {len(respuesta)} elementos")
         return respuesta
         
     except ValueError as e:
-        print(f"❌ API: Error de valor: {e}")
+        logger.debug("Error de valor al asignar mecánicos: %s", e)
         raise HTTPException(status_code=404, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"❌ API: Error general: {e}")
-        print(f"❌ API: Tipo de error: {type(e).__name__}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error al asignar mecánicos al trabajo %s", trabajo_id)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/trabajos/{trabajo_id}/actualizar-comisiones")
@@ -322,23 +290,19 @@ def actualizar_comisiones_trabajo(
 ):
     """Actualizar comisiones existentes de un trabajo (para edición) en lugar de crear nuevas"""
     try:
-        print(f"🔍 API: Actualizando comisiones para trabajo {trabajo_id}")
-        print(f"🔍 API: Mecánicos recibidos: {mecanicos}")
+        logger.debug("Actualizando comisiones para trabajo %s: %s", trabajo_id, mecanicos)
         
         mecanicos_ids = [m.id_mecanico for m in mecanicos]
-        print(f"🔍 API: IDs de mecánicos extraídos: {mecanicos_ids}")
         
         # Verificar que el trabajo existe
         trabajo = db.query(Trabajo).filter(Trabajo.id == trabajo_id).first()
         if not trabajo:
             raise HTTPException(status_code=404, detail=f"Trabajo {trabajo_id} no encontrado")
         
-        print(f"✅ API: Trabajo {trabajo_id} encontrado - Descripción: {trabajo.descripcion}")
-        
         # Llamar al servicio para actualizar comisiones
         service = MecanicoService(db)
         resultado = service.actualizar_comisiones_trabajo(trabajo_id, mecanicos_ids)
-        print(f"✅ API: Comisiones actualizadas - {resultado}")
+        logger.debug("Comisiones actualizadas: %s", resultado)
         
         return {
             "message": f"Comisiones actualizadas para trabajo {trabajo_id}",
@@ -347,14 +311,16 @@ def actualizar_comisiones_trabajo(
         
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"❌ API: Error al actualizar comisiones: {e}")
+        logger.exception("Error al actualizar comisiones del trabajo %s", trabajo_id)
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/trabajos/{trabajo_id}/asignados")
+@router.get("/trabajos/{trabajo_id}/asignados", dependencies=[etag_tablas("trabajos", "comisiones_mecanicos", "mecanicos")])
 def obtener_mecanicos_asignados_trabajo(
     trabajo_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Obtener los mecánicos asignados a un trabajo específico"""
     try:
@@ -389,10 +355,13 @@ def obtener_mecanicos_asignados_trabajo(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/{mecanico_id}/trabajos")
+@router.get(
+    "/{mecanico_id}/trabajos",
+    dependencies=[etag_tablas("mecanicos", "comisiones_mecanicos", "trabajos", "carros", "detalles_gastos")],
+)
 def obtener_trabajos_mecanico(
     mecanico_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Obtener los trabajos asignados a un mecánico específico"""
     try:
@@ -409,7 +378,10 @@ def obtener_trabajos_mecanico(
         # Obtener los detalles de cada trabajo
         trabajos_detallados = []
         for comision in comisiones:
-            trabajo = db.query(Trabajo).filter(Trabajo.id == comision["id_trabajo"]).first()
+            trabajo = (
+                db.query(Trabajo).options(joinedload(Trabajo.carro))
+                .filter(Trabajo.id == comision["id_trabajo"]).first()
+            )
             if trabajo:
                 # Obtener la comisión específica del mecánico para este trabajo
                 comision_mecanico = db.query(ComisionMecanico).filter(
@@ -439,7 +411,7 @@ def obtener_trabajos_mecanico(
                 trabajo_info = {
                     "id": trabajo.id,
                     "fecha": trabajo.fecha.isoformat() if trabajo.fecha else None,
-                    "matricula_carro": trabajo.matricula_carro,
+                    "matricula_carro": trabajo.carro.matricula if trabajo.carro else None,
                     "descripcion": trabajo.descripcion,
                     "costo": float(trabajo.costo or 0),
                     "mano_obra": mano_obra,
@@ -475,41 +447,21 @@ def cambiar_estado_comision_mecanico(
         
         return resultado
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/todas-comisiones/")
-def obtener_todas_comisiones(db: Session = Depends(get_db)):
+@router.get("/todas-comisiones/", response_model=List[ComisionListado], dependencies=[etag_tablas("comisiones_mecanicos")])
+def obtener_todas_comisiones(db: Session = Depends(get_read_db)):
     """
     Obtener todas las comisiones de todos los mecánicos
     """
     try:
-        # Primero probar si la tabla existe y tiene datos
-        comisiones = db.query(ComisionMecanico).all()
-        
-        # Si no hay comisiones, devolver lista vacía
-        if not comisiones:
-            return []
-        
-        resultado = []
-        for comision in comisiones:
-            resultado.append({
-                "id": comision.id,
-                "id_trabajo": comision.id_trabajo,
-                "id_mecanico": comision.id_mecanico,
-                "ganancia_trabajo": float(comision.ganancia_trabajo),
-                "porcentaje_comisi": float(comision.porcentaje_comisi),
-                "monto_comision": float(comision.monto_comision),
-                "fecha_calculo": comision.fecha_calculo.isoformat(),
-                "mes_reporte": comision.mes_reporte,
-                "estado_comision": comision.estado_comision,
-                "quincena": comision.quincena
-            })
-        
-        return resultado
+        return lecturas.todas_comisiones(db)
         
     except Exception as e:
-        print(f"Error en obtener_todas_comisiones: {str(e)}")
+        logger.exception("Error en obtener_todas_comisiones")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/test-comisiones/")
@@ -555,10 +507,16 @@ def asignar_quincenas_comisiones_pendientes(db: Session = Depends(get_db)):
         
         return resultado
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/{mecanico_id}/comisiones/quincena/{quincena}")
+@router.get(
+    "/{mecanico_id}/comisiones/quincena/{quincena}",
+    dependencies=[etag_tablas("mecanicos", "comisiones_mecanicos", "trabajos")],
+)
+@cache_respuesta("comisiones_mecanicos", "trabajos")
 def obtener_comisiones_quincena_mecanico(
     mecanico_id: int,
     quincena: str,
@@ -593,33 +551,33 @@ def aprobar_denegar_comisiones_quincena(
         
         return resultado
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/todas-comisiones/", response_model=List[dict])
-def obtener_todas_comisiones(db: Session = Depends(get_db)):
+@router.post("/comisiones/quincenas/estado")
+def aprobar_denegar_comisiones_quincenas_lote(
+    datos: AprobacionComisionesLote,
+    db: Session = Depends(get_db)
+):
     """
-    Obtener todas las comisiones de todos los mecánicos
+    Aprueba o deniega en bloque las comisiones pendientes de varios mecánicos y
+    quincenas, con una sentencia UPDATE por quincena. Si se omite mecanicos_ids
+    aplica a todo el taller; una lista vacía se rechaza con 422.
     """
     try:
-        comisiones = db.query(ComisionMecanico).all()
+        service = MecanicoService(db)
+        resultado = service.aprobar_denegar_comisiones_quincenas_lote(
+            datos.quincenas, datos.aprobar, datos.mecanicos_ids
+        )
         
-        resultado = []
-        for comision in comisiones:
-            resultado.append({
-                "id": comision.id,
-                "id_trabajo": comision.id_trabajo,
-                "id_mecanico": comision.id_mecanico,
-                "ganancia_trabajo": float(comision.ganancia_trabajo),
-                "porcentaje_comisi": float(comision.porcentaje_comisi),
-                "monto_comision": float(comision.monto_comision),
-                "fecha_calculo": comision.fecha_calculo.isoformat(),
-                "mes_reporte": comision.mes_reporte,
-                "estado_comision": comision.estado_comision,
-                "quincena": comision.quincena
-            })
+        if "error" in resultado:
+            raise HTTPException(status_code=400, detail=resultado["error"])
         
         return resultado
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from app.models.database import get_db
+from app.models.database import get_db, get_read_db
+from app.core.cache import cache_respuesta
+from app.core.etag import etag_tablas
 from app.models.pagos_salarios import PagoSalario as PagoSalarioModel
 from app.models.mecanicos import Mecanico as MecanicoModel
 from app.schemas.pagos_salarios import PagoSalarioCreate, PagoSalarioUpdate, PagoSalario
+from app.services import lecturas
 from typing import List, Optional
 from datetime import datetime, timedelta
 
@@ -38,7 +41,7 @@ def crear_pago_salario(pago: PagoSalarioCreate, db: Session = Depends(get_db)):
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error al crear pago de salario: {str(e)}")
 
-@router.get("/", response_model=List[PagoSalario])
+@router.get("/", response_model=List[PagoSalario], dependencies=[etag_tablas("pagos_salarios", "mecanicos")])
 def listar_pagos_salarios(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
@@ -46,41 +49,16 @@ def listar_pagos_salarios(
     semana_pago: Optional[str] = Query(None),
     fecha_inicio: Optional[datetime] = Query(None),
     fecha_fin: Optional[datetime] = Query(None),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Listar pagos de salarios con filtros opcionales"""
     try:
-        query = db.query(PagoSalarioModel).join(MecanicoModel)
-        
-        # Aplicar filtros
-        if id_mecanico:
-            query = query.filter(PagoSalarioModel.id_mecanico == id_mecanico)
-        
-        if semana_pago:
-            query = query.filter(PagoSalarioModel.semana_pago == semana_pago)
-        
-        if fecha_inicio:
-            query = query.filter(PagoSalarioModel.fecha_pago >= fecha_inicio)
-        
-        if fecha_fin:
-            query = query.filter(PagoSalarioModel.fecha_pago <= fecha_fin)
-        
-        # Ordenar por fecha más reciente
-        query = query.order_by(PagoSalarioModel.fecha_pago.desc())
-        
-        # Aplicar paginación
-        pagos = query.offset(skip).limit(limit).all()
-        
-        # Agregar nombres de mecánicos
-        for pago in pagos:
-            pago.nombre_mecanico = pago.mecanico.nombre
-        
-        return pagos
+        return lecturas.pagos_salarios(db, skip, limit, id_mecanico, semana_pago, fecha_inicio, fecha_fin)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al listar pagos: {str(e)}")
 
-@router.get("/{pago_id}", response_model=PagoSalario)
-def obtener_pago_salario(pago_id: int, db: Session = Depends(get_db)):
+@router.get("/{pago_id}", response_model=PagoSalario, dependencies=[etag_tablas("pagos_salarios", "mecanicos")])
+def obtener_pago_salario(pago_id: int, db: Session = Depends(get_read_db)):
     """Obtener un pago específico por ID"""
     try:
         pago = db.query(PagoSalarioModel).join(MecanicoModel).filter(PagoSalarioModel.id == pago_id).first()
@@ -139,6 +117,7 @@ def eliminar_pago_salario(pago_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error al eliminar pago: {str(e)}")
 
 @router.get("/estadisticas/resumen")
+@cache_respuesta("pagos_salarios", "mecanicos")
 def obtener_estadisticas_pagos(
     fecha_inicio: Optional[datetime] = Query(None),
     fecha_fin: Optional[datetime] = Query(None),
@@ -1,19 +1,29 @@
-from fastapi import APIRouter, Depends
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from app.models.database import get_db
+from app.core.cache import cache_respuesta
+from app.core.contadores import leer_totales
 from app.models.trabajos import Trabajo
 from app.models.detalle_gastos import DetalleGasto
-from app.models.clientes import Cliente
-from app.models.carros import Carro
+from app.services.estado_resultados import EstadoResultadosService, Granularidad
+from app.services.series import SeriesService
 
 router = APIRouter(
     prefix="/reportes",
     tags=["Reportes"]
 )
 
+def _totales_clientes_carros(db: Session):
+    totales = leer_totales(db, ("clientes", "carros"))
+    return {"total_clientes": totales["clientes"], "total_carros": totales["carros"]}
+
+
 # 📅 Reporte mensual con ingresos, gastos y conteos
 @router.get("/mensual/{mes}/{anio}")
+@cache_respuesta("trabajos", "detalles_gastos", "clientes", "carros")
 def reporte_mensual(mes: int, anio: int, db: Session = Depends(get_db)):
     trabajos_mes = db.query(Trabajo).filter(
         func.extract('month', Trabajo.fecha) == mes,
@@ -31,8 +41,7 @@ def reporte_mensual(mes: int, anio: int, db: Session = Depends(get_db)):
             "iva_calculado": 0,
             "ganancia_neta": 0,
             "cantidad_trabajos": 0,
-            "total_clientes": db.query(func.count()).select_from(Cliente).scalar(),
-            "total_carros": db.query(func.count()).select_from(Carro).scalar()
+            **_totales_clientes_carros(db)
         }
 
     ingresos = sum(float(t.costo) for t in trabajos_mes)
@@ -62,9 +71,6 @@ def reporte_mensual(mes: int, anio: int, db: Session = Depends(get_db)):
     ganancia_neta = round(ingresos - gastos + markup_total - iva, 2)
 
 
-    total_clientes = db.query(func.count()).select_from(Cliente).scalar()
-    total_carros = db.query(func.count()).select_from(Carro).scalar()
-
     return {
         "mes": mes,
         "anio": anio,
@@ -74,19 +80,58 @@ def reporte_mensual(mes: int, anio: int, db: Session = Depends(get_db)):
         "iva_calculado": iva,
         "ganancia_neta": ganancia_neta,
         "cantidad_trabajos": cantidad_trabajos,
-        "total_clientes": total_clientes,
-        "total_carros": total_carros
+        **_totales_clientes_carros(db)
     }
 
 # 📊 Totales generales (dashboard)
 @router.get("/totales")
+@cache_respuesta("clientes", "carros", "trabajos")
 def obtener_totales(db: Session = Depends(get_db)):
-    total_clientes = db.query(func.count()).select_from(Cliente).scalar()
-    total_carros = db.query(func.count()).select_from(Carro).scalar()
-    total_trabajos = db.query(func.count()).select_from(Trabajo).scalar()
+    # ✅ Desde la tabla contadores, sin COUNT(*) sobre las tablas
+    totales = leer_totales(db)
 
     return {
-        "total_clientes": total_clientes,
-        "total_carros": total_carros,
-        "total_trabajos": total_trabajos
+        "total_clientes": totales["clientes"],
+        "total_carros": totales["carros"],
+        "total_trabajos": totales["trabajos"]
     }
+
+
+# 💰 Estado de resultados: ingresos y todos los costos (repuestos, comisiones, gastos del taller, salarios)
+@router.get("/estado-resultados")
+def estado_resultados(
+    desde: date = Query(..., description="Primer día del rango (YYYY-MM-DD)"),
+    hasta: date = Query(..., description="Último día del rango, inclusive"),
+    granularidad: Granularidad = Query(Granularidad.MES),
+    db: Session = Depends(get_db)
+):
+    if hasta < desde:
+        raise HTTPException(status_code=400, detail="'hasta' debe ser igual o posterior a 'desde'")
+    # ✅ "consolidado" depende del día de hoy: el día forma parte de la clave de la caché
+    return _estado_resultados(desde=desde, hasta=hasta, granularidad=granularidad, hoy=date.today(), db=db)
+
+
+@cache_respuesta("trabajos", "detalles_gastos", "comisiones_mecanicos", "gastos_taller", "pagos_salarios", "cierres_periodo")
+def _estado_resultados(desde: date, hasta: date, granularidad: Granularidad, hoy: date, db: Session):
+    try:
+        return EstadoResultadosService(db).calcular(desde, hasta, granularidad, hoy)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# 📈 Series de tiempo para gráficos: ingresos, gastos, markup, IVA, ganancia y trabajos por periodo
+@router.get("/series")
+@cache_respuesta("trabajos", "detalles_gastos")
+def series_trabajos(
+    desde: date = Query(..., description="Primer día del rango (YYYY-MM-DD)"),
+    hasta: date = Query(..., description="Último día del rango, inclusive"),
+    granularidad: Granularidad = Query(Granularidad.MES),
+    puntos: Optional[int] = Query(None, ge=1, le=1000, description="Máximo de puntos; se unen periodos consecutivos"),
+    db: Session = Depends(get_db)
+):
+    if hasta < desde:
+        raise HTTPException(status_code=400, detail="'hasta' debe ser igual o posterior a 'desde'")
+    try:
+        return SeriesService(db).serie(desde, hasta, granularidad, puntos)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,27 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.models.database import get_db
+from app.schemas.sincronizacion import RespuestaSincronizacion
+from app.services.sincronizacion import SincronizacionService
+
+router = APIRouter(tags=["Sincronización"])
+
+
+# ✅ Cambios desde un token: el dashboard recarga solo lo que cambió
+@router.get("/sync", response_model=RespuestaSincronizacion, response_model_exclude_unset=True)
+def sincronizar(
+    since: Optional[int] = Query(None, ge=0, description="Token devuelto por la llamada anterior; sin él se devuelve el token actual"),
+    limite: int = Query(1000, ge=1, le=5000, description="Máximo de cambios de la bitácora por respuesta"),
+    db: Session = Depends(get_db),
+):
+    """
+    Devuelve las filas creadas, actualizadas y eliminadas de trabajos, detalles_gastos,
+    clientes, carros, comisiones_mecanicos y gastos_taller desde el token `since`.
+    Cada fila tiene el formato de su listado (GET /api/trabajos/, /api/clientes/, ...).
+    Si `mas` es verdadero hay más cambios: se vuelve a llamar con el nuevo `token`.
+    """
+    service = SincronizacionService(db)
+    if since is None:
+        return {"token": service.token_actual(), "mas": False, "cambios": {}}
+    return service.obtener_cambios(since, limite)
@@ -1,15 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import Iterable, List, Optional, Set
 from sqlalchemy.orm import Session
-from app.models.database import get_db
+from app.models.database import get_db, get_read_db
+from app.core.cache import cache_respuesta
+from app.core.etag import etag_tablas
 from app.models.trabajos import Trabajo
 from app.models.detalle_gastos import DetalleGasto
 from app.models.carros import Carro  # ✅ Importar el modelo de Carro
 from app.models.comisiones_mecanicos import ComisionMecanico
-from app.models.mecanicos import Mecanico
-from app.schemas.trabajos import TrabajoSchema
-from app.models.clientes import Cliente  
-from weasyprint import HTML
-from app.services.facturacion import generar_html_factura
+from app.schemas.trabajos import TrabajoSchema, TrabajoListado, ComisionesQuincenaSchema
+from app.services.facturacion import generar_html_factura, renderizar_pdf
+from app.services import lecturas
 from decimal import Decimal
 from datetime import datetime, timezone
 
@@ -48,73 +49,31 @@ def calcular_ganancia_neta(mano_obra: float, markup_repuestos: float, gastos_rea
     return max(ganancia_neta, Decimal('0.00'))  # No permitir ganancias negativas
 
 
-# OBTENER TODOS LOS TRABAJOS
-@router.get("/")
-def obtener_todos_los_trabajos(db: Session = Depends(get_db)):
-    trabajos = db.query(Trabajo).all()
-    resultado = []
-
-    for trabajo in trabajos:
-        carro = db.query(Carro).filter(Carro.matricula == trabajo.matricula_carro).first()
-
-        cliente = None
-        if carro:
-            cliente = db.query(Cliente).filter(Cliente.id_nacional == carro.id_cliente_actual).first()
+def _valores_parametro(valor: str, permitidos: Iterable[str], parametro: str) -> Set[str]:
+    """Valores de un parámetro separado por comas, ej: ?fields=id,fecha,costo"""
+    valores = {v.strip() for v in valor.split(",") if v.strip()}
+    desconocidos = valores - set(permitidos)
+    if desconocidos:
+        raise HTTPException(status_code=400, detail=f"Valores desconocidos en {parametro}: {', '.join(sorted(desconocidos))}")
+    return valores
 
-        # Gastos como Decimal
-        gastos = db.query(DetalleGasto).filter(DetalleGasto.id_trabajo == trabajo.id).all()
-        total_gastos = sum(
-            (g.monto if isinstance(g.monto, Decimal) else Decimal(str(g.monto)))
-            for g in gastos
-        )
-
-        # Costo como Decimal
-        costo = trabajo.costo if isinstance(trabajo.costo, Decimal) else Decimal(str(trabajo.costo))
-        # Ganancia total del trabajo (costo - gastos) - solo para información general
-        ganancia_total = costo - total_gastos
-        
-        # Ganancia base para comisiones (mano de obra - gastos reales)
-        mano_obra = trabajo.mano_obra if isinstance(trabajo.mano_obra, Decimal) else Decimal(str(trabajo.mano_obra or '0.00'))
-        ganancia_base_comisiones = mano_obra - total_gastos
-
-        # ✅ OBTENER MECÁNICOS ASIGNADOS AL TRABAJO
-        mecanicos_asignados = db.query(ComisionMecanico).filter(
-            ComisionMecanico.id_trabajo == trabajo.id
-        ).all()
-        
-        # Lista de IDs de mecánicos asignados
-        mecanicos_ids = [m.id_mecanico for m in mecanicos_asignados]
-        
-        # Obtener nombres de los mecánicos asignados
-        nombres_mecanicos = []
-        for mecanico_id in mecanicos_ids:
-            mecanico = db.query(Mecanico).filter(Mecanico.id == mecanico_id).first()
-            if mecanico:
-                nombres_mecanicos.append(mecanico.nombre)
-
-        resultado.append({
-            "id": trabajo.id,
-            "matricula_carro": trabajo.matricula_carro,
-            "descripcion": trabajo.descripcion,
-            "fecha": trabajo.fecha.strftime("%Y-%m-%d"),
-            "fecha_registro": trabajo.fecha_registro.strftime("%Y-%m-%d") if trabajo.fecha_registro else trabajo.fecha.strftime("%Y-%m-%d"),
-            "costo": float(costo),
-            "mano_obra": float(trabajo.mano_obra or 0.0),
-            "markup_repuestos": float(trabajo.markup_repuestos or 0.0),
-            "ganancia": float(trabajo.ganancia or 0.0),
-            "aplica_iva": trabajo.aplica_iva,
-            "cliente_nombre": f"{cliente.nombre} {cliente.apellido}".strip() if cliente else "Sin cliente",
-            "cliente_id": cliente.id_nacional if cliente else None,
-            "total_gastos": float(total_gastos),
-            "ganancia_total": float(ganancia_total),  # Ganancia total del trabajo
-            "ganancia_base_comisiones": float(ganancia_base_comisiones),  # Ganancia base para comisiones
-            # ✅ NUEVOS CAMPOS PARA MECÁNICOS
-            "mecanicos_ids": mecanicos_ids,  # Lista de IDs de mecánicos asignados
-            "mecanicos_nombres": nombres_mecanicos,  # Lista de nombres de mecánicos
-            "total_mecanicos": len(mecanicos_ids),  # Número total de mecánicos asignados
-        })
 
-    return resultado
+# OBTENER TODOS LOS TRABAJOS
+@router.get(
+    "/",
+    response_model=List[TrabajoListado],
+    response_model_exclude_unset=True,
+    dependencies=[etag_tablas("trabajos", "carros", "clientes", "detalles_gastos", "comisiones_mecanicos", "mecanicos")],
+)
+def obtener_todos_los_trabajos(
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas (por defecto, todos)"),
+    include: Optional[str] = Query(None, description="Expansiones separadas por comas: gastos, mecanicos"),
+    db: Session = Depends(get_read_db),
+):
+    # ✅ Solo se leen las columnas y JOIN de los campos pedidos, sin hidratar entidades
+    campos = _valores_parametro(fields, lecturas.CAMPOS_TRABAJOS, "fields") if fields else lecturas.CAMPOS_TRABAJOS
+    incluir = _valores_parametro(include, lecturas.INCLUIBLES_TRABAJOS, "include") if include else ()
+    return lecturas.trabajos(db, campos, incluir)
 
 
 # CREAR UN NUEVO TRABAJO CON GASTOS
@@ -135,7 +94,7 @@ def crear_trabajo(trabajo: TrabajoSchema, db: Session = Depends(get_db)):
     )
 
     nuevo_trabajo = Trabajo(
-        matricula_carro=trabajo.matricula_carro,
+        id_carro=carro_existente.id,
         descripcion=trabajo.descripcion,
         fecha=trabajo.fecha,
         fecha_registro=trabajo.fecha_registro if trabajo.fecha_registro else trabajo.fecha,
@@ -167,26 +126,26 @@ def crear_trabajo(trabajo: TrabajoSchema, db: Session = Depends(get_db)):
 
 
 # OBTENER UN TRABAJO ESPECÍFICO CON SUS GASTOS
-@router.get("/trabajo/{id}")
-def obtener_trabajo(id: int, db: Session = Depends(get_db)):
+@router.get("/trabajo/{id}", dependencies=[etag_tablas("trabajos", "carros", "clientes", "detalles_gastos")])
+def obtener_trabajo(id: int, db: Session = Depends(get_read_db)):
     trabajo = db.query(Trabajo).filter(Trabajo.id == id).first()
     if not trabajo:
         raise HTTPException(status_code=404, detail="Trabajo no encontrado")
     
     # Obtener información del carro
-    carro = db.query(Carro).filter(Carro.matricula == trabajo.matricula_carro).first()
+    carro = trabajo.carro
     
     # Obtener información del cliente
     cliente = None
     if carro:
-        cliente = db.query(Cliente).filter(Cliente.id_nacional == carro.id_cliente_actual).first()
+        cliente = carro.cliente_actual
     
     # Obtener gastos del trabajo
     gastos = db.query(DetalleGasto).filter(DetalleGasto.id_trabajo == trabajo.id).all()
     
     return {
         "id": trabajo.id,
-        "matricula_carro": trabajo.matricula_carro,
+        "matricula_carro": carro.matricula if carro else None,
         "descripcion": trabajo.descripcion,
         "fecha": trabajo.fecha.strftime("%Y-%m-%d"),
         "fecha_registro": trabajo.fecha_registro.strftime("%Y-%m-%d") if trabajo.fecha_registro else trabajo.fecha.strftime("%Y-%m-%d"),
@@ -308,6 +267,8 @@ def recalcular_ganancias_todos_trabajos(db: Session = Depends(get_db)):
             "trabajos_actualizados": trabajos_actualizados
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error al recalcular ganancias: {str(e)}")
@@ -315,14 +276,15 @@ def recalcular_ganancias_todos_trabajos(db: Session = Depends(get_db)):
 
 @router.get("/{id}/factura", response_class=Response)
 def generar_factura_pdf(id: int, aplicar_iva: bool = True, db: Session = Depends(get_db)):
+    # ✅ El PDF no se cachea: son bytes grandes que desplazarían las respuestas de la LRU y llenarían Redis
     # Buscar el trabajo
     trabajo = db.query(Trabajo).filter(Trabajo.id == id).first()
     if not trabajo:
         raise HTTPException(status_code=404, detail="Trabajo no encontrado")
 
     # Buscar carro y cliente relacionados
-    carro = db.query(Carro).filter(Carro.matricula == trabajo.matricula_carro).first()
-    cliente = db.query(Cliente).filter(Cliente.id_nacional == carro.id_cliente_actual).first()
+    carro = trabajo.carro
+    cliente = carro.cliente_actual
 
     # Buscar los gastos asociados
     gastos = db.query(DetalleGasto).filter(DetalleGasto.id_trabajo == trabajo.id).all()
@@ -354,7 +316,7 @@ def generar_factura_pdf(id: int, aplicar_iva: bool = True, db: Session = Depends
 
     # Generar HTML y convertirlo a PDF
     html = generar_html_factura(datos)
-    pdf = HTML(string=html).write_pdf()
+    pdf = renderizar_pdf(html)
 
     return Response(content=pdf, media_type="application/pdf", headers={
         "Content-Disposition": f"inline; filename=factura_trabajo_{id}.pdf"
@@ -362,8 +324,8 @@ def generar_factura_pdf(id: int, aplicar_iva: bool = True, db: Session = Depends
 
 
 # OBTENER SOLO LOS GASTOS DE UN TRABAJO
-@router.get("/trabajo/{id}/gastos")
-def obtener_gastos_trabajo(id: int, db: Session = Depends(get_db)):
+@router.get("/trabajo/{id}/gastos", dependencies=[etag_tablas("trabajos", "detalles_gastos")])
+def obtener_gastos_trabajo(id: int, db: Session = Depends(get_read_db)):
     """Obtener solo los gastos detallados de un trabajo específico"""
     trabajo = db.query(Trabajo).filter(Trabajo.id == id).first()
     if not trabajo:
@@ -444,48 +406,23 @@ def generar_estados_comisiones_quincena(quincena: str, db: Session = Depends(get
             "comisiones_actualizadas": comisiones_actualizadas
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error al generar estados de comisiones: {str(e)}")
 
 
 # OBTENER COMISIONES POR QUINCENA
-@router.get("/comisiones/quincena/{quincena}")
+@router.get("/comisiones/quincena/{quincena}", response_model=ComisionesQuincenaSchema)
+@cache_respuesta("comisiones_mecanicos", "mecanicos", "trabajos")
 def obtener_comisiones_quincena(quincena: str, db: Session = Depends(get_db)):
     """
     Obtiene todas las comisiones de una quincena específica con información detallada
     """
     try:
-        from app.models.comisiones_mecanicos import ComisionMecanico
-        from app.models.mecanicos import Mecanico
-        
-        # Obtener comisiones de la quincena con información del mecánico y trabajo
-        comisiones = db.query(
-            ComisionMecanico,
-            Mecanico.nombre.label('nombre_mecanico'),
-            Trabajo.descripcion.label('descripcion_trabajo')
-        ).join(
-            Mecanico, ComisionMecanico.id_mecanico == Mecanico.id
-        ).join(
-            Trabajo, ComisionMecanico.id_trabajo == Trabajo.id
-        ).filter(
-            ComisionMecanico.quincena == quincena
-        ).all()
-        
-        resultado = []
-        for comision, nombre_mecanico, descripcion_trabajo in comisiones:
-            resultado.append({
-                "id": comision.id,
-                "id_trabajo": comision.id_trabajo,
-                "id_mecanico": comision.id_mecanico,
-                "nombre_mecanico": nombre_mecanico,
-                "descripcion_trabajo": descripcion_trabajo,
-                "monto_comision": float(comision.monto_comision),
-                "estado_comision": comision.estado_comision.value,
-                "quincena": comision.quincena,
-                "fecha_calculo": comision.fecha_calculo.strftime("%Y-%m-%d %H:%M:%S")
-            })
-        
+        resultado = lecturas.comisiones_quincena(db, quincena)
+
         return {
             "quincena": quincena,
             "total_comisiones": len(resultado),
@@ -529,6 +466,8 @@ def cambiar_estado_comision(
             "nuevo_estado": nuevo_estado
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error al cambiar estado: {str(e)}")
@@ -536,7 +475,7 @@ def cambiar_estado_comision(
 
 # OBTENER REPORTE FINANCIERO DE COMISIONES POR QUINCENA
 @router.get("/comisiones/reporte-financiero/{quincena}")
-def obtener_reporte_financiero_comisiones(quincena: str, db: Session = Depends(get_db)):
+def obtener_reporte_financiero_comisiones(quincena: str, db: Session = Depends(get_read_db)):
     """
     Obtiene el reporte financiero de comisiones para una quincena específica
     Solo incluye comisiones APROBADAS para gastos
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import Optional
 
 class CarroSchema(BaseModel):
     matricula: str
@@ -9,3 +10,13 @@ class CarroSchema(BaseModel):
 
     class Config:
         from_attributes = True
+
+# ✅ Fila del listado de carros (GET /carros/)
+class CarroListado(BaseModel):
+    id: int  # Llave de /api/sync y /api/eventos
+    matricula: str
+    marca: Optional[str] = None
+    modelo: Optional[str] = None
+    anio: Optional[int] = None
+    id_cliente_actual: Optional[str] = None
+    nombre_cliente: str
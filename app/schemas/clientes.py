@@ -1,6 +1,8 @@
 from pydantic import BaseModel, EmailStr
 from typing import Optional, List
+from datetime import datetime
 from app.models.clientes import TipoCliente
+from app.core.serializacion import Dinero
 
 class ClienteSchema(BaseModel):
     id_nacional: str  # ✅ Ahora usamos id_nacional en lugar de id
@@ -30,3 +32,15 @@ class ClienteUpdate(BaseModel):
 
 class ClienteConCarrosSchema(ClienteSchema):
     carros: List[dict]  # ✅ Para devolver los carros asociados en el GET
+
+# ✅ Fila del listado de clientes (GET /clientes/)
+class ClienteListado(BaseModel):
+    id: int  # Llave de /api/sync y /api/eventos
+    id_nacional: str
+    nombre: Optional[str] = None
+    apellido: Optional[str] = None
+    correo: Optional[str] = None
+    telefono: Optional[str] = None
+    total_gastado: Dinero
+    vehicle_count: int
+    registration_date: datetime
@@ -1,4 +1,6 @@
 from pydantic import BaseModel
+from typing import Optional
+from app.core.serializacion import Dinero
 
 class DetalleGastoSchema(BaseModel):
     descripcion: str
@@ -6,3 +8,11 @@ class DetalleGastoSchema(BaseModel):
 
     class Config:
         from_attributes = True  # Para compatibilidad con Pydantic v2
+
+# ✅ Fila del listado de repuestos (GET /detalles-gastos)
+class DetalleGastoListado(BaseModel):
+    id: int
+    id_trabajo: int
+    descripcion: str
+    monto: Dinero
+    monto_cobrado: Optional[Dinero] = None
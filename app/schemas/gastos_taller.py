@@ -3,6 +3,7 @@ from typing import Optional
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
+from app.core.serializacion import Dinero
 
 class EstadoGasto(str, Enum):
     PENDIENTE = "PENDIENTE"
@@ -10,7 +11,7 @@ class EstadoGasto(str, Enum):
 
 class GastoTallerBase(BaseModel):
     descripcion: str = Field(..., min_length=1, description="Descripción del gasto")
-    monto: Decimal = Field(..., gt=0, description="Monto del gasto")
+    monto: Dinero = Field(..., gt=0, description="Monto del gasto")
     categoria: str = Field(..., min_length=1, description="Categoría del gasto")
     fecha_gasto: datetime = Field(..., description="Fecha del gasto")
     fecha_pago: Optional[datetime] = Field(None, description="Fecha de pago del gasto")
@@ -1,7 +1,9 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List, Union
+from typing import Optional, List
 from datetime import datetime, date
 from decimal import Decimal
+from app.core.serializacion import Dinero
+from app.schemas.trabajos import EstadoComision
 
 # Schema base para Mecánico
 class MecanicoBase(BaseModel):
@@ -9,7 +11,7 @@ class MecanicoBase(BaseModel):
     nombre: str = Field(..., min_length=1, max_length=100, description="Nombre completo del mecánico")
     telefono: Optional[str] = Field(None, max_length=20, description="Número de teléfono")
     fecha_contratacion: Optional[date] = Field(None, description="Fecha de contratación")
-    porcentaje_comision: Optional[Decimal] = Field(None, description="Porcentaje de comisión")
+    porcentaje_comision: Optional[float] = Field(None, ge=0, le=100, description="Porcentaje de comisión (0 a 100)")
 
 # Schema para crear un nuevo mecánico
 class MecanicoCreate(MecanicoBase):
@@ -44,7 +46,7 @@ class MecanicoConEstadisticas(Mecanico):
 # Schema para asignación de mecánico a trabajo
 class AsignacionMecanico(BaseModel):
     id_mecanico: int = Field(..., description="ID del mecánico a asignar")
-    porcentaje_comision: Optional[Union[int, float]] = Field(None, description="Porcentaje de comisión personalizado")
+    porcentaje_comision: Optional[float] = Field(None, ge=0, le=100, description="Porcentaje de comisión personalizado (0 a 100)")
 
 # Schema para respuesta de asignación
 class AsignacionMecanicoResponse(BaseModel):
@@ -57,3 +59,24 @@ class AsignacionMecanicoResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+# Schema para aprobar/denegar comisiones de varias quincenas y mecánicos en bloque
+class AprobacionComisionesLote(BaseModel):
+    quincenas: List[str] = Field(..., min_length=1, description="Quincenas a procesar (formato: YYYY-Q1, YYYY-Q2)")
+    aprobar: bool = Field(..., description="True para aprobar, False para denegar")
+    mecanicos_ids: Optional[List[int]] = Field(
+        None, min_length=1, description="IDs de mecánicos; si se omite se procesa todo el taller (no puede ir vacía)"
+    )
+
+# Schema para el listado de todas las comisiones (GET /mecanicos/todas-comisiones/)
+class ComisionListado(BaseModel):
+    id: int
+    id_trabajo: int
+    id_mecanico: int
+    ganancia_trabajo: Dinero
+    porcentaje_comisi: float = Field(..., ge=0, le=100)
+    monto_comision: Dinero
+    fecha_calculo: str
+    mes_reporte: Optional[str] = None
+    estado_comision: EstadoComision
+    quincena: Optional[str] = None
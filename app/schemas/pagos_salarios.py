@@ -2,10 +2,11 @@ from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import date, datetime
 from decimal import Decimal
+from app.core.serializacion import Dinero
 
 class PagoSalarioBase(BaseModel):
     id_mecanico: int = Field(..., description="ID del mecánico")
-    monto_salario: Decimal = Field(..., gt=0, description="Monto del salario")
+    monto_salario: Dinero = Field(..., gt=0, description="Monto del salario")
     semana_pago: str = Field(..., pattern="^[1-4]$", description="Semana de pago (1, 2, 3 o 4)")
     fecha_pago: date = Field(..., description="Fecha del pago")
 
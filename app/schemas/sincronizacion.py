@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+from app.schemas.carros import CarroListado
+from app.schemas.clientes import ClienteListado
+from app.schemas.detalle_gastos import DetalleGastoListado
+from app.schemas.gastos_taller import GastoTaller
+from app.schemas.mecanicos import ComisionListado
+from app.schemas.trabajos import TrabajoListado
+
+Fila = TypeVar("Fila")
+
+# ✅ Cambios de una tabla: las filas tienen el mismo formato que su listado
+class CambiosTabla(BaseModel, Generic[Fila]):
+    creados: List[Fila] = []
+    actualizados: List[Fila] = []
+    eliminados: List[int] = []
+
+# Solo se envían las tablas con cambios
+class CambiosSincronizacion(BaseModel):
+    trabajos: Optional[CambiosTabla[TrabajoListado]] = None
+    detalles_gastos: Optional[CambiosTabla[DetalleGastoListado]] = None
+    clientes: Optional[CambiosTabla[ClienteListado]] = None
+    carros: Optional[CambiosTabla[CarroListado]] = None
+    comisiones_mecanicos: Optional[CambiosTabla[ComisionListado]] = None
+    gastos_taller: Optional[CambiosTabla[GastoTaller]] = None
+
+# ✅ Respuesta de GET /api/sync
+class RespuestaSincronizacion(BaseModel):
+    token: int
+    mas: bool
+    cambios: CambiosSincronizacion = CambiosSincronizacion()
@@ -2,6 +2,8 @@ from pydantic import BaseModel
 from typing import List, Optional
 from datetime import date
 from enum import Enum
+from app.core.serializacion import Dinero
+from app.schemas.detalle_gastos import DetalleGastoListado
 
 class EstadoComision(str, Enum):
     PENDIENTE = "PENDIENTE"
@@ -38,10 +40,43 @@ class ComisionQuincenaSchema(BaseModel):
     id_mecanico: int
     nombre_mecanico: str
     descripcion_trabajo: str
-    monto_comision: float
+    monto_comision: Dinero
     estado_comision: EstadoComision
     quincena: str
     fecha_calculo: str
 
     class Config:
         from_attributes = True
+
+class ComisionesQuincenaSchema(BaseModel):
+    quincena: str
+    total_comisiones: int
+    comisiones: List[ComisionQuincenaSchema]
+
+class MecanicoAsignado(BaseModel):
+    id: int
+    nombre: Optional[str] = None
+
+# ✅ Fila del listado de trabajos (GET /trabajos/). Con ?fields= solo se envían los campos pedidos
+class TrabajoListado(BaseModel):
+    id: Optional[int] = None
+    matricula_carro: Optional[str] = None
+    descripcion: Optional[str] = None
+    fecha: Optional[date] = None
+    fecha_registro: Optional[date] = None
+    costo: Optional[Dinero] = None
+    mano_obra: Optional[Dinero] = None
+    markup_repuestos: Optional[Dinero] = None
+    ganancia: Optional[Dinero] = None
+    aplica_iva: Optional[bool] = None
+    cliente_nombre: Optional[str] = None
+    cliente_id: Optional[str] = None
+    total_gastos: Optional[Dinero] = None
+    ganancia_total: Optional[Dinero] = None
+    ganancia_base_comisiones: Optional[Dinero] = None
+    mecanicos_ids: Optional[List[int]] = None
+    mecanicos_nombres: Optional[List[str]] = None
+    total_mecanicos: Optional[int] = None
+    # Expansiones con ?include=gastos,mecanicos
+    gastos: Optional[List[DetalleGastoListado]] = None
+    mecanicos: Optional[List[MecanicoAsignado]] = None
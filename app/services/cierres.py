@@ -0,0 +1,145 @@
+import re
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Any, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.cierres import CierrePeriodo, CierreComision, TipoCierre
+from app.models.comisiones_mecanicos import ComisionMecanico
+from app.models.mecanicos import Mecanico
+from app.models.trabajos import Trabajo
+from app.services.estado_resultados import (
+    EstadoResultadosService, Granularidad, Periodo, con_resultados, montos_de_cierre, periodo_natural,
+)
+
+PERIODO_REGEX = re.compile(r"^(\d{4})-(\d{2})(?:-Q([12]))?$")
+
+
+class CierreError(ValueError):
+    """Periodo inválido o que todavía no se puede cerrar"""
+
+
+class CierreExistenteError(CierreError):
+    """El periodo ya tiene cierre"""
+
+
+def parsear_periodo(periodo: str) -> Tuple[TipoCierre, Periodo]:
+    """'2025-03' (mes) o '2025-03-Q1' / '2025-03-Q2' (quincena)"""
+    coincidencia = PERIODO_REGEX.match(periodo)
+    if not coincidencia or not 1 <= int(coincidencia.group(2)) <= 12:
+        raise CierreError(f"Periodo inválido: {periodo}. Use YYYY-MM, YYYY-MM-Q1 o YYYY-MM-Q2")
+    anio, mes, quincena = int(coincidencia.group(1)), int(coincidencia.group(2)), coincidencia.group(3)
+    if quincena is None:
+        tipo, granularidad, dia = TipoCierre.MES, Granularidad.MES, 1
+    else:
+        tipo, granularidad, dia = TipoCierre.QUINCENA, Granularidad.QUINCENA, 1 if quincena == "1" else 16
+    inicio, fin, etiqueta = periodo_natural(date(anio, mes, dia), granularidad)
+    return tipo, Periodo(inicio, fin, etiqueta, True)
+
+
+def _float(valor) -> float:
+    return float(valor) if valor is not None else 0.0
+
+
+class CierreService:
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _comisiones(self, periodo: Periodo):
+        """Comisiones de los trabajos del periodo por mecánico y estado"""
+        return self.db.execute(
+            select(
+                ComisionMecanico.id_mecanico,
+                Mecanico.nombre,
+                ComisionMecanico.estado_comision,
+                func.count(ComisionMecanico.id).label("cantidad"),
+                func.sum(ComisionMecanico.monto_comision).label("total"),
+            )
+            .join(Trabajo, ComisionMecanico.id_trabajo == Trabajo.id)
+            .join(Mecanico, ComisionMecanico.id_mecanico == Mecanico.id)
+            .where(Trabajo.fecha >= periodo.inicio, Trabajo.fecha < periodo.fin)
+            .group_by(ComisionMecanico.id_mecanico, Mecanico.nombre, ComisionMecanico.estado_comision)
+            .order_by(Mecanico.nombre, ComisionMecanico.estado_comision)
+        ).all()
+
+    def cerrar(self, periodo: str, hoy: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Congela los montos y comisiones del periodo; a partir de aquí no admite escrituras.
+
+        La fila de cierres_periodo se inserta antes de calcular la foto, en la misma
+        transacción. Las escrituras revisan los cierres con un bloqueo compartido
+        (app.core.cierres): el INSERT espera a que terminen las que ya pasaron la
+        revisión, y las que llegan después esperan a este cierre y lo rechazan. Así
+        ninguna escritura queda entre la foto y el cierre. La foto se lee después
+        del INSERT, con las escrituras previas ya confirmadas.
+        """
+        tipo, rango = parsear_periodo(periodo)
+        hoy = hoy or date.today()
+        if rango.fin > hoy:
+            raise CierreError(f"El periodo {rango.etiqueta} todavía no termina")
+
+        cierre = CierrePeriodo(periodo=rango.etiqueta, tipo=tipo, inicio=rango.inicio, fin=rango.fin)
+        self.db.add(cierre)
+        try:
+            self.db.flush()
+        except IntegrityError:
+            # Ya cerrado, o lo cerró otro proceso al mismo tiempo
+            self.db.rollback()
+            raise CierreExistenteError(f"El periodo {rango.etiqueta} ya está cerrado")
+
+        montos = EstadoResultadosService(self.db).montos([rango])[0]
+        for campo, valor in montos.items():
+            setattr(cierre, campo, valor if campo == "cantidad_trabajos" else Decimal(str(valor)))
+        cierre.comisiones_mecanicos = [
+            CierreComision(id_mecanico=f.id_mecanico, nombre_mecanico=f.nombre, estado_comision=f.estado_comision,
+                           cantidad=f.cantidad, total=f.total or 0)
+            for f in self._comisiones(rango)
+        ]
+        self.db.commit()
+        return self.a_dict(cierre)
+
+    def listar(self) -> List[Dict[str, Any]]:
+        cierres = self.db.query(CierrePeriodo).order_by(CierrePeriodo.inicio, CierrePeriodo.tipo).all()
+        return [
+            {
+                "periodo": c.periodo,
+                "tipo": c.tipo.value,
+                "inicio": c.inicio.isoformat(),
+                "fin": (c.fin - timedelta(days=1)).isoformat(),
+                "fecha_cierre": c.fecha_cierre.isoformat(),
+            }
+            for c in cierres
+        ]
+
+    def obtener(self, periodo: str) -> Optional[CierrePeriodo]:
+        return (
+            self.db.query(CierrePeriodo)
+            .options(selectinload(CierrePeriodo.comisiones_mecanicos))
+            .filter(CierrePeriodo.periodo == periodo)
+            .first()
+        )
+
+    @staticmethod
+    def a_dict(cierre: CierrePeriodo) -> Dict[str, Any]:
+        return {
+            "periodo": cierre.periodo,
+            "tipo": cierre.tipo.value,
+            "inicio": cierre.inicio.isoformat(),
+            "fin": (cierre.fin - timedelta(days=1)).isoformat(),
+            "fecha_cierre": cierre.fecha_cierre.isoformat(),
+            **con_resultados(montos_de_cierre(cierre)),
+            "comisiones_mecanicos": [
+                {
+                    "id_mecanico": c.id_mecanico,
+                    "nombre_mecanico": c.nombre_mecanico,
+                    "estado_comision": c.estado_comision.value,
+                    "cantidad": c.cantidad,
+                    "total": _float(c.total),
+                }
+                for c in cierre.comisiones_mecanicos
+            ],
+        }
@@ -0,0 +1,184 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import case, func, select
+from typing import Dict, Any, Tuple
+from datetime import date, datetime
+from app.core.contadores import leer_totales
+from app.models.trabajos import Trabajo
+from app.models.detalle_gastos import DetalleGasto
+from app.models.mecanicos import Mecanico
+from app.models.comisiones_mecanicos import ComisionMecanico, EstadoComision
+from app.models.gastos_taller import GastoTaller, EstadoGasto
+from app.models.pagos_salarios import PagoSalario
+
+IVA = 0.13
+
+
+def rango_mes(anio: int, mes: int) -> Tuple[datetime, datetime]:
+    """Inicio del mes y del mes siguiente (rango semiabierto, aprovecha los índices de fecha)"""
+    inicio = datetime(anio, mes, 1)
+    fin = datetime(anio + 1, 1, 1) if mes == 12 else datetime(anio, mes + 1, 1)
+    return inicio, fin
+
+
+def _float(valor) -> float:
+    return float(valor) if valor is not None else 0.0
+
+
+class DashboardService:
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def resumen(self, anio: int, mes: int) -> Dict[str, Any]:
+        """
+        Todos los indicadores del dashboard para un mes, con una consulta agrupada
+        por bloque y todas en la misma sesión (una sola foto consistente de los datos)
+        """
+        inicio, fin = rango_mes(anio, mes)
+        totales = self._totales()
+        trabajos = self._trabajos_mes(inicio, fin)
+        gastos_taller = self._gastos_taller_mes(inicio, fin)
+        salarios = self._salarios_mes(inicio.date(), fin.date())
+        comisiones, mecanicos = self._comisiones_mes(f"{anio:04d}-{mes:02d}")
+
+        gastos_totales = gastos_taller["total_monto"] + salarios["total_salarios"] + comisiones["total_aprobadas"]
+        return {
+            "mes": f"{anio:04d}-{mes:02d}",
+            "totales": totales,
+            "trabajos": trabajos,
+            "gastos_taller": gastos_taller,
+            "salarios": salarios,
+            "comisiones": comisiones,
+            "mecanicos": mecanicos,
+            "finanzas": {
+                "ingresos_totales": trabajos["ingresos_totales"],
+                # Taller pagado + salarios + comisiones aprobadas, igual que el reporte del dashboard
+                "gastos_totales": round(gastos_totales, 2),
+                "ganancia_neta": round(trabajos["mano_obra"] + trabajos["markup_repuestos"], 2),
+            },
+        }
+
+    def _totales(self) -> Dict[str, int]:
+        totales = leer_totales(self.db)
+        return {
+            "total_clientes": totales["clientes"],
+            "total_carros": totales["carros"],
+            "total_trabajos": totales["trabajos"],
+        }
+
+    def _trabajos_mes(self, inicio: datetime, fin: datetime) -> Dict[str, Any]:
+        en_mes = (Trabajo.fecha >= inicio) & (Trabajo.fecha < fin)
+        repuestos = (
+            select(func.sum(DetalleGasto.monto))
+            .join(Trabajo, DetalleGasto.id_trabajo == Trabajo.id)
+            .where(en_mes)
+            .scalar_subquery()
+        )
+        fila = self.db.execute(
+            select(
+                func.count(Trabajo.id).label("cantidad"),
+                func.sum(Trabajo.costo).label("ingresos"),
+                func.sum(Trabajo.mano_obra).label("mano_obra"),
+                func.sum(Trabajo.markup_repuestos).label("markup"),
+                func.sum(case((Trabajo.aplica_iva, Trabajo.costo), else_=0)).label("gravado"),
+                repuestos.label("repuestos"),
+            ).where(en_mes)
+        ).one()
+        return {
+            "cantidad_trabajos": fila.cantidad,
+            "ingresos_totales": _float(fila.ingresos),
+            "mano_obra": _float(fila.mano_obra),
+            "markup_repuestos": _float(fila.markup),
+            "gastos_repuestos": _float(fila.repuestos),
+            "iva_calculado": round(_float(fila.gravado) * IVA, 2),
+        }
+
+    def _gastos_taller_mes(self, inicio: datetime, fin: datetime) -> Dict[str, Any]:
+        filas = self.db.execute(
+            select(
+                GastoTaller.categoria,
+                func.count(GastoTaller.id).label("cantidad"),
+                func.sum(GastoTaller.monto).label("total"),
+            )
+            .where(GastoTaller.fecha_gasto >= inicio, GastoTaller.fecha_gasto < fin,
+                   GastoTaller.estado == EstadoGasto.PAGADO)
+            .group_by(GastoTaller.categoria)
+            .order_by(GastoTaller.categoria)
+        ).all()
+        return {
+            "total_gastos": sum(f.cantidad for f in filas),
+            "total_monto": round(sum(_float(f.total) for f in filas), 2),
+            "gastos_por_categoria": [
+                {"categoria": f.categoria, "cantidad": f.cantidad, "total": _float(f.total)} for f in filas
+            ],
+        }
+
+    def _salarios_mes(self, inicio: date, fin: date) -> Dict[str, Any]:
+        filas = self.db.execute(
+            select(
+                PagoSalario.id_mecanico,
+                Mecanico.nombre,
+                func.count(PagoSalario.id).label("cantidad"),
+                func.sum(PagoSalario.monto_salario).label("total"),
+            )
+            .join(Mecanico, PagoSalario.id_mecanico == Mecanico.id)
+            .where(PagoSalario.fecha_pago >= inicio, PagoSalario.fecha_pago < fin)
+            .group_by(PagoSalario.id_mecanico, Mecanico.nombre)
+            .order_by(Mecanico.nombre)
+        ).all()
+        return {
+            "total_pagos": sum(f.cantidad for f in filas),
+            "total_salarios": round(sum(_float(f.total) for f in filas), 2),
+            "pagos_por_mecanico": [
+                {"id_mecanico": f.id_mecanico, "nombre_mecanico": f.nombre, "cantidad": f.cantidad, "total": _float(f.total)}
+                for f in filas
+            ],
+        }
+
+    def _comisiones_mes(self, mes_reporte: str):
+        """Comisiones del mes por quincena y estado, y por mecánico (una sola consulta agrupada)"""
+        filas = self.db.execute(
+            select(
+                Mecanico.id,
+                Mecanico.nombre,
+                ComisionMecanico.quincena,
+                ComisionMecanico.estado_comision,
+                func.count(ComisionMecanico.id).label("cantidad"),
+                func.sum(ComisionMecanico.monto_comision).label("total"),
+            )
+            .outerjoin(ComisionMecanico, (ComisionMecanico.id_mecanico == Mecanico.id)
+                       & (ComisionMecanico.mes_reporte == mes_reporte))
+            .where(Mecanico.activo.is_(True))
+            .group_by(Mecanico.id, Mecanico.nombre, ComisionMecanico.quincena, ComisionMecanico.estado_comision)
+            .order_by(Mecanico.nombre)
+        ).all()
+
+        quincenas: Dict[str, Dict[str, Any]] = {}
+        mecanicos: Dict[int, Dict[str, Any]] = {}
+        totales = {estado: 0.0 for estado in EstadoComision}
+        for f in filas:
+            mecanico = mecanicos.setdefault(f.id, {
+                "id": f.id, "nombre": f.nombre, "total_trabajos": 0, "total_comisiones": 0.0, "comisiones_aprobadas": 0.0,
+            })
+            if f.estado_comision is None:
+                continue
+            total = _float(f.total)
+            # Una comisión por trabajo asignado
+            mecanico["total_trabajos"] += f.cantidad
+            mecanico["total_comisiones"] += total
+            if f.estado_comision == EstadoComision.APROBADA:
+                mecanico["comisiones_aprobadas"] += total
+            totales[f.estado_comision] += total
+
+            quincena = quincenas.setdefault(f.quincena or "SIN_QUINCENA", {"quincena": f.quincena, "por_estado": {}})
+            por_estado = quincena["por_estado"].setdefault(f.estado_comision.value, {"cantidad": 0, "total": 0.0})
+            por_estado["cantidad"] += f.cantidad
+            por_estado["total"] += total
+
+        comisiones = {
+            "total_aprobadas": round(totales[EstadoComision.APROBADA], 2),
+            "total_pendientes": round(totales[EstadoComision.PENDIENTE], 2),
+            "total_penalizadas": round(totales[EstadoComision.PENALIZADA], 2),
+            "quincenas": list(quincenas.values()),
+        }
+        return comisiones, list(mecanicos.values())
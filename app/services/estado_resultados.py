@@ -0,0 +1,314 @@
+"""
+Estado de resultados (P&L) del taller para cualquier rango de fechas y granularidad.
+
+Todas las fuentes de ingresos y costos se calculan en SQL, en una sola
+consulta con CTEs:
+- periodos: los intervalos [inicio, fin) de la granularidad pedida;
+- trabajos: ingresos, mano de obra, markup de repuestos e IVA por fecha del trabajo;
+- repuestos: costo real de los detalles_gastos de esos trabajos;
+- comisiones: comisiones APROBADAS de los trabajos del periodo;
+- gastos_taller: gastos PAGADOS por fecha del gasto;
+- salarios: pagos_salarios por fecha de pago.
+
+Los meses y quincenas con cierre (cierres_periodo) se leen de su foto congelada.
+Los periodos consolidados (completos y terminados hace más de
+RESULTADOS_DIAS_CIERRE días) se guardan en una LRU en memoria junto con la
+versión de las tablas que lee la consulta (app.core.cache): mientras nadie
+escriba en ellas, la siguiente consulta solo calcula los periodos recientes.
+Una escritura con fecha vieja (un trabajo editado, una comisión aprobada
+tarde) invalida los periodos guardados.
+"""
+import enum
+from datetime import date, timedelta
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, case, cast, func, literal, select, union_all
+from sqlalchemy.orm import Session
+from sqlalchemy.types import Date, Integer
+
+from app.core import config
+from app.core.cache import CacheRespuestas, versiones
+from app.core.cierres import Rango, rangos_cerrados
+from app.models.cierres import CierrePeriodo
+from app.models.trabajos import Trabajo
+from app.models.detalle_gastos import DetalleGasto
+from app.models.comisiones_mecanicos import ComisionMecanico, EstadoComision
+from app.models.gastos_taller import GastoTaller, EstadoGasto
+from app.models.pagos_salarios import PagoSalario
+
+IVA = 0.13
+# Tablas que lee la consulta del estado de resultados
+TABLAS = ("trabajos", "detalles_gastos", "comisiones_mecanicos", "gastos_taller", "pagos_salarios")
+# Máximo de periodos por consulta: algo más de un año por día (SQLite admite hasta 500 SELECT en un UNION)
+MAX_PERIODOS = 400
+
+CAMPOS = (
+    "ingresos", "iva", "mano_obra", "markup_repuestos", "costo_repuestos",
+    "comisiones", "gastos_taller", "salarios", "cantidad_trabajos",
+)
+
+
+class Granularidad(str, enum.Enum):
+    DIA = "dia"
+    SEMANA = "semana"
+    QUINCENA = "quincena"
+    MES = "mes"
+
+
+class Periodo(NamedTuple):
+    inicio: date
+    fin: date  # exclusivo
+    etiqueta: str
+    completo: bool  # False si el rango pedido lo recorta
+
+
+def _primer_dia_mes_siguiente(dia: date) -> date:
+    return date(dia.year + 1, 1, 1) if dia.month == 12 else date(dia.year, dia.month + 1, 1)
+
+
+def periodo_natural(dia: date, granularidad: Granularidad) -> Tuple[date, date, str]:
+    """Periodo completo de la granularidad que contiene al día"""
+    if granularidad == Granularidad.DIA:
+        return dia, dia + timedelta(days=1), dia.isoformat()
+    if granularidad == Granularidad.SEMANA:
+        # Semanas ISO, de lunes a domingo
+        inicio = dia - timedelta(days=dia.weekday())
+        anio, semana, _ = inicio.isocalendar()
+        return inicio, inicio + timedelta(days=7), f"{anio}-W{semana:02d}"
+    if granularidad == Granularidad.QUINCENA:
+        # Misma regla que las comisiones: Q1 días 1-15, Q2 días 16 al fin de mes
+        if dia.day <= 15:
+            return date(dia.year, dia.month, 1), date(dia.year, dia.month, 16), f"{dia:%Y-%m}-Q1"
+        return date(dia.year, dia.month, 16), _primer_dia_mes_siguiente(dia), f"{dia:%Y-%m}-Q2"
+    inicio = date(dia.year, dia.month, 1)
+    return inicio, _primer_dia_mes_siguiente(dia), f"{dia:%Y-%m}"
+
+
+def generar_periodos(desde: date, hasta: date, granularidad: Granularidad, maximo: int = MAX_PERIODOS) -> List[Periodo]:
+    """Periodos que cubren [desde, hasta] (ambos inclusive); los extremos se recortan al rango"""
+    periodos = []
+    fin_rango = hasta + timedelta(days=1)
+    dia = desde
+    while dia < fin_rango:
+        inicio, fin, etiqueta = periodo_natural(dia, granularidad)
+        recortado = Periodo(max(inicio, desde), min(fin, fin_rango), etiqueta, inicio >= desde and fin <= fin_rango)
+        periodos.append(recortado)
+        if len(periodos) > maximo:
+            raise ValueError(f"El rango genera más de {maximo} periodos; use una granularidad mayor")
+        dia = fin
+    return periodos
+
+
+def _consulta(periodos: List[Periodo], dialecto: str = "mysql"):
+    """Una sola sentencia con un CTE por fuente; devuelve una fila por periodo (columna indice)"""
+    def fecha(valor: date):
+        # En MySQL el parámetro llega como texto: se convierte para comparar como fecha.
+        # SQLite guarda las fechas como texto ISO, que ya se compara bien.
+        return cast(literal(valor, Date), Date) if dialecto == "mysql" else literal(valor, Date)
+
+    # Los periodos se envían como literales (UNION ALL de SELECT), válido en MySQL y SQLite
+    tabla_periodos = union_all(*[
+        select(
+            literal(i, Integer).label("indice"),
+            fecha(p.inicio).label("inicio"),
+            fecha(p.fin).label("fin"),
+        )
+        for i, p in enumerate(periodos)
+    ]).cte("periodos")
+
+    def en_periodo(columna):
+        return and_(columna >= tabla_periodos.c.inicio, columna < tabla_periodos.c.fin)
+
+    trabajos = (
+        select(
+            tabla_periodos.c.indice,
+            func.count(Trabajo.id).label("cantidad_trabajos"),
+            func.sum(Trabajo.costo).label("ingresos"),
+            func.sum(case((Trabajo.aplica_iva, Trabajo.costo), else_=0)).label("gravado"),
+            func.sum(Trabajo.mano_obra).label("mano_obra"),
+            func.sum(Trabajo.markup_repuestos).label("markup_repuestos"),
+        )
+        .select_from(tabla_periodos)
+        .join(Trabajo, en_periodo(Trabajo.fecha))
+        .group_by(tabla_periodos.c.indice)
+        .cte("trabajos_periodo")
+    )
+    repuestos = (
+        select(tabla_periodos.c.indice, func.sum(DetalleGasto.monto).label("costo_repuestos"))
+        .select_from(tabla_periodos)
+        .join(Trabajo, en_periodo(Trabajo.fecha))
+        .join(DetalleGasto, DetalleGasto.id_trabajo == Trabajo.id)
+        .group_by(tabla_periodos.c.indice)
+        .cte("repuestos_periodo")
+    )
+    comisiones = (
+        select(tabla_periodos.c.indice, func.sum(ComisionMecanico.monto_comision).label("comisiones"))
+        .select_from(tabla_periodos)
+        .join(Trabajo, en_periodo(Trabajo.fecha))
+        .join(ComisionMecanico, ComisionMecanico.id_trabajo == Trabajo.id)
+        .where(ComisionMecanico.estado_comision == EstadoComision.APROBADA)
+        .group_by(tabla_periodos.c.indice)
+        .cte("comisiones_periodo")
+    )
+    gastos = (
+        select(tabla_periodos.c.indice, func.sum(GastoTaller.monto).label("gastos_taller"))
+        .select_from(tabla_periodos)
+        .join(GastoTaller, en_periodo(GastoTaller.fecha_gasto))
+        .where(GastoTaller.estado == EstadoGasto.PAGADO)
+        .group_by(tabla_periodos.c.indice)
+        .cte("gastos_periodo")
+    )
+    salarios = (
+        select(tabla_periodos.c.indice, func.sum(PagoSalario.monto_salario).label("salarios"))
+        .select_from(tabla_periodos)
+        .join(PagoSalario, en_periodo(PagoSalario.fecha_pago))
+        .group_by(tabla_periodos.c.indice)
+        .cte("salarios_periodo")
+    )
+
+    uniones = tabla_periodos
+    for fuente in (trabajos, repuestos, comisiones, gastos, salarios):
+        uniones = uniones.outerjoin(fuente, fuente.c.indice == tabla_periodos.c.indice)
+    return (
+        select(
+            tabla_periodos.c.indice,
+            trabajos.c.cantidad_trabajos, trabajos.c.ingresos, trabajos.c.gravado,
+            trabajos.c.mano_obra, trabajos.c.markup_repuestos,
+            repuestos.c.costo_repuestos, comisiones.c.comisiones,
+            gastos.c.gastos_taller, salarios.c.salarios,
+        )
+        .select_from(uniones)
+        .order_by(tabla_periodos.c.indice)
+    )
+
+
+def _float(valor) -> float:
+    return round(float(valor), 2) if valor is not None else 0.0
+
+
+def con_resultados(valores: Dict[str, Any]) -> Dict[str, Any]:
+    """Agrega utilidad bruta, gastos operativos y utilidad neta a los montos de un periodo"""
+    utilidad_bruta = valores["mano_obra"] + valores["markup_repuestos"]
+    gastos_operativos = valores["comisiones"] + valores["gastos_taller"] + valores["salarios"]
+    return {
+        **valores,
+        "utilidad_bruta": round(utilidad_bruta, 2),
+        "gastos_operativos": round(gastos_operativos, 2),
+        "utilidad_neta": round(utilidad_bruta - gastos_operativos, 2),
+    }
+
+
+# Montos de los periodos consolidados por (inicio, fin), válidos mientras no cambien las TABLAS
+periodos_consolidados = CacheRespuestas(config.RESULTADOS_CACHE_MAX_PERIODOS)
+
+
+def esta_consolidado(periodo: Periodo, hoy: Optional[date] = None) -> bool:
+    """Periodo completo que terminó hace más de RESULTADOS_DIAS_CIERRE días (no es un cierre formal)"""
+    hoy = hoy or date.today()
+    return periodo.completo and periodo.fin <= hoy - timedelta(days=config.RESULTADOS_DIAS_CIERRE)
+
+
+def esta_cerrado(periodo: Periodo, rangos: List[Rango]) -> bool:
+    """Periodo cubierto por completo por cierres de cierres_periodo"""
+    dia = periodo.inicio
+    for _, inicio, fin in sorted(rangos, key=lambda r: r[1]):
+        if inicio <= dia < fin:
+            dia = fin
+        if dia >= periodo.fin:
+            return True
+    return False
+
+
+def montos_de_cierre(cierre: CierrePeriodo) -> Dict[str, Any]:
+    """Montos congelados de un periodo cerrado, en el mismo formato que los calculados"""
+    return {campo: getattr(cierre, campo) if campo == "cantidad_trabajos" else _float(getattr(cierre, campo))
+            for campo in CAMPOS}
+
+
+class EstadoResultadosService:
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def montos(self, periodos: List[Periodo]) -> List[Dict[str, Any]]:
+        """Montos de cada periodo, calculados en la base con una sola consulta"""
+        filas = self.db.execute(_consulta(periodos, self.db.get_bind().dialect.name)).all()
+        return [
+            {
+                "ingresos": _float(fila.ingresos),
+                "iva": round(_float(fila.gravado) * IVA, 2),
+                "mano_obra": _float(fila.mano_obra),
+                "markup_repuestos": _float(fila.markup_repuestos),
+                "costo_repuestos": _float(fila.costo_repuestos),
+                "comisiones": _float(fila.comisiones),
+                "gastos_taller": _float(fila.gastos_taller),
+                "salarios": _float(fila.salarios),
+                "cantidad_trabajos": fila.cantidad_trabajos or 0,
+            }
+            for fila in filas
+        ]
+
+    def _congelados(self, periodos: List[Periodo], granularidad: Granularidad,
+                    rangos: List[Rango]) -> Dict[int, Dict[str, Any]]:
+        """Montos de los periodos con cierre (meses y quincenas), por índice del periodo"""
+        if granularidad not in (Granularidad.MES, Granularidad.QUINCENA):
+            return {}
+        cerrados = {periodo for periodo, _, _ in rangos}
+        indices = {p.etiqueta: i for i, p in enumerate(periodos) if p.completo and p.etiqueta in cerrados}
+        if not indices:
+            return {}
+        cierres = self.db.query(CierrePeriodo).filter(CierrePeriodo.periodo.in_(indices)).all()
+        return {indices[c.periodo]: montos_de_cierre(c) for c in cierres}
+
+    def calcular(self, desde: date, hasta: date, granularidad: Granularidad,
+                 hoy: Optional[date] = None) -> Dict[str, Any]:
+        """Estado de resultados por periodo; `hoy` (por defecto la fecha actual) decide qué periodos están consolidados"""
+        hoy = hoy or date.today()
+        periodos = generar_periodos(desde, hasta, granularidad)
+        rangos = rangos_cerrados(self.db)
+        montos = self._congelados(periodos, granularidad, rangos)
+        congelados = set(montos)
+        # Versión leída antes de consultar: una escritura concurrente deja la entrada vencida, no al revés
+        vigentes = versiones.obtener(TABLAS)
+        pendientes = []
+        for i, periodo in enumerate(periodos):
+            if i in montos:
+                continue
+            encontrado, guardado = (
+                periodos_consolidados.obtener((periodo.inicio, periodo.fin), vigentes)
+                if esta_consolidado(periodo, hoy) else (False, None)
+            )
+            if encontrado:
+                montos[i] = guardado
+            else:
+                pendientes.append(i)
+
+        if pendientes:
+            for i, valores in zip(pendientes, self.montos([periodos[i] for i in pendientes])):
+                montos[i] = valores
+                if esta_consolidado(periodos[i], hoy):
+                    periodos_consolidados.guardar((periodos[i].inicio, periodos[i].fin), vigentes, valores)
+
+        totales = {campo: 0 for campo in CAMPOS}
+        resultado = []
+        for i, periodo in enumerate(periodos):
+            valores = montos[i]
+            for campo in CAMPOS:
+                totales[campo] += valores[campo]
+            resultado.append({
+                "periodo": periodo.etiqueta,
+                "inicio": periodo.inicio.isoformat(),
+                "fin": (periodo.fin - timedelta(days=1)).isoformat(),
+                "cerrado": i in congelados or esta_cerrado(periodo, rangos),
+                "congelado": i in congelados,
+                "consolidado": esta_consolidado(periodo, hoy),
+                **con_resultados(valores),
+            })
+
+        return {
+            "desde": desde.isoformat(),
+            "hasta": hasta.isoformat(),
+            "granularidad": granularidad.value,
+            "periodos": resultado,
+            "totales": con_resultados({c: round(v, 2) if isinstance(v, float) else v for c, v in totales.items()}),
+        }
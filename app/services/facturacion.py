@@ -40,3 +40,15 @@ def generar_html_factura(datos_factura: dict) -> str:
 
     template = Template(plantilla_html)
     return template.render(**datos_factura)
+
+
+def renderizar_pdf(html: str) -> bytes:
+    """
+    Convierte el HTML de la factura a PDF.
+
+    weasyprint se importa en la primera factura y no al cargar la app: trae
+    consigo cairo, pango y fonttools, y las facturas son poco frecuentes.
+    """
+    from weasyprint import HTML
+
+    return HTML(string=html).write_pdf()
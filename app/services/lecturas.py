@@ -0,0 +1,402 @@
+"""
+Modelo de lectura de los listados: sentencias select() de columnas que se leen
+con .mappings(), sin crear entidades del ORM.
+
+Con db.query(Modelo).all() cada fila se convierte en una entidad (estado,
+historial de atributos, registro en el identity map de la sesión) que después
+se copia a un dict; en los listados grandes esa hidratación domina el tiempo y
+la memoria de la petición. Aquí la sesión solo ejecuta la sentencia y cada fila
+se convierte directamente al dict de la respuesta. Los datos relacionados se
+leen con JOIN o con una consulta agrupada por listado, nunca una por fila.
+
+Las respuestas conservan exactamente el formato de los endpoints. Los montos se
+devuelven como Decimal: los modelos de respuesta (Dinero) los escriben según
+JSON_DECIMALES. Con `ids` los listados de las tablas sincronizadas devuelven solo
+esas filas: GET /api/sync envía las filas cambiadas con el mismo formato.
+tests/benchmarks/test_modelo_lectura.py compara el costo con el camino del ORM.
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.carros import Carro
+from app.models.clientes import Cliente
+from app.models.comisiones_mecanicos import ComisionMecanico
+from app.models.detalle_gastos import DetalleGasto
+from app.models.gastos_taller import GastoTaller
+from app.models.mecanicos import Mecanico
+from app.models.pagos_salarios import PagoSalario
+from app.models.trabajos import Trabajo
+
+
+_CERO = Decimal("0.00")
+
+
+def _monto(valor) -> Decimal:
+    return valor if valor is not None else _CERO
+
+
+def _nombre_completo(nombre, apellido) -> str:
+    return f"{nombre} {apellido}".strip()
+
+
+def _filtrar(consulta, columna, ids: Optional[Iterable[int]]):
+    """Restringe la consulta a las llaves `ids` (sin `ids`, la deja igual)"""
+    return consulta if ids is None else consulta.where(columna.in_(list(ids)))
+
+
+def detalles_gastos(db: Session, ids: Optional[Iterable[int]] = None,
+                    id_trabajos: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+    """Repuestos por su id (`ids`) o por el trabajo al que pertenecen (`id_trabajos`)"""
+    consulta = select(DetalleGasto.id, DetalleGasto.id_trabajo, DetalleGasto.descripcion,
+                      DetalleGasto.monto, DetalleGasto.monto_cobrado)
+    consulta = _filtrar(_filtrar(consulta, DetalleGasto.id, ids), DetalleGasto.id_trabajo, id_trabajos)
+    filas = db.execute(consulta.order_by(DetalleGasto.id)).mappings()
+    return [
+        {
+            "id": f["id"],
+            "id_trabajo": f["id_trabajo"],
+            "descripcion": f["descripcion"],
+            "monto": f["monto"],
+            "monto_cobrado": f["monto_cobrado"] if f["monto_cobrado"] else None,
+        }
+        for f in filas
+    ]
+
+
+def carros(db: Session, ids: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+    consulta = (
+        select(Carro.id, Carro.matricula, Carro.marca, Carro.modelo, Carro.anio,
+               Cliente.id_nacional, Cliente.nombre, Cliente.apellido)
+        .outerjoin(Cliente, Cliente.id == Carro.id_cliente)
+    )
+    filas = db.execute(_filtrar(consulta, Carro.id, ids).order_by(Carro.matricula)).mappings()
+    return [
+        {
+            "id": f["id"],
+            "matricula": f["matricula"],
+            "marca": f["marca"],
+            "modelo": f["modelo"],
+            "anio": f["anio"],
+            "id_cliente_actual": f["id_nacional"],
+            "nombre_cliente": _nombre_completo(f["nombre"], f["apellido"]) if f["id_nacional"] else "Sin propietario",
+        }
+        for f in filas
+    ]
+
+
+def clientes(db: Session, ids: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+    """Clientes con la cantidad de carros y el total cobrado en los trabajos de sus carros"""
+    ids = None if ids is None else list(ids)
+    # Con `ids` los totales se agrupan solo para esos clientes
+    vehiculos = (
+        _filtrar(select(Carro.id_cliente, func.count().label("cantidad")), Carro.id_cliente, ids)
+        .group_by(Carro.id_cliente)
+        .subquery()
+    )
+    mano_obra = (
+        _filtrar(select(Carro.id_cliente, func.sum(Trabajo.mano_obra).label("total")), Carro.id_cliente, ids)
+        .join(Trabajo, Trabajo.id_carro == Carro.id)
+        .group_by(Carro.id_cliente)
+        .subquery()
+    )
+    # Cada repuesto al precio cobrado, o al costo si no tiene precio cobrado
+    repuestos = (
+        _filtrar(select(
+            Carro.id_cliente,
+            func.sum(func.coalesce(func.nullif(DetalleGasto.monto_cobrado, 0), DetalleGasto.monto, 0)).label("total"),
+        ), Carro.id_cliente, ids)
+        .select_from(DetalleGasto)
+        .join(Trabajo, DetalleGasto.id_trabajo == Trabajo.id)
+        .join(Carro, Trabajo.id_carro == Carro.id)
+        .group_by(Carro.id_cliente)
+        .subquery()
+    )
+    consulta = (
+        select(Cliente.id, Cliente.id_nacional, Cliente.nombre, Cliente.apellido, Cliente.correo, Cliente.telefono,
+               vehiculos.c.cantidad, mano_obra.c.total.label("mano_obra"), repuestos.c.total.label("repuestos"))
+        .outerjoin(vehiculos, vehiculos.c.id_cliente == Cliente.id)
+        .outerjoin(mano_obra, mano_obra.c.id_cliente == Cliente.id)
+        .outerjoin(repuestos, repuestos.c.id_cliente == Cliente.id)
+    )
+    filas = db.execute(_filtrar(consulta, Cliente.id, ids).order_by(Cliente.id_nacional)).mappings()
+    registro = datetime.utcnow()
+    return [
+        {
+            "id": f["id"],
+            "id_nacional": f["id_nacional"],
+            "nombre": f["nombre"],
+            "apellido": f["apellido"],
+            "correo": f["correo"],
+            "telefono": f["telefono"],
+            "total_gastado": _monto(f["mano_obra"]) + _monto(f["repuestos"]),
+            "vehicle_count": f["cantidad"] or 0,
+            "registration_date": registro,
+        }
+        for f in filas
+    ]
+
+
+# Campos del listado de trabajos, en el orden de la respuesta
+CAMPOS_TRABAJOS = (
+    "id", "matricula_carro", "descripcion", "fecha", "fecha_registro", "costo", "mano_obra", "markup_repuestos",
+    "ganancia", "aplica_iva", "cliente_nombre", "cliente_id", "total_gastos", "ganancia_total",
+    "ganancia_base_comisiones", "mecanicos_ids", "mecanicos_nombres", "total_mecanicos",
+)
+# Expansiones opcionales del listado de trabajos (?include=)
+INCLUIBLES_TRABAJOS = ("gastos", "mecanicos")
+
+def _gastos_por_trabajo(ids: Optional[List[int]] = None):
+    """Total de repuestos de cada trabajo (de los trabajos `ids`, si se indican)"""
+    return (
+        _filtrar(select(DetalleGasto.id_trabajo, func.sum(DetalleGasto.monto).label("total")), DetalleGasto.id_trabajo, ids)
+        .group_by(DetalleGasto.id_trabajo)
+        .subquery("gastos")
+    )
+
+
+_GASTOS_POR_TRABAJO = _gastos_por_trabajo()
+
+# Columnas que puede leer la consulta principal de trabajos
+_COLUMNAS_TRABAJOS = {
+    "id": Trabajo.id,
+    "matricula_carro": Carro.matricula.label("matricula_carro"),
+    "descripcion": Trabajo.descripcion,
+    "fecha": Trabajo.fecha,
+    "fecha_registro": Trabajo.fecha_registro,
+    "costo": Trabajo.costo,
+    "mano_obra": Trabajo.mano_obra,
+    "markup_repuestos": Trabajo.markup_repuestos,
+    "ganancia": Trabajo.ganancia,
+    "aplica_iva": Trabajo.aplica_iva,
+    "id_nacional": Cliente.id_nacional,
+    "nombre": Cliente.nombre,
+    "apellido": Cliente.apellido,
+    "total_gastos": _GASTOS_POR_TRABAJO.c.total.label("total_gastos"),
+}
+_COLUMNAS_CARRO = {"matricula_carro"}
+_COLUMNAS_CLIENTE = {"id_nacional", "nombre", "apellido"}
+
+# Columnas que necesita cada campo (por defecto, la columna del mismo nombre)
+_DEPENDENCIAS_TRABAJOS = {
+    "fecha_registro": ("fecha", "fecha_registro"),
+    "cliente_nombre": ("id_nacional", "nombre", "apellido"),
+    "cliente_id": ("id_nacional",),
+    "ganancia_total": ("costo", "total_gastos"),
+    "ganancia_base_comisiones": ("mano_obra", "total_gastos"),
+    "mecanicos_ids": (),
+    "mecanicos_nombres": (),
+    "total_mecanicos": (),
+}
+
+_SIN_MECANICOS = {"ids": (), "nombres": (), "mecanicos": ()}
+
+# Valor de cada campo a partir de la fila y de los mecánicos asignados al trabajo
+_VALORES_TRABAJOS = {
+    "id": lambda f, m: f["id"],
+    "matricula_carro": lambda f, m: f["matricula_carro"],
+    "descripcion": lambda f, m: f["descripcion"],
+    "fecha": lambda f, m: f["fecha"].date(),
+    "fecha_registro": lambda f, m: (f["fecha_registro"] or f["fecha"]).date(),
+    "costo": lambda f, m: _monto(f["costo"]),
+    "mano_obra": lambda f, m: _monto(f["mano_obra"]),
+    "markup_repuestos": lambda f, m: _monto(f["markup_repuestos"]),
+    "ganancia": lambda f, m: _monto(f["ganancia"]),
+    "aplica_iva": lambda f, m: f["aplica_iva"],
+    "cliente_nombre": lambda f, m: _nombre_completo(f["nombre"], f["apellido"]) if f["id_nacional"] else "Sin cliente",
+    "cliente_id": lambda f, m: f["id_nacional"],
+    "total_gastos": lambda f, m: _monto(f["total_gastos"]),
+    "ganancia_total": lambda f, m: _monto(f["costo"]) - _monto(f["total_gastos"]),
+    "ganancia_base_comisiones": lambda f, m: _monto(f["mano_obra"]) - _monto(f["total_gastos"]),
+    "mecanicos_ids": lambda f, m: m["ids"],
+    "mecanicos_nombres": lambda f, m: m["nombres"],
+    "total_mecanicos": lambda f, m: len(m["ids"]),
+}
+
+
+def _mecanicos_por_trabajo(db: Session, con_nombres: bool,
+                           ids: Optional[List[int]] = None) -> Dict[int, Dict[str, list]]:
+    """Mecánicos asignados (por sus comisiones) a cada trabajo, en una sola consulta"""
+    consulta = _filtrar(
+        select(ComisionMecanico.id_trabajo, ComisionMecanico.id_mecanico), ComisionMecanico.id_trabajo, ids
+    ).order_by(ComisionMecanico.id)
+    if con_nombres:
+        consulta = consulta.add_columns(Mecanico.nombre).outerjoin(Mecanico, Mecanico.id == ComisionMecanico.id_mecanico)
+
+    mecanicos: Dict[int, Dict[str, list]] = {}
+    for f in db.execute(consulta):
+        asignados = mecanicos.setdefault(f.id_trabajo, {"ids": [], "nombres": [], "mecanicos": []})
+        asignados["ids"].append(f.id_mecanico)
+        nombre = f.nombre if con_nombres else None
+        if nombre is not None:
+            asignados["nombres"].append(nombre)
+        asignados["mecanicos"].append({"id": f.id_mecanico, "nombre": nombre})
+    return mecanicos
+
+
+def trabajos(db: Session, campos: Iterable[str] = CAMPOS_TRABAJOS,
+             incluir: Iterable[str] = (), ids: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+    """
+    Trabajos con cliente, total de repuestos y mecánicos asignados.
+
+    Solo se leen las columnas y se hacen los JOIN que necesitan los `campos`
+    pedidos: sin matricula_carro ni cliente_* no se une carros, sin cliente_* no
+    se une clientes, sin los totales de gastos no se agrupan los repuestos y sin
+    mecanicos_* no se consultan las comisiones.
+    `incluir` agrega "gastos" (repuestos de cada trabajo) y "mecanicos" (id y
+    nombre), una consulta más por cada uno. Con `ids` solo se leen esos trabajos.
+    """
+    pedidos = set(campos)
+    campos = [c for c in CAMPOS_TRABAJOS if c in pedidos]
+    incluir = set(incluir)
+    ids = None if ids is None else list(ids)
+    gastos_por_trabajo = _GASTOS_POR_TRABAJO if ids is None else _gastos_por_trabajo(ids)
+
+    necesarias = {"id"}
+    for campo in campos:
+        necesarias.update(_DEPENDENCIAS_TRABAJOS.get(campo, (campo,)))
+    columnas = dict(_COLUMNAS_TRABAJOS, total_gastos=gastos_por_trabajo.c.total.label("total_gastos"))
+    consulta = select(*(columna for nombre, columna in columnas.items() if nombre in necesarias))
+    if necesarias & (_COLUMNAS_CARRO | _COLUMNAS_CLIENTE):
+        consulta = consulta.outerjoin(Carro, Carro.id == Trabajo.id_carro)
+    if necesarias & _COLUMNAS_CLIENTE:
+        consulta = consulta.outerjoin(Cliente, Cliente.id == Carro.id_cliente)
+    if "total_gastos" in necesarias:
+        consulta = consulta.outerjoin(gastos_por_trabajo, gastos_por_trabajo.c.id_trabajo == Trabajo.id)
+    filas = db.execute(_filtrar(consulta, Trabajo.id, ids).order_by(Trabajo.id)).mappings().all()
+
+    mecanicos: Dict[int, Dict[str, list]] = {}
+    if "mecanicos" in incluir or any(c.startswith("mecanicos_") or c == "total_mecanicos" for c in campos):
+        mecanicos = _mecanicos_por_trabajo(db, con_nombres="mecanicos" in incluir or "mecanicos_nombres" in campos,
+                                           ids=ids)
+    gastos: Dict[int, List[Dict[str, Any]]] = {}
+    if "gastos" in incluir:
+        for detalle in detalles_gastos(db, id_trabajos=ids):
+            gastos.setdefault(detalle["id_trabajo"], []).append(detalle)
+
+    valores = [(campo, _VALORES_TRABAJOS[campo]) for campo in campos]
+    resultado = []
+    for f in filas:
+        asignados = mecanicos.get(f["id"], _SIN_MECANICOS)
+        trabajo = {campo: valor(f, asignados) for campo, valor in valores}
+        if "gastos" in incluir:
+            trabajo["gastos"] = gastos.get(f["id"], [])
+        if "mecanicos" in incluir:
+            trabajo["mecanicos"] = asignados["mecanicos"]
+        resultado.append(trabajo)
+    return resultado
+
+
+def comisiones_quincena(db: Session, quincena: str) -> List[Dict[str, Any]]:
+    filas = db.execute(
+        select(ComisionMecanico.id, ComisionMecanico.id_trabajo, ComisionMecanico.id_mecanico,
+               Mecanico.nombre.label("nombre_mecanico"), Trabajo.descripcion.label("descripcion_trabajo"),
+               ComisionMecanico.monto_comision, ComisionMecanico.estado_comision, ComisionMecanico.quincena,
+               ComisionMecanico.fecha_calculo)
+        .join(Mecanico, ComisionMecanico.id_mecanico == Mecanico.id)
+        .join(Trabajo, ComisionMecanico.id_trabajo == Trabajo.id)
+        .where(ComisionMecanico.quincena == quincena)
+        .order_by(ComisionMecanico.id)
+    ).mappings()
+    return [
+        {
+            "id": f["id"],
+            "id_trabajo": f["id_trabajo"],
+            "id_mecanico": f["id_mecanico"],
+            "nombre_mecanico": f["nombre_mecanico"],
+            "descripcion_trabajo": f["descripcion_trabajo"],
+            "monto_comision": f["monto_comision"],
+            "estado_comision": f["estado_comision"].value,
+            "quincena": f["quincena"],
+            "fecha_calculo": f["fecha_calculo"].strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        for f in filas
+    ]
+
+
+def todas_comisiones(db: Session, ids: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+    consulta = select(ComisionMecanico.id, ComisionMecanico.id_trabajo, ComisionMecanico.id_mecanico,
+                      ComisionMecanico.ganancia_trabajo, ComisionMecanico.porcentaje_comision,
+                      ComisionMecanico.monto_comision, ComisionMecanico.fecha_calculo, ComisionMecanico.mes_reporte,
+                      ComisionMecanico.estado_comision, ComisionMecanico.quincena)
+    filas = db.execute(_filtrar(consulta, ComisionMecanico.id, ids).order_by(ComisionMecanico.id)).mappings()
+    return [
+        {
+            "id": f["id"],
+            "id_trabajo": f["id_trabajo"],
+            "id_mecanico": f["id_mecanico"],
+            "ganancia_trabajo": f["ganancia_trabajo"],
+            "porcentaje_comisi": f["porcentaje_comision"],
+            "monto_comision": f["monto_comision"],
+            "fecha_calculo": f["fecha_calculo"].isoformat(),
+            "mes_reporte": f["mes_reporte"],
+            "estado_comision": f["estado_comision"],
+            "quincena": f["quincena"],
+        }
+        for f in filas
+    ]
+
+
+def mecanicos(db: Session, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    filas = db.execute(
+        select(Mecanico.id, Mecanico.id_nacional, Mecanico.nombre, Mecanico.telefono,
+               Mecanico.porcentaje_comision, Mecanico.fecha_contratacion)
+        .order_by(Mecanico.id)
+        .offset(skip)
+        .limit(limit)
+    ).mappings()
+    return [
+        {
+            "id": f["id"],
+            "id_nacional": f["id_nacional"] or "",
+            "nombre": f["nombre"],
+            "telefono": f["telefono"],
+            "porcentaje_comision": f["porcentaje_comision"],
+            "fecha_contratacion": f["fecha_contratacion"].date() if f["fecha_contratacion"] else None,
+            "activo": True,
+        }
+        for f in filas
+    ]
+
+
+def gastos_taller(db: Session, skip: int = 0, limit: Optional[int] = 100, categoria: Optional[str] = None,
+                  estado=None, fecha_inicio: Optional[datetime] = None,
+                  fecha_fin: Optional[datetime] = None, ids: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+    consulta = select(
+        GastoTaller.id, GastoTaller.descripcion, GastoTaller.monto, GastoTaller.categoria, GastoTaller.fecha_gasto,
+        GastoTaller.fecha_pago, GastoTaller.estado, GastoTaller.created_at, GastoTaller.updated_at,
+    )
+    if categoria:
+        consulta = consulta.where(GastoTaller.categoria.ilike(f"%{categoria}%"))
+    if estado:
+        consulta = consulta.where(GastoTaller.estado == estado)
+    if fecha_inicio:
+        consulta = consulta.where(GastoTaller.fecha_gasto >= fecha_inicio)
+    if fecha_fin:
+        consulta = consulta.where(GastoTaller.fecha_gasto <= fecha_fin)
+    consulta = _filtrar(consulta, GastoTaller.id, ids)
+    consulta = consulta.order_by(GastoTaller.fecha_gasto.desc()).offset(skip).limit(limit)
+    return [dict(f) for f in db.execute(consulta).mappings()]
+
+
+def pagos_salarios(db: Session, skip: int = 0, limit: int = 100, id_mecanico: Optional[int] = None,
+                   semana_pago: Optional[str] = None, fecha_inicio: Optional[datetime] = None,
+                   fecha_fin: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    consulta = (
+        select(PagoSalario.id, PagoSalario.id_mecanico, PagoSalario.monto_salario, PagoSalario.semana_pago,
+               PagoSalario.fecha_pago, PagoSalario.created_at, Mecanico.nombre.label("nombre_mecanico"))
+        .join(Mecanico, PagoSalario.id_mecanico == Mecanico.id)
+    )
+    if id_mecanico:
+        consulta = consulta.where(PagoSalario.id_mecanico == id_mecanico)
+    if semana_pago:
+        consulta = consulta.where(PagoSalario.semana_pago == semana_pago)
+    if fecha_inicio:
+        consulta = consulta.where(PagoSalario.fecha_pago >= fecha_inicio)
+    if fecha_fin:
+        consulta = consulta.where(PagoSalario.fecha_pago <= fecha_fin)
+    consulta = consulta.order_by(PagoSalario.fecha_pago.desc()).offset(skip).limit(limit)
+    return [dict(f) for f in db.execute(consulta).mappings()]
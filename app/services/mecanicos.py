@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, or_, select
 from typing import List, Optional, Dict, Any
 from decimal import Decimal
 from datetime import datetime, timezone
@@ -8,8 +8,15 @@ from app.models.trabajos_mecanicos import TrabajoMecanico
 from app.models.comisiones_mecanicos import ComisionMecanico, EstadoComision
 from app.models.trabajos import Trabajo
 from app.models.detalle_gastos import DetalleGasto
+from app.core.cierres import PeriodoCerradoError
 from app.schemas.mecanicos import MecanicoCreate, MecanicoUpdate, MecanicoConEstadisticas
 import calendar
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+QUINCENA_REGEX = re.compile(r"^\d{4}-Q[1-4]$")
 
 def calcular_fechas_quincena(año: int, num_quincena: int) -> tuple[datetime, datetime]:
     """
@@ -244,7 +251,7 @@ class MecanicoService:
 
     def asignar_multiples_mecanicos_trabajo(self, trabajo_id: int, mecanicos_ids: List[int]) -> Dict[str, Any]:
         """Asigna múltiples mecánicos a un trabajo y calcula comisiones divididas correctamente"""
-        print(f"🔍 SERVICIO: Asignando {len(mecanicos_ids)} mecánicos al trabajo {trabajo_id}")
+        logger.debug("Asignando %d mecánicos al trabajo %s", len(mecanicos_ids), trabajo_id)
         
         # Verificar que el trabajo existe
         trabajo = self.db.query(Trabajo).filter(Trabajo.id == trabajo_id).first()
@@ -270,9 +277,10 @@ class MecanicoService:
         # Dividir comisión entre todos los mecánicos
         comision_por_mecanico = comision_total_trabajo / len(mecanicos_ids) if mecanicos_ids else Decimal('0.00')
         
-        print(f"🔍 SERVICIO: Ganancia base: {ganancia_base}")
-        print(f"🔍 SERVICIO: Comisión total del trabajo: {comision_total_trabajo}")
-        print(f"🔍 SERVICIO: Comisión por mecánico: {comision_por_mecanico}")
+        logger.debug(
+            "Ganancia base: %s, comisión total: %s, comisión por mecánico: %s",
+            ganancia_base, comision_total_trabajo, comision_por_mecanico
+        )
         
         # Eliminar asignaciones existentes para este trabajo
         asignaciones_existentes = self.db.query(ComisionMecanico).filter(
@@ -314,8 +322,7 @@ class MecanicoService:
 
     def actualizar_comisiones_trabajo(self, trabajo_id: int, mecanicos_ids: List[int]) -> Dict[str, Any]:
         """Actualiza las comisiones de un trabajo basándose en los mecánicos asignados"""
-        print(f"🔍 SERVICIO: Actualizando comisiones para trabajo {trabajo_id}")
-        print(f"🔍 SERVICIO: Mecánicos IDs recibidos: {mecanicos_ids}")
+        logger.debug("Actualizando comisiones para trabajo %s, mecánicos: %s", trabajo_id, mecanicos_ids)
         
         # Obtener el trabajo para verificar que existe
         trabajo = self.db.query(Trabajo).filter(Trabajo.id == trabajo_id).first()
@@ -327,7 +334,7 @@ class MecanicoService:
             ComisionMecanico.id_trabajo == trabajo_id
         ).all()
         
-        print(f"🔍 SERVICIO: Eliminando {len(comisiones_existentes)} comisiones existentes")
+        logger.debug("Eliminando %d comisiones existentes", len(comisiones_existentes))
         for comision in comisiones_existentes:
             self.db.delete(comision)
         
@@ -344,9 +351,10 @@ class MecanicoService:
         mano_obra = float(trabajo.mano_obra or 0)
         comision_por_mecanico = (mano_obra * 0.02) / len(mecanicos_ids)
         
-        print(f"🔍 SERVICIO: Mano de obra: {mano_obra}")
-        print(f"🔍 SERVICIO: Comisión por mecánico: {comision_por_mecanico}")
-        print(f"🔍 SERVICIO: Total de mecánicos: {len(mecanicos_ids)}")
+        logger.debug(
+            "Mano de obra: %s, comisión por mecánico: %s, total de mecánicos: %d",
+            mano_obra, comision_por_mecanico, len(mecanicos_ids)
+        )
         
         # Crear nuevas comisiones para todos los mecánicos asignados
         for mecanico_id in mecanicos_ids:
@@ -360,7 +368,6 @@ class MecanicoService:
                 estado_comision=EstadoComision.PENDIENTE
             )
             self.db.add(nueva_comision)
-            print(f"🔍 SERVICIO: Comisión creada para mecánico {mecanico_id}: {comision_por_mecanico}")
         
         self.db.commit()
         
@@ -457,7 +464,7 @@ class MecanicoService:
             try:
                 fecha_inicio, fecha_fin = calcular_fechas_quincena(año, num_quincena)
             except ValueError as e:
-                print(f"Error en formato de quincena: {e}")
+                logger.warning("Error en formato de quincena: %s", e)
                 return []
             
             # Buscar comisiones por fecha del trabajo dentro del rango de la quincena
@@ -489,18 +496,16 @@ class MecanicoService:
             return resultado
             
         except Exception as e:
-            print(f"Error al obtener comisiones por quincena: {e}")
+            logger.exception("Error al obtener comisiones por quincena")
             return []
 
     @staticmethod
     def obtener_estadisticas_mecanico(db: Session, mecanico_id: int, mes: Optional[str] = None) -> MecanicoConEstadisticas:
         """Obtener estadísticas de un mecánico (trabajos, ganancias, comisiones)"""
-        print(f"🔍 DEBUG SERVICIO: Buscando mecánico {mecanico_id}")
         mecanico = db.query(Mecanico).filter(Mecanico.id == mecanico_id).first()
         if not mecanico:
-            print(f"❌ DEBUG SERVICIO: Mecánico {mecanico_id} no encontrado")
+            logger.debug("Mecánico %s no encontrado", mecanico_id)
             raise ValueError("Mecánico no encontrado")
-        print(f"✅ DEBUG SERVICIO: Mecánico encontrado: {mecanico.nombre}")
         
         try:
             # ✅ CORRECTO: Usar la tabla ComisionMecanico que tiene los datos reales calculados
@@ -520,15 +525,13 @@ class MecanicoService:
                 ComisionMecanico.id_mecanico == mecanico_id
             ).all()
             
-            print(f"🔍 DEBUG: Encontrados {len(trabajos_mecanico)} trabajos para mecánico {mecanico_id}")
-            for i, trabajo in enumerate(trabajos_mecanico):
-                print(f"🔍 DEBUG: Trabajo {i+1}: ID={trabajo.id}, mano_obra={trabajo.mano_obra}")
+            logger.debug("Encontrados %d trabajos para mecánico %s", len(trabajos_mecanico), mecanico_id)
 
             # Calcular ganancias como suma de mano_obra de los trabajos
             for trabajo in trabajos_mecanico:
                 total_ganancias += Decimal(str(trabajo.mano_obra or 0))
             
-            print(f"🔍 DEBUG: Total ganancias calculado: {total_ganancias}")
+            logger.debug("Total ganancias calculado: %s", total_ganancias)
 
             # Sumar comisiones desde las comisiones ya calculadas
             for comision in comisiones_mecanico:
@@ -551,7 +554,7 @@ class MecanicoService:
             return mecanico_con_stats
             
         except Exception as e:
-            print(f"❌ ERROR en obtener_estadisticas_mecanico: {e}")
+            logger.exception("Error en obtener_estadisticas_mecanico")
             # En caso de error, retornar estadísticas con valores por defecto
             return MecanicoConEstadisticas(
                 id=mecanico.id,
@@ -667,12 +670,11 @@ class MecanicoService:
             return {"error": f"Error al asignar quincenas: {str(e)}"}
 
     def aprobar_denegar_comisiones_quincena(self, mecanico_id: int, quincena: str, aprobar: bool) -> Dict[str, Any]:
-        print(f"DEBUG: Función llamada con aprobar = {aprobar} (tipo: {type(aprobar)})")
-        print(f"DEBUG: Mecánico ID = {mecanico_id}, Quincena = {quincena}")
         """
         Aprueba o deniega todas las comisiones de un mecánico para una quincena específica.
         Si se deniegan, se eliminan todas las comisiones de la base de datos.
         """
+        logger.debug("Procesando comisiones de mecánico %s, quincena %s, aprobar = %s", mecanico_id, quincena, aprobar)
         try:
             # Verificar que el mecánico existe
             mecanico = self.db.query(Mecanico).filter(Mecanico.id == mecanico_id).first()
@@ -700,12 +702,10 @@ class MecanicoService:
                 ComisionMecanico.quincena == quincena
             ).all()
             
-            print(f"DEBUG: Buscando comisiones para mecánico {mecanico_id}, quincena {quincena}")
-            print(f"DEBUG: Comisiones encontradas por quincena: {len(comisiones)}")
+            logger.debug("Comisiones encontradas por quincena: %d", len(comisiones))
             
             # Si no hay comisiones con quincena asignada, buscar por fecha del trabajo
             if not comisiones:
-                print(f"DEBUG: No hay comisiones con quincena asignada, buscando por fecha del trabajo")
                 comisiones = self.db.query(ComisionMecanico).join(
                     Trabajo, ComisionMecanico.id_trabajo == Trabajo.id
                 ).filter(
@@ -715,29 +715,35 @@ class MecanicoService:
                     ComisionMecanico.estado_comision == EstadoComision.PENDIENTE
                 ).all()
                 
-                print(f"DEBUG: Comisiones encontradas por fecha del trabajo: {len(comisiones)}")
-                for c in comisiones:
-                    print(f"DEBUG: Comisión ID {c.id}, Trabajo {c.id_trabajo}, Estado {c.estado_comision}, Quincena {c.quincena}")
+                logger.debug("Comisiones encontradas por fecha del trabajo: %d", len(comisiones))
             
             if not comisiones:
                 return {"error": f"No hay comisiones para el mecánico {mecanico.nombre} en la quincena {quincena}"}
             
             total_comisiones = len(comisiones)
             monto_total = sum(float(c.monto_comision) for c in comisiones)
+            ids_comisiones = [c.id for c in comisiones]
             
-            print(f"DEBUG: Procesando {len(comisiones)} comisiones, aprobar = {aprobar}")
+            if aprobar:
+                # Marcar todas las comisiones como aprobadas y asignar la quincena en una sola sentencia
+                valores = {
+                    ComisionMecanico.estado_comision: EstadoComision.APROBADA,
+                    ComisionMecanico.quincena: quincena
+                }
+            else:
+                # Marcar comisiones como denegadas (monto = 0, estado = DENEGADA)
+                valores = {
+                    ComisionMecanico.monto_comision: Decimal('0.00'),
+                    ComisionMecanico.estado_comision: EstadoComision.DENEGADA,
+                    ComisionMecanico.quincena: quincena
+                }
+            
+            self.db.query(ComisionMecanico).filter(
+                ComisionMecanico.id.in_(ids_comisiones)
+            ).update(valores, synchronize_session=False)
+            self.db.commit()
             
             if aprobar:
-                print("DEBUG: Aprobando comisiones...")
-                # Marcar todas las comisiones como aprobadas y asignar la quincena
-                for comision in comisiones:
-                    print(f"DEBUG: Aprobando comisión ID {comision.id}")
-                    comision.estado_comision = EstadoComision.APROBADA
-                    comision.quincena = quincena  # Asignar la quincena
-                
-                self.db.commit()
-                print("DEBUG: Comisiones aprobadas y guardadas")
-                
                 return {
                     "message": f"Comisiones aprobadas exitosamente",
                     "mecanico": mecanico.nombre,
@@ -747,18 +753,6 @@ class MecanicoService:
                     "accion": "APROBADA"
                 }
             else:
-                print("DEBUG: Denegando comisiones...")
-                # Marcar comisiones como denegadas (monto = 0, estado = DENEGADA)
-                for comision in comisiones:
-                    print(f"DEBUG: Denegando comisión ID {comision.id}, monto actual: {comision.monto_comision}")
-                    comision.monto_comision = Decimal('0.00')
-                    comision.estado_comision = EstadoComision.DENEGADA
-                    comision.quincena = quincena
-                    print(f"DEBUG: Comisión ID {comision.id} denegada, nuevo monto: {comision.monto_comision}, nuevo estado: {comision.estado_comision}")
-                
-                self.db.commit()
-                print("DEBUG: Comisiones denegadas y guardadas")
-                
                 return {
                     "message": f"Comisiones denegadas exitosamente (monto = 0, estado = DENEGADA)",
                     "mecanico": mecanico.nombre,
@@ -768,6 +762,95 @@ class MecanicoService:
                     "accion": "DENEGADA"
                 }
                 
+        except PeriodoCerradoError:
+            self.db.rollback()
+            raise
+        except Exception as e:
+            self.db.rollback()
+            return {"error": f"Error al procesar comisiones: {str(e)}"}
+
+    def aprobar_denegar_comisiones_quincenas_lote(self, quincenas: List[str], aprobar: bool, mecanicos_ids: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Aprueba o deniega en bloque las comisiones PENDIENTES de varios mecánicos y quincenas.
+        Como en aprobar_denegar_comisiones_quincena, una comisión pertenece a la quincena si
+        la tiene asignada o, si todavía no tiene quincena, si su trabajo cae en el rango de
+        fechas; al procesarla se le asigna la quincena. Se usa una sentencia UPDATE por
+        quincena; si no se indican mecánicos se procesa todo el taller. Los conteos y montos
+        se calculan en SQL antes de actualizar (al denegar el monto queda en 0).
+        """
+        try:
+            if not quincenas:
+                return {"error": "Debe indicar al menos una quincena"}
+            
+            rangos = {}
+            for quincena in quincenas:
+                if not QUINCENA_REGEX.match(quincena):
+                    return {"error": f"Formato de quincena inválido: {quincena}. Debe ser YYYY-Q1, YYYY-Q2, etc."}
+                año, num_quincena = quincena.split('-')
+                rangos[quincena] = calcular_fechas_quincena(int(año), int(num_quincena.replace('Q', '')))
+            
+            if aprobar:
+                valores = {ComisionMecanico.estado_comision: EstadoComision.APROBADA}
+            else:
+                valores = {
+                    ComisionMecanico.monto_comision: Decimal('0.00'),
+                    ComisionMecanico.estado_comision: EstadoComision.DENEGADA
+                }
+            
+            resumen = []
+            filas_afectadas = 0
+            for quincena, (fecha_inicio, fecha_fin) in rangos.items():
+                trabajos_en_rango = select(Trabajo.id).where(
+                    Trabajo.fecha >= fecha_inicio,
+                    Trabajo.fecha <= fecha_fin
+                )
+                filtros = [
+                    ComisionMecanico.estado_comision == EstadoComision.PENDIENTE,
+                    or_(
+                        ComisionMecanico.quincena == quincena,
+                        and_(
+                            ComisionMecanico.quincena.is_(None),
+                            ComisionMecanico.id_trabajo.in_(trabajos_en_rango)
+                        )
+                    )
+                ]
+                # Solo None es "todo el taller": una lista vacía no selecciona a nadie
+                if mecanicos_ids is not None:
+                    filtros.append(ComisionMecanico.id_mecanico.in_(mecanicos_ids))
+                
+                # Totales por mecánico calculados en la base de datos
+                filas = self.db.query(
+                    ComisionMecanico.id_mecanico,
+                    func.count(ComisionMecanico.id).label("total_comisiones"),
+                    func.coalesce(func.sum(ComisionMecanico.monto_comision), 0).label("monto_total")
+                ).filter(*filtros).group_by(ComisionMecanico.id_mecanico).with_for_update().all()
+                resumen.extend(
+                    {
+                        "id_mecanico": f.id_mecanico,
+                        "quincena": quincena,
+                        "total_comisiones": f.total_comisiones,
+                        "monto_total": float(f.monto_total)
+                    }
+                    for f in filas
+                )
+                
+                filas_afectadas += self.db.query(ComisionMecanico).filter(*filtros).update(
+                    {**valores, ComisionMecanico.quincena: quincena}, synchronize_session=False
+                )
+            self.db.commit()
+            
+            return {
+                "message": f"Comisiones {'aprobadas' if aprobar else 'denegadas'} exitosamente",
+                "accion": "APROBADA" if aprobar else "DENEGADA",
+                "quincenas": quincenas,
+                "filas_afectadas": filas_afectadas,
+                "monto_total": sum(d["monto_total"] for d in resumen),
+                "detalle": resumen
+            }
+        
+        except PeriodoCerradoError:
+            self.db.rollback()
+            raise
         except Exception as e:
             self.db.rollback()
             return {"error": f"Error al procesar comisiones: {str(e)}"}
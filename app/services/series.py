@@ -0,0 +1,142 @@
+"""
+Series de tiempo de ingresos y costos de los trabajos para los gráficos del dashboard.
+
+Una sola consulta agrupa los trabajos del rango por periodo (día, semana,
+quincena o mes) a partir de trabajos.fecha: el filtro por rango usa el índice
+ix_trabajos_fecha y la expresión del periodo se calcula en la base. Los
+periodos sin trabajos se completan con ceros.
+
+Con `puntos`, las series largas se reducen uniendo periodos consecutivos (los
+montos se suman) hasta no pasar de esa cantidad de puntos.
+"""
+import math
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy import case, extract, func, select
+from sqlalchemy.orm import Session
+
+from app.models.trabajos import Trabajo
+from app.models.detalle_gastos import DetalleGasto
+from app.services.estado_resultados import Granularidad, Periodo, generar_periodos, periodo_natural
+
+IVA = 0.13
+# Máximo de periodos antes de reducir (algo más de 13 años por día)
+MAX_PERIODOS_SERIE = 5000
+
+CAMPOS = ("ingresos", "gastos", "markup", "iva", "ganancia", "cantidad_trabajos")
+
+
+def expresion_periodo(columna, granularidad: Granularidad, dialecto: str):
+    """Primer día del periodo que contiene a la fecha de la columna (texto o fecha según la base)"""
+    mysql = dialecto == "mysql"
+
+    def formato(patron: str):
+        return func.date_format(columna, patron) if mysql else func.strftime(patron, columna)
+
+    if granularidad == Granularidad.DIA:
+        return func.date(columna)
+    if granularidad == Granularidad.SEMANA:
+        # Lunes de la semana ISO
+        if mysql:
+            return func.subdate(func.date(columna), func.weekday(columna))
+        return func.date(columna, "weekday 0", "-6 days")
+    if granularidad == Granularidad.QUINCENA:
+        return case((extract("day", columna) <= 15, formato("%Y-%m-01")), else_=formato("%Y-%m-16"))
+    return formato("%Y-%m-01")
+
+
+def _como_fecha(valor) -> date:
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    return date.fromisoformat(str(valor)[:10])
+
+
+def _float(valor) -> float:
+    return round(float(valor), 2) if valor is not None else 0.0
+
+
+def reducir(puntos_serie: List[Dict[str, Any]], maximo: int) -> List[Dict[str, Any]]:
+    """Une puntos consecutivos (sumando los montos) para no pasar de `maximo`"""
+    if maximo <= 0 or len(puntos_serie) <= maximo:
+        return puntos_serie
+    tamano = math.ceil(len(puntos_serie) / maximo)
+    reducidos = []
+    for i in range(0, len(puntos_serie), tamano):
+        grupo = puntos_serie[i:i + tamano]
+        punto = {"periodo": grupo[0]["periodo"], "inicio": grupo[0]["inicio"], "fin": grupo[-1]["fin"]}
+        for campo in CAMPOS:
+            punto[campo] = sum(p[campo] for p in grupo)
+            if isinstance(punto[campo], float):
+                punto[campo] = round(punto[campo], 2)
+        reducidos.append(punto)
+    return reducidos
+
+
+class SeriesService:
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _consulta(self, desde: date, hasta: date, granularidad: Granularidad):
+        inicio = datetime.combine(desde, datetime.min.time())
+        fin = datetime.combine(hasta + timedelta(days=1), datetime.min.time())
+        en_rango = (Trabajo.fecha >= inicio) & (Trabajo.fecha < fin)
+        periodo = expresion_periodo(Trabajo.fecha, granularidad, self.db.get_bind().dialect.name).label("periodo")
+
+        # Costo de repuestos por trabajo, solo de los trabajos del rango
+        repuestos = (
+            select(DetalleGasto.id_trabajo, func.sum(DetalleGasto.monto).label("gastos"))
+            .join(Trabajo, DetalleGasto.id_trabajo == Trabajo.id)
+            .where(en_rango)
+            .group_by(DetalleGasto.id_trabajo)
+            .subquery()
+        )
+        return (
+            select(
+                periodo,
+                func.count(Trabajo.id).label("cantidad_trabajos"),
+                func.sum(Trabajo.costo).label("ingresos"),
+                func.sum(repuestos.c.gastos).label("gastos"),
+                func.sum(Trabajo.markup_repuestos).label("markup"),
+                func.sum(case((Trabajo.aplica_iva, Trabajo.costo), else_=0)).label("gravado"),
+                func.sum(Trabajo.ganancia).label("ganancia"),
+            )
+            .outerjoin(repuestos, repuestos.c.id_trabajo == Trabajo.id)
+            .where(en_rango)
+            .group_by(periodo)
+        )
+
+    def serie(self, desde: date, hasta: date, granularidad: Granularidad, puntos: Optional[int] = None) -> Dict[str, Any]:
+        periodos: List[Periodo] = generar_periodos(desde, hasta, granularidad, maximo=MAX_PERIODOS_SERIE)
+
+        # Por etiqueta: los periodos de los extremos pueden estar recortados al rango
+        por_etiqueta = {}
+        for fila in self.db.execute(self._consulta(desde, hasta, granularidad)):
+            por_etiqueta[periodo_natural(_como_fecha(fila.periodo), granularidad)[2]] = fila
+
+        serie = []
+        for periodo in periodos:
+            fila = por_etiqueta.get(periodo.etiqueta)
+            serie.append({
+                "periodo": periodo.etiqueta,
+                "inicio": periodo.inicio.isoformat(),
+                "fin": (periodo.fin - timedelta(days=1)).isoformat(),
+                "ingresos": _float(fila.ingresos) if fila else 0.0,
+                "gastos": _float(fila.gastos) if fila else 0.0,
+                "markup": _float(fila.markup) if fila else 0.0,
+                "iva": round(_float(fila.gravado) * IVA, 2) if fila else 0.0,
+                "ganancia": _float(fila.ganancia) if fila else 0.0,
+                "cantidad_trabajos": fila.cantidad_trabajos if fila else 0,
+            })
+
+        periodos_por_punto = math.ceil(len(serie) / puntos) if puntos and len(serie) > puntos else 1
+        return {
+            "desde": desde.isoformat(),
+            "hasta": hasta.isoformat(),
+            "granularidad": granularidad.value,
+            "periodos_por_punto": periodos_por_punto,
+            "serie": reducir(serie, puntos) if periodos_por_punto > 1 else serie,
+        }
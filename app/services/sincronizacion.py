@@ -0,0 +1,143 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import Dict, Any, List
+from datetime import timedelta
+from app.core import config
+from app.models.database import Base, ahora_utc
+from app.models.registro_cambios import RegistroCambio, OperacionCambio
+from app.services import lecturas
+
+# Máximo de llaves por consulta IN al leer las filas cambiadas
+LOTE_FILAS = 500
+
+# Listado de cada tabla sincronizada: las filas cambiadas se leen con la misma
+# función que el endpoint del listado, filtrada por id, para que el dashboard
+# las reemplace sin transformarlas
+LISTADOS = {
+    "trabajos": lambda db, ids: lecturas.trabajos(db, ids=ids),
+    "detalles_gastos": lambda db, ids: lecturas.detalles_gastos(db, ids=ids),
+    "clientes": lambda db, ids: lecturas.clientes(db, ids=ids),
+    "carros": lambda db, ids: lecturas.carros(db, ids=ids),
+    "comisiones_mecanicos": lambda db, ids: lecturas.todas_comisiones(db, ids=ids),
+    "gastos_taller": lambda db, ids: lecturas.gastos_taller(db, limit=None, ids=ids),
+}
+
+
+def leer_registros(db: Session, desde: int, limite: int):
+    """Filas de la bitácora posteriores al token, en orden (a lo sumo `limite`)"""
+    return db.execute(
+        select(RegistroCambio.id, RegistroCambio.tabla, RegistroCambio.id_fila,
+               RegistroCambio.operacion, RegistroCambio.fecha)
+        .where(RegistroCambio.id > desde)
+        .order_by(RegistroCambio.id)
+        .limit(limite)
+    ).all()
+
+
+def _limite_huecos():
+    """Fecha a partir de la cual un hueco en la bitácora puede ser una transacción abierta"""
+    return ahora_utc().replace(tzinfo=None) - timedelta(seconds=config.SYNC_MARGEN_SEGUNDOS)
+
+
+def token_seguro(desde: int, registros) -> int:
+    """
+    Último id hasta el cual no quedan huecos recientes. Los ids se asignan al
+    insertar y no al confirmar: un hueco reciente puede ser una transacción
+    aún abierta, así que el token no lo salta y el cliente volverá a pedir
+    desde ahí. Un hueco más viejo que SYNC_MARGEN_SEGUNDOS es un rollback.
+    """
+    limite_huecos = _limite_huecos()
+    token = desde
+    for registro in registros:
+        if registro.id != token + 1 and registro.fecha.replace(tzinfo=None) > limite_huecos:
+            break
+        token = registro.id
+    return token
+
+
+def tipo_llave(tabla: str):
+    """Tipo de Python de la llave primaria de la tabla (int o str)"""
+    return next(iter(Base.metadata.tables[tabla].primary_key.columns)).type.python_type
+
+
+class SincronizacionService:
+    """Cambios de las tablas sincronizadas desde un token de la bitácora (GET /api/sync)"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def token_actual(self) -> int:
+        """
+        Token desde el cual un cliente que acaba de cargar todo debe pedir cambios.
+        No es max(id): como en obtener_cambios, no salta un hueco reciente. Se leen
+        hacia atrás las filas de la bitácora hasta la primera más vieja que
+        SYNC_MARGEN_SEGUNDOS, y desde ella se aplica token_seguro a las recientes.
+        """
+        limite_huecos = _limite_huecos()
+        recientes = []
+        consulta = select(RegistroCambio.id, RegistroCambio.fecha).order_by(RegistroCambio.id.desc()).limit(LOTE_FILAS)
+        anterior_a = None
+        while True:
+            lote = consulta if anterior_a is None else consulta.where(RegistroCambio.id < anterior_a)
+            filas = self.db.execute(lote).all()
+            for fila in filas:
+                if fila.fecha.replace(tzinfo=None) <= limite_huecos:
+                    return token_seguro(fila.id, reversed(recientes))
+                recientes.append(fila)
+            if len(filas) < LOTE_FILAS:
+                return token_seguro(0, reversed(recientes))
+            anterior_a = filas[-1].id
+
+    def obtener_cambios(self, desde: int, limite: int = 1000) -> Dict[str, Any]:
+        """
+        Devuelve las filas creadas, actualizadas y eliminadas después del token
+        `desde`. Varios cambios de una misma fila se resumen en su estado final,
+        con el formato de la fila en el listado de su tabla.
+        """
+        registros = leer_registros(self.db, desde, limite + 1)
+        mas = len(registros) > limite
+        registros = registros[:limite]
+
+        # Primera y última operación de cada fila
+        operaciones: Dict[tuple, list] = {}
+        for registro in registros:
+            clave = (registro.tabla, registro.id_fila)
+            if clave in operaciones:
+                operaciones[clave][1] = registro.operacion
+            else:
+                operaciones[clave] = [registro.operacion, registro.operacion]
+
+        por_tabla: Dict[str, Dict[str, List[str]]] = {}
+        for (tabla, id_fila), (primera, ultima) in operaciones.items():
+            grupos = por_tabla.setdefault(tabla, {"creados": [], "actualizados": [], "eliminados": []})
+            if ultima == OperacionCambio.ELIMINAR:
+                grupos["eliminados"].append(id_fila)
+            elif primera == OperacionCambio.CREAR:
+                grupos["creados"].append(id_fila)
+            else:
+                grupos["actualizados"].append(id_fila)
+
+        cambios = {}
+        for tabla, grupos in por_tabla.items():
+            filas = self._leer_filas(tabla, grupos["creados"] + grupos["actualizados"])
+            # Una fila registrada pero ya inexistente se eliminó en un cambio posterior
+            eliminados = grupos["eliminados"] + [
+                i for i in grupos["creados"] + grupos["actualizados"] if i not in filas
+            ]
+            cambios[tabla] = {
+                "creados": [filas[i] for i in grupos["creados"] if i in filas],
+                "actualizados": [filas[i] for i in grupos["actualizados"] if i in filas],
+                "eliminados": [tipo_llave(tabla)(i) for i in eliminados],
+            }
+
+        return {"token": token_seguro(desde, registros), "mas": mas, "cambios": cambios}
+
+    def _leer_filas(self, nombre_tabla: str, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        listado = LISTADOS[nombre_tabla]
+        tipo = tipo_llave(nombre_tabla)
+        filas = {}
+        for inicio in range(0, len(ids), LOTE_FILAS):
+            lote = [tipo(i) for i in ids[inicio:inicio + LOTE_FILAS]]
+            for fila in listado(self.db, lote):
+                filas[str(fila["id"])] = fila
+        return filas
@@ -33,7 +33,12 @@ export const API_CONFIG = {
     REPORTES: '/reportes',
     
     // Autenticación
-    AUTH: '/auth'
+    AUTH: '/auth',
+
+    // Resumen del dashboard, cambios desde un token y canal de eventos (SSE)
+    SYNC: '/sync',
+    DASHBOARD_RESUMEN: '/dashboard/resumen',
+    EVENTOS: '/eventos'
   }
 }
 
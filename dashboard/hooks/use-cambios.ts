@@ -0,0 +1,63 @@
+"use client"
+
+// Suscripción al canal de eventos del backend (GET /api/eventos, Server-Sent Events)
+import { useEffect, useRef } from "react"
+import { API_CONFIG, buildApiUrl } from "@/app/lib/api-config"
+
+// id es la llave entera de la fila: el campo `id` de los listados (/api/clientes, /api/carros, /api/trabajos...)
+export interface Cambio {
+  entidad: string
+  id: number
+  op: "CREAR" | "ACTUALIZAR" | "ELIMINAR"
+}
+
+export interface LoteCambios {
+  token: number
+  cambios: Cambio[]
+}
+
+// Ids de una entidad del lote agrupados por operación
+export function idsPorOperacion(lote: LoteCambios, entidad: string) {
+  const ids = { CREAR: new Set<number>(), ACTUALIZAR: new Set<number>(), ELIMINAR: new Set<number>() }
+  for (const cambio of lote.cambios) {
+    if (cambio.entidad === entidad) ids[cambio.op].add(cambio.id)
+  }
+  return ids
+}
+
+// Quita de las filas de un listado las eliminadas en el lote (se buscan por su campo id)
+export function quitarEliminados<T extends { id: number }>(filas: T[], lote: LoteCambios, entidad: string): T[] {
+  const eliminados = idsPorOperacion(lote, entidad).ELIMINAR
+  return eliminados.size ? filas.filter((fila) => !eliminados.has(fila.id)) : filas
+}
+
+// Llama a onCambios con cada lote de cambios de las tablas indicadas y a onRecargar
+// cuando el backend pide recargar todo. El navegador reconecta solo y reenvía Last-Event-ID.
+export function useCambios(
+  tablas: string[],
+  onCambios: (lote: LoteCambios) => void,
+  onRecargar?: () => void,
+) {
+  const onCambiosRef = useRef(onCambios)
+  const onRecargarRef = useRef(onRecargar)
+  onCambiosRef.current = onCambios
+  onRecargarRef.current = onRecargar
+
+  const filtro = tablas.join(",")
+
+  useEffect(() => {
+    if (typeof window === "undefined" || !("EventSource" in window)) return
+
+    const url = `${buildApiUrl(API_CONFIG.ENDPOINTS.EVENTOS)}${filtro ? `?tablas=${encodeURIComponent(filtro)}` : ""}`
+    const fuente = new EventSource(url)
+
+    fuente.addEventListener("cambios", (evento) => {
+      onCambiosRef.current(JSON.parse((evento as MessageEvent).data) as LoteCambios)
+    })
+    fuente.addEventListener("recargar", () => {
+      onRecargarRef.current?.()
+    })
+
+    return () => fuente.close()
+  }, [filtro])
+}
@@ -1,5 +1,6 @@
 // Updated TypeScript interfaces without status fields
 export interface Client {
+  id: number
   id_nacional: string
   nombre: string
   apellido?: string
@@ -0,0 +1,38 @@
+-- Cierre de meses y quincenas con montos congelados (POST /api/cierres/{periodo})
+-- MySQL: mysql -u root -p auto_andrade < migracion_cierres.sql
+--
+-- Un cierre no se modifica ni se reabre: las correcciones se registran en un periodo abierto.
+
+CREATE TABLE IF NOT EXISTS cierres_periodo (
+    id INT NOT NULL AUTO_INCREMENT,
+    periodo VARCHAR(10) NOT NULL,
+    tipo ENUM('MES', 'QUINCENA') NOT NULL,
+    inicio DATE NOT NULL,
+    fin DATE NOT NULL,
+    fecha_cierre DATETIME(6) NOT NULL,
+    ingresos DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    iva DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    mano_obra DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    markup_repuestos DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    costo_repuestos DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    comisiones DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    gastos_taller DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    salarios DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    cantidad_trabajos INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (id),
+    UNIQUE KEY uq_cierres_periodo_periodo (periodo)
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS cierres_comisiones (
+    id INT NOT NULL AUTO_INCREMENT,
+    id_cierre INT NOT NULL,
+    id_mecanico INT NOT NULL,
+    nombre_mecanico VARCHAR(100) NOT NULL,
+    estado_comision ENUM('PENDIENTE', 'APROBADA', 'PENALIZADA', 'DENEGADA') NOT NULL,
+    cantidad INT NOT NULL,
+    total DECIMAL(12, 2) NOT NULL,
+    PRIMARY KEY (id),
+    KEY ix_cierres_comisiones_id_cierre (id_cierre),
+    CONSTRAINT fk_cierres_comisiones_cierre FOREIGN KEY (id_cierre)
+        REFERENCES cierres_periodo (id) ON DELETE CASCADE
+) ENGINE=InnoDB;
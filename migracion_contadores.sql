@@ -0,0 +1,18 @@
+-- Contadores de filas para los totales del dashboard (GET /api/reportes/totales, /api/dashboard/resumen)
+-- MySQL: mysql -u root -p auto_andrade < migracion_contadores.sql
+--
+-- La aplicación los mantiene en cada inserción y eliminación; python -m app.core.contadores
+-- los vuelve a comparar con COUNT(*).
+
+CREATE TABLE IF NOT EXISTS contadores (
+    tabla VARCHAR(50) NOT NULL,
+    total BIGINT NOT NULL DEFAULT 0,
+    reconciliado DATETIME(6) NULL,
+    PRIMARY KEY (tabla)
+) ENGINE=InnoDB;
+
+-- Valores iniciales (ejecutar con la aplicación detenida)
+REPLACE INTO contadores (tabla, total, reconciliado)
+SELECT 'carros', COUNT(*), UTC_TIMESTAMP(6) FROM carros
+UNION ALL SELECT 'clientes', COUNT(*), UTC_TIMESTAMP(6) FROM clientes
+UNION ALL SELECT 'trabajos', COUNT(*), UTC_TIMESTAMP(6) FROM trabajos;
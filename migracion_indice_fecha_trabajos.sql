@@ -0,0 +1,8 @@
+-- Índice sobre trabajos.fecha para los reportes por rango de fechas
+-- (GET /api/reportes/series, /api/reportes/estado-resultados, /api/dashboard/resumen)
+-- MySQL: mysql -u root -p auto_andrade < migracion_indice_fecha_trabajos.sql
+
+CREATE INDEX ix_trabajos_fecha ON trabajos (fecha);
+
+-- Verificación: la consulta por rango debe usar ix_trabajos_fecha
+EXPLAIN SELECT COUNT(*) FROM trabajos WHERE fecha >= '2025-01-01' AND fecha < '2026-01-01';
@@ -0,0 +1,146 @@
+-- Llaves enteras en clientes y carros: id INT AUTO_INCREMENT como llave primaria
+-- MySQL: mysql -u root -p auto_andrade < migracion_llaves_enteras.sql
+--
+-- La cédula (clientes.id_nacional) y la matrícula (carros.matricula) quedan como
+-- columnas UNIQUE editables; carros, trabajos e historial_duenos pasan a
+-- referenciar los id enteros. Hacer un respaldo antes de ejecutarla y detener la
+-- aplicación mientras corre.
+
+DELIMITER //
+
+-- Elimina las llaves foráneas que apuntan a la tabla indicada (los nombres dependen de cómo se creó la base)
+CREATE PROCEDURE _eliminar_llaves_foraneas_hacia(IN tabla_referenciada VARCHAR(64))
+BEGIN
+    DECLARE terminado INT DEFAULT 0;
+    DECLARE tabla_fk, nombre_fk VARCHAR(64);
+    DECLARE cursor_fk CURSOR FOR
+        SELECT TABLE_NAME, CONSTRAINT_NAME FROM information_schema.REFERENTIAL_CONSTRAINTS
+        WHERE CONSTRAINT_SCHEMA = DATABASE() AND REFERENCED_TABLE_NAME = tabla_referenciada;
+    DECLARE CONTINUE HANDLER FOR NOT FOUND SET terminado = 1;
+    OPEN cursor_fk;
+    recorrer: LOOP
+        FETCH cursor_fk INTO tabla_fk, nombre_fk;
+        IF terminado THEN
+            LEAVE recorrer;
+        END IF;
+        SET @sentencia = CONCAT('ALTER TABLE `', tabla_fk, '` DROP FOREIGN KEY `', nombre_fk, '`');
+        PREPARE ejecutar FROM @sentencia;
+        EXECUTE ejecutar;
+        DEALLOCATE PREPARE ejecutar;
+    END LOOP;
+    CLOSE cursor_fk;
+END //
+
+-- Crea el índice UNIQUE sobre la columna si no existe uno
+CREATE PROCEDURE _asegurar_indice_unico(IN tabla VARCHAR(64), IN columna VARCHAR(64), IN nombre VARCHAR(64))
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = tabla AND COLUMN_NAME = columna
+          AND NON_UNIQUE = 0 AND SEQ_IN_INDEX = 1 AND INDEX_NAME <> 'PRIMARY'
+    ) THEN
+        SET @sentencia = CONCAT('CREATE UNIQUE INDEX `', nombre, '` ON `', tabla, '` (`', columna, '`)');
+        PREPARE ejecutar FROM @sentencia;
+        EXECUTE ejecutar;
+        DEALLOCATE PREPARE ejecutar;
+    END IF;
+END //
+
+DELIMITER ;
+
+-- 1. Quitar las llaves foráneas hacia las llaves primarias de texto
+CALL _eliminar_llaves_foraneas_hacia('carros');
+CALL _eliminar_llaves_foraneas_hacia('clientes');
+
+-- 2. Cédula y matrícula siguen siendo únicas antes de dejar de ser llave primaria
+CALL _asegurar_indice_unico('clientes', 'id_nacional', 'ix_clientes_id_nacional');
+CALL _asegurar_indice_unico('carros', 'matricula', 'ix_carros_matricula');
+
+ALTER TABLE clientes
+    DROP PRIMARY KEY,
+    ADD COLUMN id INT NOT NULL AUTO_INCREMENT FIRST,
+    ADD PRIMARY KEY (id),
+    MODIFY id_nacional VARCHAR(20) NOT NULL;
+
+ALTER TABLE carros
+    DROP PRIMARY KEY,
+    ADD COLUMN id INT NOT NULL AUTO_INCREMENT FIRST,
+    ADD PRIMARY KEY (id),
+    MODIFY matricula VARCHAR(20) NOT NULL;
+
+-- 3. Columnas enteras que reemplazan a las referencias de texto
+ALTER TABLE carros ADD COLUMN id_cliente INT NULL AFTER anio;
+UPDATE carros c
+    JOIN clientes cl ON cl.id_nacional = c.id_cliente_actual
+    SET c.id_cliente = cl.id;
+ALTER TABLE carros DROP COLUMN id_cliente_actual;
+
+ALTER TABLE trabajos ADD COLUMN id_carro INT NULL AFTER id;
+UPDATE trabajos t
+    JOIN carros c ON c.matricula = t.matricula_carro
+    SET t.id_carro = c.id;
+ALTER TABLE trabajos DROP COLUMN matricula_carro;
+
+ALTER TABLE historial_duenos
+    ADD COLUMN id_carro INT NULL AFTER id,
+    ADD COLUMN id_cliente_nuevo INT NULL AFTER id_carro;
+UPDATE historial_duenos h
+    JOIN carros c ON c.matricula = h.matricula_carro
+    SET h.id_carro = c.id;
+UPDATE historial_duenos h
+    JOIN clientes cl ON cl.id_nacional = h.id_cliente
+    SET h.id_cliente_nuevo = cl.id;
+ALTER TABLE historial_duenos
+    DROP COLUMN matricula_carro,
+    DROP COLUMN id_cliente,
+    CHANGE id_cliente_nuevo id_cliente INT NULL;
+
+-- 4. Índices y llaves foráneas sobre los id enteros
+ALTER TABLE carros
+    ADD KEY ix_carros_id_cliente (id_cliente),
+    ADD CONSTRAINT fk_carros_cliente FOREIGN KEY (id_cliente)
+        REFERENCES clientes (id) ON DELETE SET NULL;
+
+ALTER TABLE trabajos
+    ADD KEY ix_trabajos_id_carro (id_carro),
+    ADD CONSTRAINT fk_trabajos_carro FOREIGN KEY (id_carro)
+        REFERENCES carros (id) ON DELETE CASCADE;
+
+ALTER TABLE historial_duenos
+    ADD KEY ix_historial_duenos_id_carro (id_carro),
+    ADD KEY ix_historial_duenos_id_cliente (id_cliente),
+    ADD CONSTRAINT fk_historial_duenos_carro FOREIGN KEY (id_carro)
+        REFERENCES carros (id) ON DELETE CASCADE,
+    ADD CONSTRAINT fk_historial_duenos_cliente FOREIGN KEY (id_cliente)
+        REFERENCES clientes (id) ON DELETE SET NULL;
+
+-- 5. Bitácora de sincronización: id_fila de clientes y carros pasa a ser el id entero.
+--    Las filas de registros ya eliminados no tienen id nuevo y se descartan; los
+--    clientes de /api/sync y /api/eventos deben recargar todo después de migrar.
+DELETE r FROM registro_cambios r
+    LEFT JOIN clientes cl ON cl.id_nacional = r.id_fila
+    WHERE r.tabla = 'clientes' AND cl.id IS NULL;
+UPDATE registro_cambios r
+    JOIN clientes cl ON cl.id_nacional = r.id_fila
+    SET r.id_fila = CAST(cl.id AS CHAR)
+    WHERE r.tabla = 'clientes';
+
+DELETE r FROM registro_cambios r
+    LEFT JOIN carros c ON c.matricula = r.id_fila
+    WHERE r.tabla = 'carros' AND c.id IS NULL;
+UPDATE registro_cambios r
+    JOIN carros c ON c.matricula = r.id_fila
+    SET r.id_fila = CAST(c.id AS CHAR)
+    WHERE r.tabla = 'carros';
+
+DROP PROCEDURE _eliminar_llaves_foraneas_hacia;
+DROP PROCEDURE _asegurar_indice_unico;
+
+-- Verificación: referencias sin resolver (trabajos e historial deben quedar en 0)
+SELECT 'trabajos sin carro' AS revision, COUNT(*) AS filas FROM trabajos WHERE id_carro IS NULL
+UNION ALL SELECT 'historial sin carro', COUNT(*) FROM historial_duenos WHERE id_carro IS NULL
+UNION ALL SELECT 'historial sin cliente', COUNT(*) FROM historial_duenos WHERE id_cliente IS NULL
+UNION ALL SELECT 'carros sin dueño', COUNT(*) FROM carros WHERE id_cliente IS NULL;
+
+-- El listado de trabajos con matrícula debe usar ix_trabajos_id_carro y la llave primaria de carros
+EXPLAIN SELECT t.id, c.matricula FROM trabajos t JOIN carros c ON c.id = t.id_carro WHERE t.fecha >= '2025-01-01';
@@ -0,0 +1,13 @@
+-- Bitácora de cambios para la sincronización incremental (GET /api/sync)
+-- MySQL: mysql -u root -p auto_andrade < migracion_registro_cambios.sql
+--
+-- Solo se insertan filas; el id es el token que reciben los clientes.
+
+CREATE TABLE IF NOT EXISTS registro_cambios (
+    id BIGINT NOT NULL AUTO_INCREMENT,
+    tabla VARCHAR(50) NOT NULL,
+    id_fila VARCHAR(50) NOT NULL,
+    operacion ENUM('CREAR', 'ACTUALIZAR', 'ELIMINAR') NOT NULL,
+    fecha DATETIME(6) NOT NULL,
+    PRIMARY KEY (id)
+) ENGINE=InnoDB;
@@ -0,0 +1,31 @@
+-- Columna updated_at en trabajos, clientes, carros y detalles_gastos (ETag de los listados)
+-- MySQL: mysql -u root -p auto_andrade < migracion_updated_at.sql
+--
+-- La aplicación asigna updated_at en cada INSERT/UPDATE del ORM; el DEFAULT y el
+-- ON UPDATE de la base cubren además las escrituras hechas con SQL directo.
+
+ALTER TABLE trabajos
+    ADD COLUMN updated_at DATETIME(6) NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+UPDATE trabajos SET updated_at = COALESCE(fecha, fecha_registro, CURRENT_TIMESTAMP(6));
+CREATE INDEX ix_trabajos_updated_at ON trabajos (updated_at);
+
+ALTER TABLE clientes
+    ADD COLUMN updated_at DATETIME(6) NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+CREATE INDEX ix_clientes_updated_at ON clientes (updated_at);
+
+ALTER TABLE carros
+    ADD COLUMN updated_at DATETIME(6) NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+CREATE INDEX ix_carros_updated_at ON carros (updated_at);
+
+ALTER TABLE detalles_gastos
+    ADD COLUMN updated_at DATETIME(6) NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+UPDATE detalles_gastos d
+    JOIN trabajos t ON t.id = d.id_trabajo
+    SET d.updated_at = t.updated_at;
+CREATE INDEX ix_detalles_gastos_updated_at ON detalles_gastos (updated_at);
+
+-- Verificación
+SELECT 'trabajos' AS tabla, COUNT(*) AS filas, MAX(updated_at) AS ultima_modificacion FROM trabajos
+UNION ALL SELECT 'clientes', COUNT(*), MAX(updated_at) FROM clientes
+UNION ALL SELECT 'carros', COUNT(*), MAX(updated_at) FROM carros
+UNION ALL SELECT 'detalles_gastos', COUNT(*), MAX(updated_at) FROM detalles_gastos;
@@ -0,0 +1,32 @@
+-- Columna updated_at en comisiones_mecanicos, mecanicos, gastos_taller y pagos_salarios (ETag)
+-- MySQL: mysql -u root -p auto_andrade < migracion_updated_at_mecanicos.sql
+--
+-- Completa migracion_updated_at.sql: sin updated_at la huella del ETag usa max(id), y una
+-- modificación en sitio (aprobar una comisión, corregir un gasto) no cambiaba el ETag.
+
+ALTER TABLE comisiones_mecanicos
+    ADD COLUMN updated_at DATETIME(6) NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+UPDATE comisiones_mecanicos SET updated_at = COALESCE(fecha_calculo, CURRENT_TIMESTAMP(6));
+CREATE INDEX ix_comisiones_mecanicos_updated_at ON comisiones_mecanicos (updated_at);
+
+ALTER TABLE pagos_salarios
+    ADD COLUMN updated_at DATETIME(6) NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+UPDATE pagos_salarios SET updated_at = COALESCE(created_at, fecha_pago, CURRENT_TIMESTAMP(6));
+CREATE INDEX ix_pagos_salarios_updated_at ON pagos_salarios (updated_at);
+
+-- mecanicos y gastos_taller ya tenían updated_at (DATETIME, asignado solo por el ORM)
+ALTER TABLE mecanicos
+    MODIFY updated_at DATETIME(6) NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+UPDATE mecanicos SET updated_at = COALESCE(updated_at, created_at, CURRENT_TIMESTAMP(6));
+CREATE INDEX ix_mecanicos_updated_at ON mecanicos (updated_at);
+
+ALTER TABLE gastos_taller
+    MODIFY updated_at DATETIME(6) NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+UPDATE gastos_taller SET updated_at = COALESCE(updated_at, created_at, fecha_gasto, CURRENT_TIMESTAMP(6));
+CREATE INDEX ix_gastos_taller_updated_at ON gastos_taller (updated_at);
+
+-- Verificación
+SELECT 'comisiones_mecanicos' AS tabla, COUNT(*) AS filas, MAX(updated_at) AS ultima_modificacion FROM comisiones_mecanicos
+UNION ALL SELECT 'pagos_salarios', COUNT(*), MAX(updated_at) FROM pagos_salarios
+UNION ALL SELECT 'mecanicos', COUNT(*), MAX(updated_at) FROM mecanicos
+UNION ALL SELECT 'gastos_taller', COUNT(*), MAX(updated_at) FROM gastos_taller;
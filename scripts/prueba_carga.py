@@ -0,0 +1,267 @@
+"""
+Pruebas de carga HTTP por escenarios (asyncio + httpx).
+
+Escenarios:
+- dashboard: cada usuario virtual repite la secuencia de llamadas que hace el
+  dashboard al cargar (inicio, reportes, taller y mecánicos).
+- aprobaciones: tormenta de fin de quincena; muchos usuarios aprueban (o
+  deniegan, con --denegar) comisiones por mecánico y quincena a la vez, más
+  aprobaciones en lote.
+- facturas: ráfagas de generación de facturas PDF en paralelo.
+
+Para cada endpoint reporta cantidad de peticiones, errores, latencias p50/p95/p99
+y throughput. Los escenarios de aprobaciones modifican datos: usar una base con
+datos sintéticos (python -m app.datos_sinteticos), nunca la de producción.
+
+Uso:
+    # Contra un backend ya iniciado
+    python scripts/prueba_carga.py --url http://localhost:8000 --usuarios 20 --duracion 30
+
+    # Inicia uvicorn localmente con la base indicada y lo detiene al terminar
+    DATABASE_URL=sqlite:///carga.db APP_ENV=production python scripts/prueba_carga.py --iniciar-servidor --escenarios dashboard,facturas
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+RAIZ_PROYECTO = Path(__file__).resolve().parent.parent
+ESCENARIOS = ("dashboard", "aprobaciones", "facturas")
+
+
+@dataclass
+class Resultados:
+    """Latencias y errores por endpoint (plantilla de la ruta) de un escenario"""
+    latencias: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    errores: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    inicio: float = 0.0
+    fin: float = 0.0
+
+    def registrar(self, endpoint: str, duracion: float, ok: bool) -> None:
+        self.latencias[endpoint].append(duracion)
+        if not ok:
+            self.errores[endpoint] += 1
+
+    def resumen(self) -> List[dict]:
+        duracion = max(self.fin - self.inicio, 1e-9)
+        filas = []
+        for endpoint, latencias in sorted(self.latencias.items()):
+            filas.append({
+                "endpoint": endpoint,
+                "peticiones": len(latencias),
+                "errores": self.errores.get(endpoint, 0),
+                "p50_ms": percentil(latencias, 50) * 1000,
+                "p95_ms": percentil(latencias, 95) * 1000,
+                "p99_ms": percentil(latencias, 99) * 1000,
+                "rps": len(latencias) / duracion,
+            })
+        return filas
+
+
+def percentil(valores: List[float], p: int) -> float:
+    if len(valores) == 1:
+        return valores[0]
+    return statistics.quantiles(valores, n=100, method="inclusive")[p - 1]
+
+
+class Carga:
+    """Ejecuta los escenarios contra una URL base con un AsyncClient compartido"""
+
+    def __init__(self, cliente: httpx.AsyncClient, usuarios: int, duracion: float, semilla: int, denegar: float = 0.0):
+        self.cliente = cliente
+        self.usuarios = usuarios
+        self.duracion = duracion
+        self.denegar = denegar
+        self.rnd = random.Random(semilla)
+        self.mecanicos: List[int] = []
+        self.quincenas: List[str] = []
+        self.total_trabajos = 0
+
+    async def pedir(self, resultados: Resultados, metodo: str, endpoint: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        inicio = time.perf_counter()
+        try:
+            respuesta = await self.cliente.request(metodo, url, **kwargs)
+            ok = respuesta.status_code < 400
+        except httpx.HTTPError:
+            respuesta, ok = None, False
+        resultados.registrar(f"{metodo} {endpoint}", time.perf_counter() - inicio, ok)
+        return respuesta
+
+    async def preparar(self) -> None:
+        """Obtiene mecánicos, quincenas y cantidad de trabajos para armar las peticiones"""
+        mecanicos = (await self.cliente.get("/api/mecanicos/", params={"limit": 1000})).json()
+        self.mecanicos = [m["id"] for m in mecanicos]
+        totales = (await self.cliente.get("/api/reportes/totales")).json()
+        self.total_trabajos = totales["total_trabajos"]
+        comisiones = (await self.cliente.get("/api/mecanicos/todas-comisiones/")).json()
+        self.quincenas = sorted({c["quincena"] for c in comisiones if c.get("quincena")})
+
+    async def ejecutar(self, escenario: str) -> Resultados:
+        resultados = Resultados()
+        usuario = getattr(self, f"usuario_{escenario}")
+        resultados.inicio = time.perf_counter()
+        limite = resultados.inicio + self.duracion
+        await asyncio.gather(*(usuario(resultados, limite, n) for n in range(self.usuarios)))
+        resultados.fin = time.perf_counter()
+        return resultados
+
+    # ========================================
+    # ESCENARIOS
+    # ========================================
+
+    async def usuario_dashboard(self, resultados: Resultados, limite: float, n: int) -> None:
+        while time.perf_counter() < limite:
+            # Inicio (dashboard-content): llamadas secuenciales
+            for ruta in ("/clientes/", "/carros/", "/trabajos/"):
+                await self.pedir(resultados, "GET", ruta, f"/api{ruta}")
+
+            # Reportes: llamadas en paralelo
+            await asyncio.gather(
+                self.pedir(resultados, "GET", "/trabajos", "/api/trabajos"),
+                self.pedir(resultados, "GET", "/gastos-taller?estado=PAGADO", "/api/gastos-taller", params={"estado": "PAGADO"}),
+                self.pedir(resultados, "GET", "/pagos-salarios", "/api/pagos-salarios"),
+                self.pedir(resultados, "GET", "/detalles-gastos", "/api/detalles-gastos"),
+                self.pedir(resultados, "GET", "/mecanicos/todas-comisiones", "/api/mecanicos/todas-comisiones/"),
+                *(self.pedir(resultados, "GET", "/mecanicos/{id}/estadisticas", f"/api/mecanicos/{m}/estadisticas")
+                  for m in self.mecanicos),
+            )
+
+            # Taller y mecánicos
+            for ruta in ("/gastos-taller", "/pagos-salarios", "/mecanicos"):
+                await self.pedir(resultados, "GET", ruta, f"/api{ruta}")
+            await asyncio.sleep(self.rnd.uniform(0.5, 2.0))
+
+    async def usuario_aprobaciones(self, resultados: Resultados, limite: float, n: int) -> None:
+        if not self.mecanicos or not self.quincenas:
+            return
+        while time.perf_counter() < limite:
+            quincena = self.rnd.choice(self.quincenas[-4:])
+            aprobar = self.rnd.random() >= self.denegar
+            if n % 5 == 0:
+                # Un usuario de cada cinco usa la aprobación en lote
+                await self.pedir(
+                    resultados, "POST", "/mecanicos/comisiones/quincenas/estado",
+                    "/api/mecanicos/comisiones/quincenas/estado",
+                    json={"quincenas": [quincena], "aprobar": aprobar},
+                )
+            else:
+                mecanico = self.rnd.choice(self.mecanicos)
+                await self.pedir(
+                    resultados, "POST", "/mecanicos/{id}/comisiones/quincena/{quincena}/estado",
+                    f"/api/mecanicos/{mecanico}/comisiones/quincena/{quincena}/estado",
+                    json={"aprobar": aprobar},
+                )
+                await self.pedir(
+                    resultados, "GET", "/mecanicos/{id}/comisiones/quincena/{quincena}",
+                    f"/api/mecanicos/{mecanico}/comisiones/quincena/{quincena}",
+                )
+            await asyncio.sleep(self.rnd.uniform(0.0, 0.2))
+
+    async def usuario_facturas(self, resultados: Resultados, limite: float, n: int) -> None:
+        if not self.total_trabajos:
+            return
+        while time.perf_counter() < limite:
+            # Ráfaga: varias facturas a la vez y luego una pausa
+            ids = [self.rnd.randint(1, self.total_trabajos) for _ in range(self.rnd.randint(3, 8))]
+            await asyncio.gather(*(
+                self.pedir(resultados, "GET", "/trabajos/{id}/factura", f"/api/trabajos/{i}/factura")
+                for i in ids
+            ))
+            await asyncio.sleep(self.rnd.uniform(1.0, 3.0))
+
+
+# ========================================
+# SERVIDOR LOCAL
+# ========================================
+
+def iniciar_servidor(puerto: int, workers: int) -> subprocess.Popen:
+    comando = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(puerto), "--workers", str(workers),
+               "--log-level", "warning"]
+    return subprocess.Popen(comando, cwd=RAIZ_PROYECTO, env=os.environ.copy())
+
+
+async def esperar_servidor(url: str, proceso: Optional[subprocess.Popen], espera: float = 30.0) -> None:
+    limite = time.perf_counter() + espera
+    async with httpx.AsyncClient(base_url=url) as cliente:
+        while time.perf_counter() < limite:
+            if proceso is not None and proceso.poll() is not None:
+                raise RuntimeError("uvicorn terminó antes de aceptar conexiones")
+            try:
+                await cliente.get("/metrics")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"El servidor no respondió en {espera:.0f} s")
+
+
+def imprimir(escenario: str, filas: List[dict]) -> None:
+    print(f"\n=== {escenario} ===")
+    print(f"{'endpoint':<62} {'peticiones':>10} {'errores':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8}")
+    for f in filas:
+        print(f"{f['endpoint']:<62} {f['peticiones']:>10} {f['errores']:>8} "
+              f"{f['p50_ms']:>9.1f} {f['p95_ms']:>9.1f} {f['p99_ms']:>9.1f} {f['rps']:>8.1f}")
+    total = sum(f["rps"] for f in filas)
+    print(f"{'TOTAL':<62} {sum(f['peticiones'] for f in filas):>10} {sum(f['errores'] for f in filas):>8} "
+          f"{'':>9} {'':>9} {'':>9} {total:>8.1f}")
+
+
+async def principal(args) -> Dict[str, List[dict]]:
+    proceso = iniciar_servidor(args.puerto, args.workers) if args.iniciar_servidor else None
+    url = f"http://127.0.0.1:{args.puerto}" if args.iniciar_servidor else args.url
+    try:
+        await esperar_servidor(url, proceso)
+        limites = httpx.Limits(max_connections=args.usuarios * 8, max_keepalive_connections=args.usuarios * 8)
+        # Como el navegador, se siguen las redirecciones (ej: /api/trabajos -> /api/trabajos/)
+        async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limites, follow_redirects=True) as cliente:
+            carga = Carga(cliente, args.usuarios, args.duracion, args.semilla, args.denegar)
+            await carga.preparar()
+            reporte = {}
+            for escenario in args.escenarios:
+                reporte[escenario] = (await carga.ejecutar(escenario)).resumen()
+                imprimir(escenario, reporte[escenario])
+            return reporte
+    finally:
+        if proceso is not None:
+            proceso.terminate()
+            proceso.wait(timeout=10)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Pruebas de carga por escenarios del backend Auto Andrade")
+    parser.add_argument("--url", default="http://localhost:8000", help="URL del backend (sin /api)")
+    parser.add_argument("--iniciar-servidor", action="store_true", help="Inicia uvicorn localmente (usa DATABASE_URL)")
+    parser.add_argument("--puerto", type=int, default=8765, help="Puerto de uvicorn con --iniciar-servidor")
+    parser.add_argument("--workers", type=int, default=1, help="Workers de uvicorn con --iniciar-servidor")
+    parser.add_argument("--escenarios", default=",".join(ESCENARIOS),
+                        type=lambda valor: [e.strip() for e in valor.split(",") if e.strip()])
+    parser.add_argument("--usuarios", type=int, default=10, help="Usuarios virtuales concurrentes por escenario")
+    parser.add_argument("--duracion", type=float, default=30.0, help="Segundos por escenario")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Timeout por petición en segundos")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--denegar", type=float, default=0.0,
+                        help="Proporción de comisiones denegadas en el escenario de aprobaciones (0 a 1)")
+    parser.add_argument("--json", type=Path, default=None, help="Guarda el reporte en un archivo JSON")
+    args = parser.parse_args(argv)
+
+    desconocidos = set(args.escenarios) - set(ESCENARIOS)
+    if desconocidos:
+        parser.error(f"Escenarios desconocidos: {', '.join(sorted(desconocidos))}")
+
+    reporte = asyncio.run(principal(args))
+    if args.json:
+        args.json.write_text(json.dumps(reporte, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Fixtures de los benchmarks: una base con datos sintéticos por escala y un
+cliente HTTP de la aplicación conectado a ella.
+
+Las bases SQLite se guardan en la caché de pytest (.pytest_cache) y se
+reutilizan entre ejecuciones mientras no cambie el esquema de los modelos; con --benchmark-db se usa una base existente por
+escala (se llena solo si está vacía).
+"""
+import gc
+import hashlib
+import logging
+import statistics
+import time
+import tracemalloc
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.metricas import registro
+from app.datos_sinteticos import ParametrosGeneracion, generar_datos
+from app.models.clientes import Cliente
+from plugin_linea_base import comparar_con_linea_base
+
+
+# Tiempo aproximado de medición por benchmark; las rutas lentas se miden menos veces
+SEGUNDOS_POR_BENCHMARK = 5.0
+# Endpoint sin trabajo de la aplicación: la latencia se guarda como proporción de la suya
+RUTA_REFERENCIA = "/"
+# Peticiones de referencia antes de cada ronda del benchmark
+REFERENCIAS_POR_RONDA = 10
+
+
+def _rondas(duracion: float) -> int:
+    return max(1, min(20, int(SEGUNDOS_POR_BENCHMARK / max(duracion, 1e-3))))
+
+
+class Referencia:
+    """
+    Latencia de RUTA_REFERENCIA intercalada con las rondas del benchmark: la
+    referencia y el endpoint se miden bajo la misma carga de la máquina, y la
+    proporción entre ambos no depende de lo rápida o lo ocupada que esté.
+    """
+
+    def __init__(self, cliente):
+        self.cliente = cliente
+        self.duraciones = []
+
+    def medir(self) -> None:
+        # Sin la basura de la ronda anterior, que no es costo de la referencia
+        gc.collect()
+        for _ in range(REFERENCIAS_POR_RONDA):
+            inicio = time.perf_counter()
+            self.cliente.get(RUTA_REFERENCIA)
+            self.duraciones.append(time.perf_counter() - inicio)
+
+    def mediana_ms(self) -> float:
+        return statistics.median(self.duraciones) * 1000
+
+
+def _huella_esquema() -> str:
+    from app.models.database import Base
+
+    columnas = sorted(f"{t.name}.{c.name}" for t in Base.metadata.tables.values() for c in t.columns)
+    return hashlib.sha1(",".join(columnas).encode("utf-8")).hexdigest()[:8]
+
+
+@pytest.fixture(scope="session")
+def _engines(request):
+    engines = {}
+    yield engines
+    for engine in engines.values():
+        engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def escala(request, _engines):
+    """Cantidad de trabajos de la base; crea y llena la base la primera vez"""
+    cantidad = request.param
+    if cantidad not in _engines:
+        plantilla = request.config.getoption("benchmark_db")
+        if plantilla:
+            url = plantilla.format(escala=cantidad)
+        else:
+            carpeta = request.config.cache.mkdir("datos_benchmark")
+            url = f"sqlite:///{carpeta / f'trabajos_{cantidad}_{_huella_esquema()}.db'}"
+
+        connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+        engine = create_engine(url, connect_args=connect_args)
+        from app.models.database import Base
+        Base.metadata.create_all(engine)
+        with engine.connect() as conn:
+            vacia = not conn.execute(select(func.count()).select_from(Cliente.__table__)).scalar()
+        if vacia:
+            generar_datos(engine, ParametrosGeneracion(trabajos=cantidad))
+        _engines[cantidad] = engine
+    return cantidad
+
+
+@pytest.fixture
+def _aplicacion_benchmark(aplicacion):
+    """
+    Aplicación sin la instrumentación SQL de desarrollo, sin logs de depuración y
+    sin caché de respuestas (se mide el costo real de cada endpoint). Se restaura
+    al terminar cada benchmark: las pruebas que corren después (caché,
+    instrumentación) necesitan la configuración normal.
+    """
+    from app.core import config
+    from app.core.instrumentacion_sql import (
+        desinstalar_instrumentacion, instalar_instrumentacion, instrumentacion_instalada,
+    )
+
+    logger_app = logging.getLogger("app")
+    nivel = logger_app.level
+    cache_activa = config.CACHE_RESPUESTAS
+    instrumentacion_activa = instrumentacion_instalada()
+    desinstalar_instrumentacion()
+    logger_app.setLevel(logging.INFO)
+    config.CACHE_RESPUESTAS = False
+    yield aplicacion
+    config.CACHE_RESPUESTAS = cache_activa
+    logger_app.setLevel(nivel)
+    if instrumentacion_activa:
+        instalar_instrumentacion()
+
+
+@pytest.fixture
+def cliente_benchmark(_aplicacion_benchmark, escala, _engines):
+    from fastapi.testclient import TestClient
+    from app.models.database import get_db, get_read_db
+
+    Sesion = sessionmaker(bind=_engines[escala], autocommit=False, autoflush=False)
+    # Como get_read_db: AUTOCOMMIT, sin autoflush ni expiración al confirmar
+    SesionLectura = sessionmaker(
+        bind=_engines[escala].execution_options(isolation_level="AUTOCOMMIT"), autoflush=False, expire_on_commit=False,
+    )
+
+    def get_db_benchmark():
+        db = Sesion()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def get_read_db_benchmark():
+        db = SesionLectura()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    _aplicacion_benchmark.dependency_overrides[get_db] = get_db_benchmark
+    _aplicacion_benchmark.dependency_overrides[get_read_db] = get_read_db_benchmark
+    try:
+        # Sin compresión: se mide el costo del endpoint; la compresión se mide en test_compresion.py
+        with TestClient(_aplicacion_benchmark, headers={"Accept-Encoding": "identity"}) as cliente:
+            yield cliente
+    finally:
+        _aplicacion_benchmark.dependency_overrides.pop(get_db, None)
+        _aplicacion_benchmark.dependency_overrides.pop(get_read_db, None)
+
+
+@pytest.fixture
+def medir_endpoint(request, benchmark, cliente_benchmark, escala):
+    """
+    Mide un GET: latencia con pytest-benchmark (y su proporción respecto a
+    RUTA_REFERENCIA), y consultas SQL y memoria pico (tracemalloc) en una petición
+    aparte; luego compara con la línea base.
+    """
+    def medir(ruta: str) -> None:
+        consultas = []
+
+        def observar(metodo, ruta_plantilla, estado, duracion, stats):
+            consultas.append(stats.consultas)
+
+        # Peticiones de calentamiento: las importaciones y cachés de la primera llamada no cuentan
+        cliente_benchmark.get(RUTA_REFERENCIA)
+        cliente_benchmark.get(ruta)
+
+        registro.observadores.append(observar)
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        try:
+            respuesta = cliente_benchmark.get(ruta)
+            duracion = time.perf_counter() - inicio
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            registro.observadores.remove(observar)
+        assert respuesta.status_code == 200, respuesta.text
+
+        benchmark.extra_info.update({"consultas": consultas[0], "memoria_pico_kb": pico / 1024})
+        referencia = Referencia(cliente_benchmark)
+        benchmark.pedantic(cliente_benchmark.get, args=(ruta,), setup=referencia.medir,
+                           rounds=_rondas(duracion), iterations=1)
+
+        mediana = benchmark.stats.stats.median * 1000 if benchmark.stats else None
+        referencia = referencia.mediana_ms()
+        comparar_con_linea_base(request.config, f"GET {ruta} @{escala}", {
+            "mediana_ms": mediana,
+            "referencia_ms": round(referencia, 3),
+            "mediana_relativa": round(mediana / referencia, 2) if mediana is not None else None,
+            "consultas": consultas[0],
+            "memoria_pico_kb": round(pico / 1024, 1),
+        })
+
+    return medir
@@ -0,0 +1,49 @@
+"""
+Bytes enviados y costo de CPU de la compresión de los listados grandes.
+
+Para cada listado se obtiene el JSON sin comprimir y se mide con
+pytest-benchmark el tiempo de comprimirlo con cada codificación y nivel; en
+extra_info quedan los bytes antes y después. Brotli se omite si no está
+instalado.
+
+    python -m pytest tests/benchmarks/test_compresion.py --benchmarks --escalas=1000 --benchmark-group-by=group
+"""
+import pytest
+
+from app.core.compresion import Compresor, brotli
+
+RUTAS = ["/api/trabajos/", "/api/clientes/", "/api/trabajos/?fields=id,fecha,descripcion,costo,cliente_nombre"]
+
+CODIFICACIONES = {
+    "gzip-1": ("gzip", {"nivel_gzip": 1}),
+    "gzip-6": ("gzip", {"nivel_gzip": 6}),
+    "br-4": ("br", {"calidad_brotli": 4}),
+    "br-6": ("br", {"calidad_brotli": 6}),
+}
+
+
+@pytest.mark.parametrize("nombre", list(CODIFICACIONES))
+@pytest.mark.parametrize("ruta", RUTAS)
+def test_compresion_de_listado(benchmark, cliente_benchmark, ruta, nombre):
+    codificacion, parametros = CODIFICACIONES[nombre]
+    if codificacion == "br" and brotli is None:
+        pytest.skip("brotli no está instalado")
+    cuerpo = cliente_benchmark.get(ruta).content
+    benchmark.group = ruta
+
+    comprimido = benchmark(lambda: Compresor(codificacion, **parametros).todo(cuerpo))
+    benchmark.extra_info.update({
+        "bytes_json": len(cuerpo),
+        "bytes_comprimidos": len(comprimido),
+        "proporcion": round(len(comprimido) / len(cuerpo), 3),
+    })
+    # JSON repetitivo: comprimido ocupa menos de una quinta parte
+    assert len(comprimido) < len(cuerpo) / 5
+
+
+def test_respuesta_comprimida_de_punta_a_punta(cliente_benchmark):
+    original = cliente_benchmark.get("/api/trabajos/")
+    respuesta = cliente_benchmark.get("/api/trabajos/", headers={"Accept-Encoding": "gzip"})
+    assert respuesta.headers["content-encoding"] == "gzip"
+    assert int(respuesta.headers["content-length"]) < len(original.content) / 5
+    assert respuesta.content == original.content
@@ -0,0 +1,23 @@
+import pytest
+
+LISTADOS = [
+    "/api/trabajos/",
+    "/api/trabajos/?fields=id,fecha,descripcion,costo,cliente_nombre,total_mecanicos",
+    "/api/clientes/",
+    "/api/carros/",
+    "/api/detalles-gastos",
+    "/api/trabajos/comisiones/quincena/2025-Q1",
+    "/api/mecanicos/",
+    "/api/mecanicos/todas-comisiones/",
+    "/api/reportes/totales",
+    "/api/reportes/mensual/6/2025",
+    "/api/gastos-taller/",
+    "/api/gastos-taller/estadisticas/resumen",
+    "/api/pagos-salarios/",
+    "/api/pagos-salarios/estadisticas/resumen",
+]
+
+
+@pytest.mark.parametrize("ruta", LISTADOS)
+def test_listado(medir_endpoint, ruta):
+    medir_endpoint(ruta)
@@ -0,0 +1,125 @@
+"""
+Modelo de lectura (app.services.lecturas) contra el camino del ORM.
+
+Cada listado se construye de dos formas sobre la misma base: hidratando
+entidades con db.query(...).all() y copiándolas a dicts, como lo hacían los
+endpoints (sin las consultas por fila, para medir solo la hidratación), y con
+el select() de columnas del modelo de lectura. Las dos salidas deben ser
+iguales.
+
+pytest-benchmark mide el tiempo de cada camino (agrupados por listado) y en
+extra_info queda la memoria pico (tracemalloc); la prueba del modelo de
+lectura falla si usa más memoria que el ORM.
+
+    python -m pytest tests/benchmarks/test_modelo_lectura.py --benchmarks --benchmark-group-by=group
+"""
+import tracemalloc
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.models.carros import Carro
+from app.models.clientes import Cliente
+from app.models.comisiones_mecanicos import ComisionMecanico
+from app.models.detalle_gastos import DetalleGasto
+from app.services import lecturas
+
+
+def _orm_detalles_gastos(db):
+    return [
+        {
+            "id": d.id,
+            "id_trabajo": d.id_trabajo,
+            "descripcion": d.descripcion,
+            "monto": d.monto,
+            "monto_cobrado": d.monto_cobrado if d.monto_cobrado else None,
+        }
+        for d in db.query(DetalleGasto).order_by(DetalleGasto.id).all()
+    ]
+
+
+def _orm_todas_comisiones(db):
+    return [
+        {
+            "id": c.id,
+            "id_trabajo": c.id_trabajo,
+            "id_mecanico": c.id_mecanico,
+            "ganancia_trabajo": c.ganancia_trabajo,
+            "porcentaje_comisi": c.porcentaje_comision,
+            "monto_comision": c.monto_comision,
+            "fecha_calculo": c.fecha_calculo.isoformat(),
+            "mes_reporte": c.mes_reporte,
+            "estado_comision": c.estado_comision,
+            "quincena": c.quincena,
+        }
+        for c in db.query(ComisionMecanico).order_by(ComisionMecanico.id).all()
+    ]
+
+
+def _orm_carros(db):
+    filas = (
+        db.query(Carro, Cliente)
+        .outerjoin(Cliente, Cliente.id == Carro.id_cliente)
+        .order_by(Carro.matricula)
+        .all()
+    )
+    return [
+        {
+            "id": carro.id,
+            "matricula": carro.matricula,
+            "marca": carro.marca,
+            "modelo": carro.modelo,
+            "anio": carro.anio,
+            "id_cliente_actual": cliente.id_nacional if cliente else None,
+            "nombre_cliente": f"{cliente.nombre} {cliente.apellido}".strip() if cliente else "Sin propietario",
+        }
+        for carro, cliente in filas
+    ]
+
+
+CAMINOS = {
+    "detalles_gastos": {"orm": _orm_detalles_gastos, "lecturas": lecturas.detalles_gastos},
+    "todas_comisiones": {"orm": _orm_todas_comisiones, "lecturas": lecturas.todas_comisiones},
+    "carros": {"orm": _orm_carros, "lecturas": lecturas.carros},
+}
+
+
+@pytest.fixture
+def sesiones(escala, _engines):
+    return sessionmaker(bind=_engines[escala], autocommit=False, autoflush=False)
+
+
+def _ejecutar(sesiones, funcion):
+    # Una sesión por llamada, como en cada petición: el identity map empieza vacío
+    db = sesiones()
+    try:
+        return funcion(db)
+    finally:
+        db.close()
+
+
+def _memoria_pico_kb(sesiones, funcion) -> float:
+    tracemalloc.start()
+    try:
+        _ejecutar(sesiones, funcion)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(pico / 1024, 1)
+
+
+@pytest.mark.parametrize("camino", ["orm", "lecturas"])
+@pytest.mark.parametrize("listado", sorted(CAMINOS))
+def test_lectura_contra_orm(benchmark, sesiones, listado, camino):
+    funcion = CAMINOS[listado][camino]
+    benchmark.group = listado
+
+    resultado = _ejecutar(sesiones, funcion)
+    assert resultado == _ejecutar(sesiones, CAMINOS[listado]["orm"])
+
+    memoria = _memoria_pico_kb(sesiones, funcion)
+    benchmark.extra_info.update({"filas": len(resultado), "memoria_pico_kb": memoria})
+    benchmark.pedantic(_ejecutar, args=(sesiones, funcion), rounds=5, iterations=1)
+
+    if camino == "lecturas" and resultado:
+        assert memoria < _memoria_pico_kb(sesiones, CAMINOS[listado]["orm"])
@@ -0,0 +1,61 @@
+"""
+Configuración compartida de pytest.
+
+Las pruebas usan una base SQLite temporal en lugar de MySQL (vía DATABASE_URL),
+por lo que deben ejecutarse desde la raíz del proyecto: python -m pytest
+"""
+import os
+import tempfile
+
+_db_pruebas = os.path.join(tempfile.mkdtemp(prefix="auto_andrade_"), "pruebas.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_pruebas}")
+# Herramientas de desarrollo que están desactivadas por defecto
+os.environ.setdefault("SQL_INSTRUMENTACION", "1")
+os.environ.setdefault("PERFILADOR", "1")
+
+import pytest
+
+pytest_plugins = ["plugin_presupuesto_consultas", "plugin_linea_base"]
+
+
+@pytest.fixture(scope="session")
+def aplicacion():
+    """Aplicación FastAPI con las tablas creadas en la base de pruebas"""
+    import app.models  # noqa: F401 - registra todos los modelos en Base.metadata
+    from app.core.contadores import reconciliar
+    from app.main import app as aplicacion_fastapi
+    from app.models.database import Base, engine
+
+    Base.metadata.create_all(engine)
+    reconciliar(engine)
+    return aplicacion_fastapi
+
+
+@pytest.fixture
+def cliente_http(aplicacion):
+    from fastapi.testclient import TestClient
+
+    with TestClient(aplicacion) as cliente:
+        yield cliente
+
+
+@pytest.fixture
+def db(aplicacion):
+    """Sesión de base de datos; al terminar la prueba se vacían todas las tablas"""
+    from app.core.cache import cache
+    from app.core.contadores import reconciliar
+    from app.models.database import Base, SessionLocal, engine
+    from app.services.estado_resultados import periodos_consolidados
+
+    sesion = SessionLocal()
+    try:
+        yield sesion
+    finally:
+        sesion.close()
+        with engine.begin() as conn:
+            for tabla in reversed(Base.metadata.sorted_tables):
+                conn.execute(tabla.delete())
+        # Contadores en cero, como después de migracion_contadores.sql en una base vacía
+        reconciliar(engine)
+        cache.limpiar()
+        periodos_consolidados.limpiar()
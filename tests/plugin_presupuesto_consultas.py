@@ -0,0 +1,70 @@
+"""
+Plugin de pytest: presupuesto de consultas SQL por endpoint.
+
+Falla la prueba si alguna petición hecha durante ella ejecuta más consultas
+SQL que las permitidas:
+
+    @pytest.mark.presupuesto_consultas(5)
+    def test_listado(cliente_http): ...
+
+    @pytest.mark.presupuesto_consultas(20, por_ruta={"GET /api/trabajos/": 3})
+    def test_flujo(cliente_http): ...
+
+Con --presupuesto-consultas=N se aplica un presupuesto por defecto a todas las
+pruebas que no tengan la marca.
+"""
+import pytest
+
+from app.core.metricas import registro
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--presupuesto-consultas",
+        type=int,
+        default=None,
+        help="Máximo de consultas SQL por petición para las pruebas sin marca presupuesto_consultas",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "presupuesto_consultas(maximo, por_ruta=None): máximo de consultas SQL por petición, "
+        "opcionalmente por ruta ('GET /api/trabajos/')",
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    marca = item.get_closest_marker("presupuesto_consultas")
+    if marca is not None:
+        maximo = marca.args[0] if marca.args else None
+        por_ruta = marca.kwargs.get("por_ruta") or {}
+    else:
+        maximo = item.config.getoption("presupuesto_consultas")
+        por_ruta = {}
+
+    if maximo is None and not por_ruta:
+        return (yield)
+
+    peticiones = []
+
+    def observar(metodo, ruta, estado, duracion, stats):
+        peticiones.append((f"{metodo} {ruta}", stats.consultas))
+
+    registro.observadores.append(observar)
+    try:
+        resultado = yield
+    finally:
+        registro.observadores.remove(observar)
+
+    excedidas = []
+    for endpoint, consultas in peticiones:
+        limite = por_ruta.get(endpoint, maximo)
+        if limite is not None and consultas > limite:
+            excedidas.append(f"{endpoint}: {consultas} consultas (presupuesto {limite})")
+
+    if excedidas:
+        pytest.fail("Presupuesto de consultas SQL excedido:\n" + "\n".join(excedidas), pytrace=False)
+    return resultado
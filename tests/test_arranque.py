@@ -0,0 +1,39 @@
+import json
+import os
+import subprocess
+import sys
+
+# Tiempo máximo de importación de app.main en un proceso nuevo (arranque de cada worker)
+PRESUPUESTO_SEGUNDOS = float(os.getenv("ARRANQUE_PRESUPUESTO_SEGUNDOS", "2.0"))
+
+# Subsistemas pesados que se cargan recién en el primer uso
+MODULOS_DIFERIDOS = ("weasyprint",)
+
+_MEDICION = """
+import json, sys, time
+inicio = time.perf_counter()
+import app.main
+print(json.dumps({"segundos": time.perf_counter() - inicio, "modulos": sorted(sys.modules)}))
+"""
+
+
+def _medir_arranque():
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    salida = subprocess.run(
+        [sys.executable, "-c", _MEDICION], cwd=raiz, env=os.environ.copy(),
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def test_arranque_sin_dependencias_pesadas_y_dentro_del_presupuesto():
+    # La primera importación compila los .pyc; se mide la segunda
+    _medir_arranque()
+    medicion = _medir_arranque()
+
+    cargados = [m for m in MODULOS_DIFERIDOS if m in medicion["modulos"]]
+    assert cargados == [], f"módulos pesados importados al arrancar: {cargados}"
+    assert medicion["segundos"] < PRESUPUESTO_SEGUNDOS, (
+        f"app.main tarda {medicion['segundos']:.2f} s en importarse (presupuesto {PRESUPUESTO_SEGUNDOS} s); "
+        "revisar con: python -X importtime -c 'import app.main'"
+    )
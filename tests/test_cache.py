@@ -0,0 +1,108 @@
+import time
+
+import pytest
+from sqlalchemy import text
+
+from app.core.cache import (
+    CacheRespuestas, VersionesTablas, cache, configurar_cache_compartida, detener_cache_compartida, versiones,
+)
+from app.core.cache_compartida import CacheCompartida, crear_cliente
+from app.core.contadores import reconciliar_tabla
+from app.models.database import engine
+from app.models.clientes import Cliente
+from app.models.comisiones_mecanicos import ComisionMecanico
+
+
+def test_respuesta_cacheada_hasta_que_cambia_una_tabla(cliente_http, db):
+    aciertos = cache.aciertos
+    assert cliente_http.get("/api/reportes/totales").json()["total_clientes"] == 0
+    assert cliente_http.get("/api/reportes/totales").json()["total_clientes"] == 0
+    assert cache.aciertos == aciertos + 1
+
+    respuesta = cliente_http.post("/api/clientes/", json={"id_nacional": "101", "nombre": "Ana", "apellido": "Mora"})
+    assert respuesta.status_code == 200
+    assert cliente_http.get("/api/reportes/totales").json()["total_clientes"] == 1
+
+
+def test_rollback_no_invalida(db):
+    antes = versiones.obtener(["clientes"])
+    db.add(Cliente(id_nacional="102", nombre="Luis"))
+    db.flush()
+    db.rollback()
+    assert versiones.obtener(["clientes"]) == antes
+
+
+def test_escrituras_masivas_y_text_invalidan(db):
+    antes = versiones.obtener(["comisiones_mecanicos", "carros"])
+    db.query(ComisionMecanico).filter(ComisionMecanico.id == -1).update({"quincena": "2025-Q1"}, synchronize_session=False)
+    db.execute(text("UPDATE carros SET marca = 'X' WHERE matricula = 'NADA'"))
+    db.commit()
+    despues = versiones.obtener(["comisiones_mecanicos", "carros"])
+    assert all(d == a + 1 for a, d in zip(antes, despues))
+
+
+def test_eliminar_invalida_tablas_en_cascada(db):
+    db.add(Cliente(id_nacional="103", nombre="Sofía"))
+    db.commit()
+    antes = versiones.obtener(["carros", "historial_duenos"])
+    db.delete(db.query(Cliente).filter_by(id_nacional="103").one())
+    db.commit()
+    assert versiones.obtener(["carros", "historial_duenos"]) > antes
+
+
+def test_lru_acotada():
+    lru = CacheRespuestas(max_entradas=2)
+    lru.guardar("a", (0,), 1)
+    lru.guardar("b", (0,), 2)
+    lru.obtener("a", (0,))
+    lru.guardar("c", (0,), 3)
+    assert lru.obtener("b", (0,)) == (False, None)
+    assert lru.obtener("a", (0,)) == (True, 1)
+    assert lru.obtener("a", (1,)) == (False, None)
+
+
+def _esperar(condicion, segundos=5.0):
+    limite = time.monotonic() + segundos
+    while not condicion():
+        assert time.monotonic() < limite, "la condición no se cumplió a tiempo"
+        time.sleep(0.01)
+
+
+def test_canal_de_invalidacion_entre_workers():
+    fakeredis = pytest.importorskip("fakeredis")
+    servidor = fakeredis.FakeServer()
+    worker_a = CacheCompartida(fakeredis.FakeRedis(server=servidor), prefijo="prueba")
+    worker_b = CacheCompartida(fakeredis.FakeRedis(server=servidor), prefijo="prueba")
+    versiones_a = VersionesTablas()
+    worker_a.escuchar(versiones_a.actualizar)
+    try:
+        _esperar(lambda: worker_a.cliente.pubsub_numsub(worker_a.canal)[0][1] == 1)
+        worker_b.incrementar(["clientes", "carros"])
+        _esperar(lambda: versiones_a.obtener(["clientes", "carros"]) == (1, 1))
+
+        worker_b.guardar("clave", (1,), {"total": 3})
+        assert worker_a.obtener("clave", (1,)) == (True, {"total": 3})
+        assert worker_a.obtener("clave", (2,)) == (False, None)
+    finally:
+        worker_a.detener()
+
+
+def test_escritura_en_otro_worker_invalida_respuesta(cliente_http, db):
+    pytest.importorskip("fakeredis")
+    compartida = configurar_cache_compartida("fakeredis://")
+    try:
+        _esperar(lambda: compartida.cliente.pubsub_numsub(compartida.canal)[0][1] == 1)
+        assert cliente_http.get("/api/reportes/totales").json()["total_clientes"] == 0
+
+        # Otro worker inserta y publica la invalidación; este proceso no ve la escritura en su sesión
+        with engine.begin() as conn:
+            conn.execute(Cliente.__table__.insert().values(id_nacional="104", nombre="Eva"))
+            reconciliar_tabla(conn, "clientes")
+        otro_worker = CacheCompartida(crear_cliente("fakeredis://"), prefijo=compartida.clave_versiones.split(":")[0])
+        antes = versiones.obtener(["clientes"])
+        otro_worker.incrementar(["clientes"])
+        _esperar(lambda: versiones.obtener(["clientes"]) > antes)
+
+        assert cliente_http.get("/api/reportes/totales").json()["total_clientes"] == 1
+    finally:
+        detener_cache_compartida()
@@ -0,0 +1,24 @@
+from datetime import datetime
+from decimal import Decimal
+
+from app.models.trabajos import Trabajo
+
+
+def test_cambio_de_matricula_conserva_trabajos_e_historial(cliente_http, db):
+    cliente_http.post("/api/clientes/", json={"id_nacional": "333", "nombre": "Leo", "apellido": "Paz"})
+    carro = cliente_http.post("/api/carros/", json={
+        "matricula": "MAT001", "marca": "Kia", "modelo": "Rio", "anio": 2020, "id_cliente_actual": "333",
+    }).json()["carro"]
+    db.add(Trabajo(id_carro=carro["id"], descripcion="Aceite", fecha=datetime(2025, 5, 2), costo=Decimal("80.00")))
+    db.commit()
+
+    respuesta = cliente_http.put("/api/carros/MAT001", json={
+        "matricula": "MAT002", "marca": "Kia", "modelo": "Rio", "anio": 2020, "id_cliente_actual": "333",
+    })
+    assert respuesta.status_code == 200
+
+    historial = cliente_http.get("/api/carros/historial/MAT002").json()
+    assert [t["descripcion"] for t in historial["historial_trabajos"]] == ["Aceite"]
+    assert [d["id_cliente"] for d in historial["historial_duenos"]] == ["333"]
+    assert cliente_http.get("/api/trabajos/", params={"fields": "matricula_carro"}).json() == [{"matricula_carro": "MAT002"}]
+    assert cliente_http.get("/api/carros/historial/MAT001").status_code == 404
@@ -0,0 +1,124 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+from app.core.cierres import PeriodoCerradoError
+from app.models.carros import Carro
+from app.models.cierres import CierrePeriodo, TipoCierre
+from app.models.clientes import Cliente
+from app.models.comisiones_mecanicos import ComisionMecanico, EstadoComision
+from app.models.database import engine
+from app.models.detalle_gastos import DetalleGasto
+from app.models.gastos_taller import EstadoGasto, GastoTaller
+from app.models.mecanicos import Mecanico
+from app.models.trabajos import Trabajo
+
+
+def _sembrar(db) -> int:
+    carro = Carro(matricula="CRR001", marca="Kia", modelo="Rio", anio=2020,
+                  cliente_actual=Cliente(id_nacional="701", nombre="Olga", apellido="Vega"))
+    mecanico = Mecanico(id_nacional="M701", nombre="Luis")
+    db.add(mecanico)
+    db.flush()
+    trabajo = Trabajo(carro=carro, descripcion="Clutch", fecha=datetime(2025, 1, 10),
+                      costo=Decimal("1000.00"), mano_obra=Decimal("400.00"), markup_repuestos=Decimal("50.00"),
+                      aplica_iva=False)
+    db.add(trabajo)
+    db.flush()
+    db.add(DetalleGasto(id_trabajo=trabajo.id, descripcion="Disco", monto=Decimal("200.00")))
+    db.add(ComisionMecanico(id_trabajo=trabajo.id, id_mecanico=mecanico.id, ganancia_trabajo=Decimal("200.00"),
+                            monto_comision=Decimal("10.00"), mes_reporte="2025-01",
+                            estado_comision=EstadoComision.APROBADA))
+    db.add(GastoTaller(descripcion="Luz", monto=Decimal("50.00"), categoria="Servicios",
+                       fecha_gasto=datetime(2025, 1, 20), estado=EstadoGasto.PAGADO))
+    db.commit()
+    return trabajo.id
+
+
+def test_cerrar_mes_congela_montos(cliente_http, db):
+    _sembrar(db)
+    parametros_mes = {"desde": "2025-01-01", "hasta": "2025-01-31", "granularidad": "mes"}
+    # Reporte en caché antes del cierre: el cierre debe invalidarlo
+    assert cliente_http.get("/api/reportes/estado-resultados", params=parametros_mes).json()["periodos"][0]["cerrado"] is False
+    respuesta = cliente_http.post("/api/cierres/2025-01")
+    assert respuesta.status_code == 201
+    cierre = respuesta.json()
+    assert (cierre["tipo"], cierre["inicio"], cierre["fin"]) == ("MES", "2025-01-01", "2025-01-31")
+    assert (cierre["ingresos"], cierre["costo_repuestos"], cierre["utilidad_neta"]) == (1000.0, 200.0, 390.0)
+    assert cierre["comisiones_mecanicos"] == [
+        {"id_mecanico": cierre["comisiones_mecanicos"][0]["id_mecanico"], "nombre_mecanico": "Luis",
+         "estado_comision": "APROBADA", "cantidad": 1, "total": 10.0},
+    ]
+
+    assert cliente_http.post("/api/cierres/2025-01").status_code == 409
+    assert cliente_http.post(f"/api/cierres/{date.today():%Y-%m}").status_code == 400
+    assert cliente_http.post("/api/cierres/2025-13").status_code == 400
+
+    foto = cliente_http.get("/api/cierres/2025-01")
+    assert foto.status_code == 200 and foto.headers["cache-control"] == "private, max-age=31536000, immutable"
+    assert cliente_http.get("/api/cierres/2025-01", headers={"If-None-Match": foto.headers["etag"]}).status_code == 304
+    assert cliente_http.get("/api/cierres/2025-02").status_code == 404
+
+    resultados = cliente_http.get("/api/reportes/estado-resultados", params=parametros_mes)
+    enero = resultados.json()["periodos"][0]
+    assert enero["cerrado"] and enero["congelado"] and enero["utilidad_neta"] == 390.0
+
+    # Por semana: cerrada solo si el cierre cubre todos sus días
+    semanas = cliente_http.get("/api/reportes/estado-resultados",
+                               params={"desde": "2025-01-06", "hasta": "2025-02-09", "granularidad": "semana"})
+    assert [p["cerrado"] for p in semanas.json()["periodos"]] == [True, True, True, False, False]
+
+
+def test_periodo_cerrado_rechaza_escrituras(cliente_http, db):
+    id_trabajo = _sembrar(db)
+    assert cliente_http.post("/api/cierres/2025-01-Q1").status_code == 201
+
+    # Gasto con fecha dentro de la quincena cerrada
+    gasto = {"descripcion": "Agua", "monto": "20.00", "categoria": "Servicios",
+             "fecha_gasto": "2025-01-05T10:00:00", "estado": "PAGADO"}
+    assert cliente_http.post("/api/gastos-taller/", json=gasto).status_code == 409
+    assert cliente_http.delete(f"/api/trabajos/trabajo/{id_trabajo}").status_code == 409
+
+    # Fuera del periodo cerrado (segunda quincena) sí se puede escribir
+    gasto["fecha_gasto"] = "2025-01-25T10:00:00"
+    assert cliente_http.post("/api/gastos-taller/", json=gasto).status_code == 200
+
+    # Los campos que no forman parte de la foto se pueden editar
+    trabajo = db.get(Trabajo, id_trabajo)
+    trabajo.descripcion = "Clutch y volante"
+    db.commit()
+    trabajo.costo = Decimal("1.00")
+    with pytest.raises(PeriodoCerradoError):
+        db.commit()
+    db.rollback()
+
+
+def test_cierre_de_otro_worker_bloquea_sin_cache_compartida(cliente_http, db):
+    _sembrar(db)
+    gasto = {"descripcion": "Agua", "monto": "20.00", "categoria": "Servicios",
+             "fecha_gasto": "2025-01-05T10:00:00", "estado": "PAGADO"}
+    assert cliente_http.post("/api/gastos-taller/", json=gasto).status_code == 200
+
+    # Cierre insertado por otro proceso: no pasa por las versiones de tabla de este
+    with engine.begin() as conn:
+        conn.execute(CierrePeriodo.__table__.insert().values(
+            periodo="2025-01", tipo=TipoCierre.MES, inicio=date(2025, 1, 1), fin=date(2025, 2, 1)))
+    assert cliente_http.post("/api/gastos-taller/", json=gasto).status_code == 409
+
+
+def test_error_al_leer_cierres_aborta_la_escritura(cliente_http, db):
+    def bloqueo_agotado(conn, cursor, sentencia, parametros, contexto, varias):
+        if "FROM cierres_periodo" in sentencia:
+            raise OperationalError(sentencia, parametros, Exception("Lock wait timeout exceeded"))
+
+    gasto = {"descripcion": "Agua", "monto": "20.00", "categoria": "Servicios",
+             "fecha_gasto": "2025-01-05T10:00:00", "estado": "PAGADO"}
+    event.listen(engine, "before_cursor_execute", bloqueo_agotado)
+    try:
+        assert cliente_http.post("/api/gastos-taller/", json=gasto).status_code == 500
+    finally:
+        event.remove(engine, "before_cursor_execute", bloqueo_agotado)
+    assert db.query(GastoTaller).count() == 0
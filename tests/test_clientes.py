@@ -0,0 +1,26 @@
+import pytest
+
+from app.models.carros import Carro
+from app.models.clientes import Cliente
+from app.models.historial_duenos import HistorialDueno
+
+
+# Cambiar la cédula actualiza solo la fila del cliente: carros e historial apuntan a su id
+@pytest.mark.presupuesto_consultas(5)
+def test_cambio_de_cedula_modifica_una_fila(cliente_http, db):
+    ana = Cliente(id_nacional="111", nombre="Ana", apellido="Mora")
+    carro = Carro(matricula="CED001", marca="Kia", modelo="Rio", anio=2020, cliente_actual=ana)
+    db.add_all([carro, HistorialDueno(carro=carro, cliente=ana)])
+    db.commit()
+    carro_modificado = carro.updated_at
+
+    respuesta = cliente_http.put("/api/clientes/111", json={"id_nacional": "222", "nombre": "Ana", "apellido": "Mora"})
+    assert respuesta.status_code == 200 and respuesta.json()["id"] == ana.id
+
+    db.expire_all()
+    assert (carro.id_cliente, carro.updated_at) == (ana.id, carro_modificado)
+    assert db.query(HistorialDueno).one().id_cliente == ana.id
+    assert cliente_http.get("/api/carros/").json()[0]["id_cliente_actual"] == "222"
+    # Los listados exponen el id con el que /api/sync y /api/eventos identifican las filas
+    assert cliente_http.get("/api/clientes/").json()[0]["id"] == ana.id
+    assert cliente_http.get("/api/carros/").json()[0]["id"] == carro.id
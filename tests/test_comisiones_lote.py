@@ -0,0 +1,72 @@
+from datetime import datetime
+from decimal import Decimal
+
+from app.models.carros import Carro
+from app.models.clientes import Cliente
+from app.models.comisiones_mecanicos import ComisionMecanico, EstadoComision
+from app.models.mecanicos import Mecanico
+from app.models.trabajos import Trabajo
+
+
+def _sembrar(db):
+    # calcular_fechas_quincena usa el mes actual: Q1 son los días 1-15
+    hoy = datetime.now()
+    carro = Carro(matricula="LOT001", marca="Kia", modelo="Rio", anio=2020,
+                  cliente_actual=Cliente(id_nacional="601", nombre="Rita", apellido="Sol"))
+    luis, ana = Mecanico(id_nacional="M601", nombre="Luis"), Mecanico(id_nacional="M602", nombre="Ana")
+    trabajo = Trabajo(carro=carro, descripcion="Frenos", fecha=datetime(hoy.year, hoy.month, 5), costo=Decimal("500.00"))
+    db.add_all([luis, ana, trabajo])
+    db.flush()
+
+    def comision(mecanico, monto, estado=EstadoComision.PENDIENTE):
+        return ComisionMecanico(id_trabajo=trabajo.id, id_mecanico=mecanico.id, ganancia_trabajo=Decimal("100.00"),
+                                monto_comision=Decimal(monto), mes_reporte=f"{hoy:%Y-%m}", estado_comision=estado)
+
+    # Las comisiones nuevas no tienen quincena: se encuentran por la fecha del trabajo
+    pendiente_luis, pendiente_ana = comision(luis, "4.00"), comision(ana, "6.00")
+    aprobada = comision(luis, "9.00", EstadoComision.APROBADA)
+    db.add_all([pendiente_luis, pendiente_ana, aprobada])
+    db.commit()
+    return f"{hoy.year}-Q1", luis.id, (pendiente_luis.id, pendiente_ana.id, aprobada.id)
+
+
+def test_lote_procesa_solo_pendientes_y_asigna_quincena(cliente_http, db):
+    quincena, id_luis, (id_pendiente_luis, id_pendiente_ana, id_aprobada) = _sembrar(db)
+
+    respuesta = cliente_http.post("/api/mecanicos/comisiones/quincenas/estado",
+                                  json={"quincenas": [quincena], "aprobar": True, "mecanicos_ids": [id_luis]})
+    assert respuesta.status_code == 200
+    assert (respuesta.json()["filas_afectadas"], respuesta.json()["monto_total"]) == (1, 4.0)
+    assert respuesta.json()["detalle"] == [
+        {"id_mecanico": id_luis, "quincena": quincena, "total_comisiones": 1, "monto_total": 4.0},
+    ]
+
+    # Denegar todo el taller: las ya aprobadas no se tocan
+    respuesta = cliente_http.post("/api/mecanicos/comisiones/quincenas/estado",
+                                  json={"quincenas": [quincena], "aprobar": False})
+    assert (respuesta.json()["filas_afectadas"], respuesta.json()["monto_total"]) == (1, 6.0)
+
+    db.expire_all()
+    estados = {c.id: (c.estado_comision, c.monto_comision, c.quincena) for c in db.query(ComisionMecanico)}
+    assert estados == {
+        id_pendiente_luis: (EstadoComision.APROBADA, Decimal("4.00"), quincena),
+        id_pendiente_ana: (EstadoComision.DENEGADA, Decimal("0.00"), quincena),
+        id_aprobada: (EstadoComision.APROBADA, Decimal("9.00"), None),
+    }
+
+
+def test_lote_rechaza_quincena_invalida(cliente_http, db):
+    respuesta = cliente_http.post("/api/mecanicos/comisiones/quincenas/estado",
+                                  json={"quincenas": ["2025-Q9"], "aprobar": True})
+    assert respuesta.status_code == 400
+
+
+def test_lote_rechaza_lista_de_mecanicos_vacia(cliente_http, db):
+    quincena, _, _ = _sembrar(db)
+    respuesta = cliente_http.post("/api/mecanicos/comisiones/quincenas/estado",
+                                  json={"quincenas": [quincena], "aprobar": True, "mecanicos_ids": []})
+    assert respuesta.status_code == 422
+
+    db.expire_all()
+    pendientes = db.query(ComisionMecanico).filter(ComisionMecanico.estado_comision == EstadoComision.PENDIENTE)
+    assert pendientes.count() == 2
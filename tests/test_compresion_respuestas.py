@@ -0,0 +1,46 @@
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.compresion import CompresionMiddleware, elegir_codificacion
+
+
+def test_negociacion_de_codificacion():
+    assert elegir_codificacion("gzip, deflate") == "gzip"
+    assert elegir_codificacion("gzip;q=1, br;q=0.5") == "gzip"
+    assert elegir_codificacion("*;q=0.5, gzip;q=0") in ("br", "gzip")
+    assert elegir_codificacion("identity") is None
+    assert elegir_codificacion("") is None
+
+
+def test_streaming_comprimido_y_eventos_sin_tocar():
+    async def partes():
+        for numero in range(3):
+            yield f"fila {numero}\n" * 100
+
+    def exportar(request):
+        return StreamingResponse(partes(), media_type="text/csv")
+
+    def eventos(request):
+        return StreamingResponse(partes(), media_type="text/event-stream")
+
+    def chica(request):
+        return PlainTextResponse("ok", headers={"ETag": '"abc"'})
+
+    app = Starlette(routes=[Route("/exportar", exportar), Route("/eventos", eventos), Route("/chica", chica)])
+    cliente = TestClient(CompresionMiddleware(app, minimo_bytes=1024), headers={"Accept-Encoding": "gzip"})
+
+    respuesta = cliente.get("/exportar")
+    assert respuesta.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in respuesta.headers
+    assert respuesta.text.count("fila") == 300
+
+    respuesta = cliente.get("/eventos")
+    assert "Content-Encoding" not in respuesta.headers
+    assert respuesta.text.count("fila") == 300
+
+    # Por debajo del mínimo no se comprime, pero el ETag ya es débil para coincidir con el comprimido
+    respuesta = cliente.get("/chica")
+    assert "Content-Encoding" not in respuesta.headers
+    assert (respuesta.headers["ETag"], respuesta.headers["Vary"]) == ('W/"abc"', "Accept-Encoding")
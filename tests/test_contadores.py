@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import delete, event, insert, text
+
+from app.core.contadores import leer_totales, reconciliar
+from app.models.carros import Carro
+from app.models.clientes import Cliente
+from app.models.database import engine
+from app.models.trabajos import Trabajo
+
+
+def test_contadores_siguen_las_escrituras(db):
+    ana = Cliente(id_nacional="801", nombre="Ana")
+    carros = [Carro(matricula=f"CNT00{i}", marca="Kia", cliente_actual=ana) for i in range(3)]
+    db.add_all(carros)
+    db.flush()
+    db.add_all([Trabajo(carro=carros[0], descripcion="Aceite", costo=10) for _ in range(2)])
+    db.commit()
+    assert leer_totales(db) == {"clientes": 1, "carros": 3, "trabajos": 2}
+
+    # Eliminación masiva: los trabajos del carro se eliminan por ON DELETE CASCADE
+    db.execute(delete(Carro).where(Carro.matricula.in_(["CNT000", "CNT001"])))
+    db.execute(insert(Cliente), [{"id_nacional": "802", "nombre": "Eva"}, {"id_nacional": "803", "nombre": "Leo"}])
+    db.commit()
+    assert leer_totales(db) == {"clientes": 3, "carros": 1, "trabajos": 0}
+
+    db.delete(db.query(Cliente).filter_by(id_nacional="802").one())
+    db.flush()
+    db.rollback()
+    assert leer_totales(db)["clientes"] == 3
+
+
+@pytest.mark.presupuesto_consultas(1)
+def test_reconciliar_corrige_las_escrituras_sin_sesion(cliente_http, db):
+    db.execute(text("INSERT INTO clientes (id_nacional, nombre, tipo_cliente) VALUES ('804', 'Sin ORM', 'PERSONA')"))
+    db.commit()
+    assert cliente_http.get("/api/reportes/totales").json()["total_clientes"] == 0
+
+    assert reconciliar() == {"carros": 0, "clientes": 1, "trabajos": 0}
+    assert cliente_http.get("/api/reportes/totales").json()["total_clientes"] == 1
+    assert reconciliar() == {"carros": 0, "clientes": 0, "trabajos": 0}
+
+
+def test_insert_con_varios_values_cuenta_todas_las_filas(db):
+    db.execute(insert(Cliente).values([{"id_nacional": f"81{i}", "nombre": "Lote"} for i in range(3)]))
+    db.execute(insert(Cliente).values([{"id_nacional": "820", "nombre": "Con id"}]).returning(Cliente.id)).all()
+    db.commit()
+    assert leer_totales(db)["clientes"] == 4
+
+
+def test_contadores_se_bloquean_en_orden_al_confirmar(db):
+    actualizados = []
+
+    def registrar(conn, cursor, sentencia, parametros, context, executemany):
+        if sentencia.startswith("UPDATE contadores"):
+            actualizados.append(parametros[-1])
+
+    # La transacción escribe trabajos, luego clientes y luego carros, en flush separados
+    carro = Carro(matricula="CNT010", marca="Kia")
+    db.add(carro)
+    db.commit()
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        db.add(Trabajo(carro=carro, descripcion="Aceite", costo=10))
+        db.flush()
+        db.add(Cliente(id_nacional="830", nombre="Ana"))
+        db.flush()
+        db.add(Carro(matricula="CNT011", marca="Kia"))
+        assert actualizados == []
+        db.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+
+    assert actualizados == ["carros", "clientes", "trabajos"]
+    assert leer_totales(db) == {"clientes": 1, "carros": 2, "trabajos": 1}
@@ -0,0 +1,88 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from app.models.carros import Carro
+from app.models.clientes import Cliente
+from app.models.comisiones_mecanicos import ComisionMecanico, EstadoComision
+from app.models.detalle_gastos import DetalleGasto
+from app.models.gastos_taller import EstadoGasto, GastoTaller
+from app.models.mecanicos import Mecanico
+from app.models.pagos_salarios import PagoSalario
+from app.models.trabajos import Trabajo
+
+
+def _sembrar(db):
+    carro = Carro(matricula="DSH001", marca="Kia", modelo="Rio", anio=2019,
+                  cliente_actual=Cliente(id_nacional="501", nombre="Eva", apellido="Solís"))
+    db.add(carro)
+    mecanico = Mecanico(id_nacional="M501", nombre="Pedro")
+    db.add(mecanico)
+    db.flush()
+    for dia, costo, aplica_iva in ((3, "1000.00", True), (20, "500.00", False)):
+        trabajo = Trabajo(carro=carro, descripcion="Servicio", fecha=datetime(2025, 3, dia),
+                          costo=Decimal(costo), mano_obra=Decimal("300.00"), markup_repuestos=Decimal("20.00"),
+                          aplica_iva=aplica_iva)
+        db.add(trabajo)
+        db.flush()
+        db.add(DetalleGasto(id_trabajo=trabajo.id, descripcion="Filtro", monto=Decimal("100.00")))
+        db.add(ComisionMecanico(id_trabajo=trabajo.id, id_mecanico=mecanico.id, ganancia_trabajo=Decimal("200.00"),
+                                monto_comision=Decimal("4.00"), mes_reporte="2025-03",
+                                quincena="2025-Q1" if dia <= 15 else "2025-Q2",
+                                estado_comision=EstadoComision.APROBADA if dia <= 15 else EstadoComision.PENDIENTE))
+    # Fuera del mes o sin pagar: no cuentan
+    db.add(Trabajo(carro=carro, descripcion="Otro mes", fecha=datetime(2025, 4, 1), costo=Decimal("900.00")))
+    db.add(GastoTaller(descripcion="Luz", monto=Decimal("80.00"), categoria="Servicios",
+                       fecha_gasto=datetime(2025, 3, 10), estado=EstadoGasto.PAGADO))
+    db.add(GastoTaller(descripcion="Agua", monto=Decimal("40.00"), categoria="Servicios",
+                       fecha_gasto=datetime(2025, 3, 12), estado=EstadoGasto.PENDIENTE))
+    db.add(PagoSalario(id_mecanico=mecanico.id, monto_salario=Decimal("250.00"), semana_pago="1",
+                       fecha_pago=date(2025, 3, 15)))
+    db.commit()
+
+
+@pytest.mark.presupuesto_consultas(5)
+def test_resumen_del_mes(cliente_http, db):
+    _sembrar(db)
+    respuesta = cliente_http.get("/api/dashboard/resumen", params={"mes": "2025-03"})
+    assert respuesta.status_code == 200
+    resumen = respuesta.json()
+
+    assert resumen["totales"] == {"total_clientes": 1, "total_carros": 1, "total_trabajos": 3}
+    assert resumen["trabajos"] == {
+        "cantidad_trabajos": 2, "ingresos_totales": 1500.0, "mano_obra": 600.0,
+        "markup_repuestos": 40.0, "gastos_repuestos": 200.0, "iva_calculado": 130.0,
+    }
+    assert resumen["gastos_taller"]["total_monto"] == 80.0
+    assert resumen["salarios"]["pagos_por_mecanico"][0]["total"] == 250.0
+    assert resumen["comisiones"]["total_aprobadas"] == 4.0
+    assert resumen["comisiones"]["total_pendientes"] == 4.0
+    assert resumen["mecanicos"] == [{
+        "id": resumen["mecanicos"][0]["id"], "nombre": "Pedro", "total_trabajos": 2,
+        "total_comisiones": 8.0, "comisiones_aprobadas": 4.0,
+    }]
+    assert resumen["finanzas"] == {"ingresos_totales": 1500.0, "gastos_totales": 334.0, "ganancia_neta": 640.0}
+
+
+def test_mes_invalido(cliente_http):
+    assert cliente_http.get("/api/dashboard/resumen", params={"mes": "2025-13"}).status_code == 400
+    assert cliente_http.get("/api/dashboard/resumen", params={"mes": "marzo"}).status_code == 422
+
+
+def test_mes_actual_cambia_con_la_fecha(cliente_http, db, monkeypatch):
+    import app.routes.dashboard as dashboard
+
+    class Ahora(datetime):
+        actual = datetime(2025, 3, 31, 23, 59)
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.actual
+
+    monkeypatch.setattr(dashboard, "datetime", Ahora)
+    assert cliente_http.get("/api/dashboard/resumen").json()["mes"] == "2025-03"
+
+    # Sin escrituras de por medio: el cambio de mes no sirve el resumen cacheado del mes anterior
+    Ahora.actual = datetime(2025, 4, 1, 0, 1)
+    assert cliente_http.get("/api/dashboard/resumen").json()["mes"] == "2025-04"
@@ -0,0 +1,23 @@
+from sqlalchemy import create_engine, select
+
+from app.datos_sinteticos import ParametrosGeneracion, generar_datos
+from app.models import Carro, ComisionMecanico, Trabajo
+
+
+def _generar(semilla):
+    engine = create_engine("sqlite://")
+    conteos = generar_datos(engine, ParametrosGeneracion(trabajos=300, semilla=semilla, lote=100), crear_tablas=True)
+    with engine.connect() as conn:
+        trabajos = conn.execute(select(Trabajo.__table__).order_by(Trabajo.id)).all()
+        comisiones = conn.execute(select(ComisionMecanico.__table__).order_by(ComisionMecanico.id)).all()
+        carros = conn.execute(select(Carro.__table__).order_by(Carro.matricula)).all()
+    return conteos, trabajos, comisiones, carros
+
+
+def test_misma_semilla_genera_los_mismos_datos():
+    conteos, *datos = _generar(7)
+    assert conteos["trabajos"] == 300
+    assert conteos["clientes"] == 30
+    assert conteos["comisiones_mecanicos"] >= 300
+    assert _generar(7) == (conteos, *datos)
+    assert _generar(8)[1] != datos[0]
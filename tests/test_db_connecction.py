@@ -1,13 +1,15 @@
-from app.config.database import engine
+import pytest
+
+from app.models.database import engine
+
 
 def test_db_connection():
     """
     Prueba simple para verificar si la conexión con la base de datos es exitosa.
+    Usa la base configurada en DATABASE_URL (SQLite temporal en las pruebas).
     """
     try:
-        # Intentar conectar con la base de datos
-        with engine.connect() as connection:
-            print("Conexión a la base de datos exitosa.")
+        with engine.connect():
+            pass
     except Exception as e:
-        # Imprimir el error en caso de falla
-        print(f"Error al conectar a la base de datos: {e}")
+        pytest.skip(f"Base de datos no disponible: {e}")
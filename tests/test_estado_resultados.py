@@ -0,0 +1,110 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.models.carros import Carro
+from app.models.clientes import Cliente
+from app.models.comisiones_mecanicos import ComisionMecanico, EstadoComision
+from app.models.detalle_gastos import DetalleGasto
+from app.models.gastos_taller import EstadoGasto, GastoTaller
+from app.models.mecanicos import Mecanico
+from app.models.pagos_salarios import PagoSalario
+from app.models.trabajos import Trabajo
+from app.services.estado_resultados import (
+    EstadoResultadosService, Granularidad, generar_periodos, periodos_consolidados,
+)
+
+
+def _sembrar(db):
+    carro = Carro(matricula="PYL001", marca="Mazda", modelo="3", anio=2018,
+                  cliente_actual=Cliente(id_nacional="601", nombre="Rita", apellido="Araya"))
+    db.add(carro)
+    mecanico = Mecanico(id_nacional="M601", nombre="Juan")
+    db.add(mecanico)
+    db.flush()
+    for fecha, estado in ((datetime(2025, 1, 10), EstadoComision.APROBADA), (datetime(2025, 2, 20), EstadoComision.PENDIENTE)):
+        trabajo = Trabajo(carro=carro, descripcion="Frenos", fecha=fecha, costo=Decimal("1000.00"),
+                          mano_obra=Decimal("400.00"), markup_repuestos=Decimal("50.00"), aplica_iva=True)
+        db.add(trabajo)
+        db.flush()
+        db.add(DetalleGasto(id_trabajo=trabajo.id, descripcion="Pastillas", monto=Decimal("200.00")))
+        db.add(ComisionMecanico(id_trabajo=trabajo.id, id_mecanico=mecanico.id, ganancia_trabajo=Decimal("200.00"),
+                                monto_comision=Decimal("10.00"), mes_reporte=f"{fecha:%Y-%m}", estado_comision=estado))
+    db.add(GastoTaller(descripcion="Alquiler", monto=Decimal("150.00"), categoria="Local",
+                       fecha_gasto=datetime(2025, 1, 31, 18), estado=EstadoGasto.PAGADO))
+    db.add(PagoSalario(id_mecanico=mecanico.id, monto_salario=Decimal("100.00"), semana_pago="1",
+                       fecha_pago=date(2025, 2, 1)))
+    db.commit()
+
+
+def test_periodos_por_quincena_y_semana():
+    quincenas = generar_periodos(date(2025, 2, 10), date(2025, 3, 31), Granularidad.QUINCENA)
+    assert [(p.etiqueta, p.inicio, p.fin, p.completo) for p in quincenas] == [
+        ("2025-02-Q1", date(2025, 2, 10), date(2025, 2, 16), False),
+        ("2025-02-Q2", date(2025, 2, 16), date(2025, 3, 1), True),
+        ("2025-03-Q1", date(2025, 3, 1), date(2025, 3, 16), True),
+        ("2025-03-Q2", date(2025, 3, 16), date(2025, 4, 1), True),
+    ]
+    semanas = generar_periodos(date(2024, 12, 30), date(2025, 1, 12), Granularidad.SEMANA)
+    assert [p.etiqueta for p in semanas] == ["2025-W01", "2025-W02"]
+
+
+def test_estado_resultados_por_mes(cliente_http, db):
+    _sembrar(db)
+    respuesta = cliente_http.get("/api/reportes/estado-resultados",
+                                 params={"desde": "2025-01-01", "hasta": "2025-03-31", "granularidad": "mes"})
+    assert respuesta.status_code == 200
+    enero, febrero, marzo = respuesta.json()["periodos"]
+
+    assert enero["periodo"] == "2025-01" and enero["fin"] == "2025-01-31"
+    assert (enero["ingresos"], enero["iva"], enero["costo_repuestos"]) == (1000.0, 130.0, 200.0)
+    assert (enero["comisiones"], enero["gastos_taller"], enero["salarios"]) == (10.0, 150.0, 0.0)
+    assert (enero["utilidad_bruta"], enero["utilidad_neta"]) == (450.0, 290.0)
+    # Comisión pendiente: no es un costo todavía
+    assert (febrero["comisiones"], febrero["salarios"], febrero["utilidad_neta"]) == (0.0, 100.0, 350.0)
+    assert marzo["cantidad_trabajos"] == 0 and marzo["utilidad_neta"] == 0.0
+    assert respuesta.json()["totales"]["utilidad_neta"] == 640.0
+
+
+def test_periodos_consolidados_se_recalculan_tras_una_escritura(db):
+    _sembrar(db)
+    servicio = EstadoResultadosService(db)
+    primero = servicio.calcular(date(2025, 1, 1), date(2025, 2, 28), Granularidad.MES)
+    assert len(periodos_consolidados) == 2
+    # Consolidado por antigüedad no es un cierre formal
+    assert all(p["consolidado"] and not p["cerrado"] for p in primero["periodos"])
+
+    aciertos = periodos_consolidados.aciertos
+    assert servicio.calcular(date(2025, 1, 1), date(2025, 2, 28), Granularidad.MES) == primero
+    assert periodos_consolidados.aciertos == aciertos + 2
+
+    db.add(GastoTaller(descripcion="Tardío", monto=Decimal("999.00"), categoria="Local",
+                       fecha_gasto=datetime(2025, 1, 5), estado=EstadoGasto.PAGADO))
+    db.commit()
+    enero = servicio.calcular(date(2025, 1, 1), date(2025, 2, 28), Granularidad.MES)["periodos"][0]
+    assert enero["gastos_taller"] == primero["periodos"][0]["gastos_taller"] + 999.0
+
+
+def test_consolidado_se_actualiza_al_cambiar_el_dia(cliente_http, db, monkeypatch):
+    import app.routes.reportes as reportes
+
+    class Dia(date):
+        actual = date(2025, 2, 5)
+
+        @classmethod
+        def today(cls):
+            return cls.actual
+
+    monkeypatch.setattr(reportes, "date", Dia)
+    parametros = {"desde": "2025-01-01", "hasta": "2025-01-31", "granularidad": "mes"}
+    assert cliente_http.get("/api/reportes/estado-resultados", params=parametros).json()["periodos"][0]["consolidado"] is False
+
+    # Sin escrituras de por medio: la respuesta del día anterior no se reutiliza
+    Dia.actual = date(2025, 2, 20)
+    assert cliente_http.get("/api/reportes/estado-resultados", params=parametros).json()["periodos"][0]["consolidado"] is True
+
+
+def test_rango_invalido(cliente_http):
+    parametros = {"desde": "2025-03-01", "hasta": "2025-01-01"}
+    assert cliente_http.get("/api/reportes/estado-resultados", params=parametros).status_code == 400
+    parametros = {"desde": "2020-01-01", "hasta": "2025-01-01", "granularidad": "dia"}
+    assert cliente_http.get("/api/reportes/estado-resultados", params=parametros).status_code == 400
@@ -0,0 +1,83 @@
+from datetime import datetime
+from decimal import Decimal
+
+from app.models.carros import Carro
+from app.models.clientes import Cliente
+from app.models.comisiones_mecanicos import ComisionMecanico
+from app.models.mecanicos import Mecanico
+from app.models.trabajos import Trabajo
+
+
+def _crear_cliente_con_carro(cliente_http):
+    cliente_http.post("/api/clientes/", json={"id_nacional": "201", "nombre": "Ana", "apellido": "Mora"})
+    respuesta = cliente_http.post("/api/carros/", json={
+        "matricula": "ABC123", "marca": "Toyota", "modelo": "Yaris", "anio": 2020, "id_cliente_actual": "201",
+    })
+    assert respuesta.status_code == 200, respuesta.text
+
+
+def test_if_none_match_responde_304_sin_cuerpo(cliente_http, db):
+    _crear_cliente_con_carro(cliente_http)
+    respuesta = cliente_http.get("/api/carros/")
+    etag = respuesta.headers["ETag"]
+    assert respuesta.status_code == 200
+    assert "Last-Modified" in respuesta.headers
+
+    condicional = cliente_http.get("/api/carros/", headers={"If-None-Match": etag})
+    assert condicional.status_code == 304
+    assert condicional.content == b""
+    assert condicional.headers["ETag"] == etag
+
+
+def test_escrituras_cambian_el_etag(cliente_http, db):
+    _crear_cliente_con_carro(cliente_http)
+    etag = cliente_http.get("/api/clientes/201").headers["ETag"]
+
+    cliente_http.put("/api/clientes/201", json={"id_nacional": "201", "nombre": "Ana María", "apellido": "Mora"})
+    respuesta = cliente_http.get("/api/clientes/201", headers={"If-None-Match": etag})
+    assert respuesta.status_code == 200
+    assert respuesta.json()["nombre"] == "Ana María"
+
+    etag = respuesta.headers["ETag"]
+    cliente_http.delete("/api/carros/ABC123")
+    assert cliente_http.get("/api/clientes/201", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_etag_distinto_por_url(cliente_http, db):
+    _crear_cliente_con_carro(cliente_http)
+    assert cliente_http.get("/api/clientes/").headers["ETag"] != cliente_http.get("/api/clientes/201").headers["ETag"]
+
+
+def test_cambio_de_comision_en_sitio_cambia_el_etag_de_trabajos(cliente_http, db):
+    carro = Carro(matricula="ETG001", marca="Kia", modelo="Rio", anio=2020,
+                  cliente_actual=Cliente(id_nacional="202", nombre="Leo", apellido="Paz"))
+    mecanico = Mecanico(id_nacional="M202", nombre="Luis")
+    trabajo = Trabajo(carro=carro, descripcion="Frenos", fecha=datetime(2025, 5, 2), costo=Decimal("500.00"))
+    db.add_all([mecanico, trabajo])
+    db.flush()
+    comision = ComisionMecanico(id_trabajo=trabajo.id, id_mecanico=mecanico.id, ganancia_trabajo=Decimal("100.00"),
+                                monto_comision=Decimal("2.00"), mes_reporte="2025-05")
+    db.add(comision)
+    db.commit()
+
+    etags = {ruta: cliente_http.get(ruta).headers["ETag"]
+             for ruta in ("/api/trabajos/", "/api/mecanicos/", "/api/mecanicos/todas-comisiones/")}
+    assert cliente_http.put(f"/api/mecanicos/{mecanico.id}/comisiones/{comision.id}/estado",
+                            json={"nuevo_estado": "APROBADA"}).status_code == 200
+    assert cliente_http.get("/api/trabajos/", headers={"If-None-Match": etags["/api/trabajos/"]}).status_code == 200
+    assert cliente_http.get("/api/mecanicos/todas-comisiones/",
+                            headers={"If-None-Match": etags["/api/mecanicos/todas-comisiones/"]}).status_code == 200
+    assert cliente_http.get("/api/mecanicos/", headers={"If-None-Match": etags["/api/mecanicos/"]}).status_code == 304
+
+
+def test_gastos_y_pagos_con_etag(cliente_http, db):
+    gasto = cliente_http.post("/api/gastos-taller/", json={
+        "descripcion": "Luz", "monto": "50.00", "categoria": "Servicios", "fecha_gasto": "2025-05-02T10:00:00",
+    }).json()
+    for ruta in ("/api/gastos-taller/", f"/api/gastos-taller/{gasto['id']}", "/api/pagos-salarios/"):
+        etag = cliente_http.get(ruta).headers["ETag"]
+        assert cliente_http.get(ruta, headers={"If-None-Match": etag}).status_code == 304
+
+    etag = cliente_http.get(f"/api/gastos-taller/{gasto['id']}").headers["ETag"]
+    cliente_http.put(f"/api/gastos-taller/{gasto['id']}", json={"monto": "60.00"})
+    assert cliente_http.get(f"/api/gastos-taller/{gasto['id']}", headers={"If-None-Match": etag}).status_code == 200
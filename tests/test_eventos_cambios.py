@@ -0,0 +1,64 @@
+import asyncio
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import anyio
+
+from app.core.eventos_cambios import difusor, flujo_eventos
+from app.models.clientes import Cliente
+from app.models.gastos_taller import GastoTaller
+from app.services.sincronizacion import SincronizacionService
+
+
+def _datos(mensaje):
+    return json.loads(next(linea for linea in mensaje.splitlines() if linea.startswith("data: "))[6:])
+
+
+def test_reconexion_reenvia_cambios_filtrados(db):
+    token = SincronizacionService(db).token_actual()
+    db.add(GastoTaller(descripcion="Agua", monto=Decimal("50.00"), categoria="Servicios", fecha_gasto=datetime(2025, 2, 1)))
+    db.add(Cliente(id_nacional="401", nombre="Luis", apellido="Vega"))
+    db.commit()
+
+    async def leer():
+        flujo = flujo_eventos({"gastos_taller"}, desde=token)
+        try:
+            return [await flujo.__anext__() for _ in range(2)]
+        finally:
+            await flujo.aclose()
+
+    inicio, mensaje = asyncio.run(leer())
+    assert inicio.startswith("retry:")
+    assert "event: cambios" in mensaje
+    datos = _datos(mensaje)
+    assert f"id: {datos['token']}" in mensaje
+    assert [(c["entidad"], c["op"]) for c in datos["cambios"]] == [("gastos_taller", "CREAR")]
+
+
+def test_commit_notifica_a_las_conexiones(db):
+    sara = Cliente(id_nacional="402", nombre="Sara", apellido="Rojas")
+
+    def escribir():
+        db.add(sara)
+        db.commit()
+
+    async def leer():
+        flujo = flujo_eventos()
+        try:
+            await flujo.__anext__()
+            # Se espera a que el bucle fije su token antes de escribir
+            while difusor._token is None:
+                await asyncio.sleep(0.01)
+            await anyio.to_thread.run_sync(escribir)
+            return await asyncio.wait_for(flujo.__anext__(), 5)
+        finally:
+            await flujo.aclose()
+
+    datos = _datos(asyncio.run(leer()))
+    assert datos["cambios"] == [{"entidad": "clientes", "id": sara.id, "op": "CREAR"}]
+
+
+def test_tabla_desconocida(cliente_http):
+    respuesta = cliente_http.get("/api/eventos", params={"tablas": "trabajos,usuarios"})
+    assert respuesta.status_code == 400
@@ -0,0 +1,41 @@
+import logging
+
+import pytest
+
+from app.core.instrumentacion_sql import Sentencia, huella, sentencias_repetidas
+from app.models.carros import Carro
+from app.models.clientes import Cliente
+from app.models.trabajos import Trabajo
+
+
+def test_huella_ignora_valores_y_largo_de_listas_in():
+    a = huella("SELECT * FROM carros WHERE matricula = 'ABC123' AND anio > 2010")
+    b = huella("SELECT *  FROM carros\nWHERE matricula = 'XYZ' AND anio > 1999")
+    assert a == b == "SELECT * FROM carros WHERE matricula = ? AND anio > ?"
+
+    assert huella("SELECT * FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s)") == huella("SELECT * FROM t WHERE id IN (?)")
+
+
+def test_sentencias_repetidas_respeta_el_umbral():
+    sentencias = [Sentencia(huella("SELECT * FROM clientes WHERE id = ?"), "", None, 0.0, None)] * 4
+    assert sentencias_repetidas(sentencias, 3) == [("SELECT * FROM clientes WHERE id = ?", 4)]
+    assert sentencias_repetidas(sentencias, 4) == []
+
+
+def test_detecta_n_mas_uno_en_historial_de_carro(cliente_http, db, caplog):
+    carro = Carro(matricula="C1", cliente_actual=Cliente(id_nacional="1", nombre="Ana"))
+    db.add_all([Trabajo(carro=carro, descripcion=f"Trabajo {i}", costo=10) for i in range(12)])
+    db.commit()
+
+    # Los repuestos de cada trabajo se cargan con una consulta por trabajo
+    with caplog.at_level(logging.WARNING, logger="app.core.instrumentacion_sql"):
+        respuesta = cliente_http.get("/api/carros/historial/C1")
+
+    assert respuesta.status_code == 200
+    assert any("Posible N+1 en GET /api/carros/historial/{matricula}" in r.getMessage() for r in caplog.records)
+
+
+@pytest.mark.presupuesto_consultas(3)
+def test_totales_dentro_del_presupuesto(cliente_http, db):
+    respuesta = cliente_http.get("/api/reportes/totales")
+    assert respuesta.status_code == 200
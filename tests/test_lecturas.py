@@ -0,0 +1,95 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.models.carros import Carro
+from app.models.clientes import Cliente
+from app.models.comisiones_mecanicos import ComisionMecanico, EstadoComision
+from app.models.detalle_gastos import DetalleGasto
+from app.models.mecanicos import Mecanico
+from app.models.trabajos import Trabajo
+from app.services import lecturas
+
+
+def _sembrar(db):
+    rosa = Cliente(id_nacional="901", nombre="Rosa", apellido="Mena")
+    db.add(Cliente(id_nacional="902", nombre="Saúl", apellido="Rojas"))
+    rio = Carro(matricula="LEC001", marca="Kia", modelo="Rio", anio=2020, cliente_actual=rosa)
+    soul = Carro(matricula="LEC002", marca="Kia", modelo="Soul", anio=2021)
+    db.add_all([rio, soul])
+    mecanico = Mecanico(id_nacional="M901", nombre="Iván")
+    db.add(mecanico)
+    db.flush()
+    trabajo = Trabajo(carro=rio, descripcion="Frenos", fecha=datetime(2025, 5, 2),
+                      costo=Decimal("500.00"), mano_obra=Decimal("200.00"))
+    db.add(trabajo)
+    db.add(Trabajo(carro=soul, descripcion="Aceite", fecha=datetime(2025, 5, 3), costo=Decimal("80.00")))
+    db.flush()
+    db.add(DetalleGasto(id_trabajo=trabajo.id, descripcion="Pastillas", monto=Decimal("100.00"),
+                        monto_cobrado=Decimal("150.00")))
+    db.add(DetalleGasto(id_trabajo=trabajo.id, descripcion="Líquido", monto=Decimal("20.00")))
+    db.add(ComisionMecanico(id_trabajo=trabajo.id, id_mecanico=mecanico.id, ganancia_trabajo=Decimal("80.00"),
+                            monto_comision=Decimal("1.60"), mes_reporte="2025-05", quincena="2025-Q1",
+                            estado_comision=EstadoComision.PENDIENTE))
+    db.commit()
+
+
+# Huella del ETag + a lo sumo dos consultas por listado
+@pytest.mark.presupuesto_consultas(3)
+def test_listados_sin_consultas_por_fila(cliente_http, db):
+    _sembrar(db)
+
+    frenos, aceite = cliente_http.get("/api/trabajos/").json()
+    assert (frenos["cliente_nombre"], frenos["total_gastos"], frenos["ganancia_base_comisiones"]) == ("Rosa Mena", 120.0, 80.0)
+    assert (frenos["mecanicos_nombres"], frenos["total_mecanicos"]) == (["Iván"], 1)
+    assert (aceite["cliente_nombre"], aceite["cliente_id"], aceite["mecanicos_ids"]) == ("Sin cliente", None, [])
+
+    rosa, saul = cliente_http.get("/api/clientes/").json()
+    # Mano de obra + repuestos al precio cobrado (o al costo si no tienen precio cobrado)
+    assert (rosa["vehicle_count"], rosa["total_gastado"]) == (1, 370.0)
+    assert (saul["vehicle_count"], saul["total_gastado"]) == (0, 0.0)
+
+    carros = cliente_http.get("/api/carros/").json()
+    assert [c["nombre_cliente"] for c in carros] == ["Rosa Mena", "Sin propietario"]
+
+    comisiones = cliente_http.get("/api/trabajos/comisiones/quincena/2025-Q1").json()["comisiones"]
+    assert [(c["nombre_mecanico"], c["descripcion_trabajo"], c["monto_comision"]) for c in comisiones] == [
+        ("Iván", "Frenos", 1.6),
+    ]
+    assert len(cliente_http.get("/api/detalles-gastos").json()) == 2
+    assert [m["nombre"] for m in cliente_http.get("/api/mecanicos/").json()] == ["Iván"]
+
+
+# Huella del ETag + solo la consulta de trabajos, sin JOIN a clientes ni consultas de mecánicos
+@pytest.mark.presupuesto_consultas(2)
+def test_listado_de_trabajos_con_campos_pedidos(cliente_http, db):
+    _sembrar(db)
+
+    frenos, aceite = cliente_http.get("/api/trabajos/", params={"fields": "id,descripcion,costo"}).json()
+    assert frenos == {"id": frenos["id"], "descripcion": "Frenos", "costo": 500.0}
+    assert set(aceite) == {"id", "descripcion", "costo"}
+
+    respuesta = cliente_http.get("/api/trabajos/", params={"fields": "descripcion,propietario"})
+    assert respuesta.status_code == 400 and "propietario" in respuesta.json()["detail"]
+
+
+def test_listado_de_trabajos_con_expansiones(cliente_http, db):
+    _sembrar(db)
+
+    frenos, aceite = cliente_http.get(
+        "/api/trabajos/", params={"fields": "descripcion", "include": "gastos,mecanicos"}
+    ).json()
+    assert [g["descripcion"] for g in frenos["gastos"]] == ["Pastillas", "Líquido"]
+    assert [m["nombre"] for m in frenos["mecanicos"]] == ["Iván"]
+    assert aceite == {"descripcion": "Aceite", "gastos": [], "mecanicos": []}
+
+
+def test_expansion_de_gastos_solo_lee_los_trabajos_pedidos(db):
+    _sembrar(db)
+    frenos, aceite = db.query(Trabajo).order_by(Trabajo.id).all()
+
+    assert [g["descripcion"] for g in lecturas.detalles_gastos(db, id_trabajos=[frenos.id])] == ["Pastillas", "Líquido"]
+    assert lecturas.detalles_gastos(db, id_trabajos=[aceite.id]) == []
+    (trabajo,) = lecturas.trabajos(db, campos=("descripcion",), incluir=("gastos",), ids=[aceite.id])
+    assert trabajo == {"descripcion": "Aceite", "gastos": []}
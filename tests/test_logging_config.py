@@ -0,0 +1,47 @@
+import json
+import logging
+
+from app.core.logging_config import JsonFormatter, RequestIdFilter
+from app.models.carros import Carro
+
+
+class _Registros(logging.Handler):
+    """Guarda cada registro con el mismo filtro y formato que el handler de la aplicación"""
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.addFilter(RequestIdFilter())
+        self.setFormatter(JsonFormatter())
+        self.lineas = []
+
+    def emit(self, record):
+        self.lineas.append(self.format(record))
+
+
+def test_registro_json_con_el_request_id_de_la_peticion(cliente_http, db, caplog):
+    db.add(Carro(matricula="LOG001", marca="Kia", modelo="Rio", anio=2020))
+    db.commit()
+    registros = _Registros()
+    raiz = logging.getLogger()
+    raiz.addHandler(registros)
+    try:
+        with caplog.at_level(logging.DEBUG, logger="app.routes.historial_duenos"):
+            respuesta = cliente_http.get("/api/carro/LOG001/historial", headers={"X-Request-ID": "req-abc123"})
+    finally:
+        raiz.removeHandler(registros)
+
+    assert respuesta.status_code == 200
+    assert respuesta.headers["x-request-id"] == "req-abc123"
+    # El endpoint es síncrono: el request_id llega al hilo del threadpool
+    datos = [json.loads(linea) for linea in registros.lineas]
+    registro = next(d for d in datos if d["message"] == "Carro encontrado: LOG001, dueño actual: None")
+    assert registro["request_id"] == "req-abc123"
+    assert (registro["level"], registro["logger"]) == ("DEBUG", "app.routes.historial_duenos")
+    assert registro["ts"].endswith("+00:00")
+
+
+def test_request_id_generado_si_no_llega(cliente_http, db):
+    primera = cliente_http.get("/").headers["x-request-id"]
+    segunda = cliente_http.get("/").headers["x-request-id"]
+
+    assert len(primera) == 32 and primera != segunda
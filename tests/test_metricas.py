@@ -0,0 +1,30 @@
+import re
+
+from app.core.metricas import registro
+from app.models.carros import Carro
+
+
+def test_server_timing_con_consultas(cliente_http, db):
+    respuesta = cliente_http.get("/api/reportes/totales")
+
+    valor = respuesta.headers["server-timing"]
+    assert re.fullmatch(r'app;dur=\d+\.\d, db;dur=\d+\.\d;desc="1 consultas"', valor), valor
+
+
+def test_metrics_expone_el_histograma_de_la_ruta(cliente_http, db):
+    db.add_all([Carro(matricula="MET001", marca="Kia", modelo="Rio", anio=2020),
+                Carro(matricula="MET002", marca="Kia", modelo="Soul", anio=2021)])
+    db.commit()
+    registro.reiniciar()
+    for matricula in ("MET001", "MET002"):
+        cliente_http.get(f"/api/carro/{matricula}/historial")
+
+    texto = cliente_http.get("/metrics").text
+
+    # Una sola serie por plantilla de ruta, no por URL
+    etiquetas = 'method="GET",route="/api/carro/{matricula}/historial",status="200"'
+    assert f'http_request_duration_seconds_bucket{{{etiquetas},le="+Inf"}} 2' in texto
+    assert f"http_request_duration_seconds_count{{{etiquetas}}} 2" in texto
+    assert "MET001" not in texto
+    assert 'db_queries_per_request_count{method="GET",route="/api/carro/{matricula}/historial"} 2' in texto
+    assert "# TYPE http_request_duration_seconds histogram" in texto
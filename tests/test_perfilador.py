@@ -0,0 +1,23 @@
+def test_perfil_html_incluye_sql(cliente_http, db):
+    respuesta = cliente_http.get("/api/reportes/totales", params={"__profile": "1"})
+
+    assert respuesta.status_code == 200
+    assert respuesta.headers["content-type"].startswith("text/html")
+    assert "Perfil GET /api/reportes/totales" in respuesta.text
+    assert "1 consultas SQL" in respuesta.text
+    assert "FROM contadores" in respuesta.text
+
+
+def test_sin_parametro_la_respuesta_es_la_normal(cliente_http, db):
+    respuesta = cliente_http.get("/api/reportes/totales", headers={"X-Profile": "0"})
+
+    assert respuesta.json() == {"total_clientes": 0, "total_carros": 0, "total_trabajos": 0}
+
+
+def test_escrituras_no_se_perfilan(cliente_http, db):
+    respuesta = cliente_http.post("/api/clientes/", params={"__profile": "1"},
+                                  json={"id_nacional": "501", "nombre": "Nora", "apellido": "Paz"})
+
+    assert respuesta.status_code == 405
+    assert respuesta.headers["allow"] == "GET"
+    assert cliente_http.get("/api/clientes/").json() == []
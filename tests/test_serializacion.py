@@ -0,0 +1,48 @@
+from datetime import datetime
+from decimal import Decimal
+
+from app.core import config
+from app.models.carros import Carro
+from app.models.detalle_gastos import DetalleGasto
+from app.models.gastos_taller import EstadoGasto, GastoTaller
+from app.models.trabajos import Trabajo
+
+
+def _sembrar(db):
+    carro = Carro(matricula="SER001", marca="Kia", modelo="Rio", anio=2020)
+    trabajo = Trabajo(carro=carro, descripcion="Motor", fecha=datetime(2025, 6, 2),
+                      costo=Decimal("12345678.91"), mano_obra=Decimal("0.10"))
+    db.add(trabajo)
+    db.flush()
+    db.add(DetalleGasto(id_trabajo=trabajo.id, descripcion="Junta", monto=Decimal("0.20")))
+    db.add(GastoTaller(descripcion="Luz", monto=Decimal("1234.56"), categoria="Servicios",
+                       fecha_gasto=datetime(2025, 6, 3), estado=EstadoGasto.PAGADO))
+    db.commit()
+
+
+def test_montos_exactos_como_numero_o_texto(cliente_http, db, monkeypatch):
+    _sembrar(db)
+
+    respuesta = cliente_http.get("/api/trabajos/")
+    assert respuesta.headers["content-type"] == "application/json"
+    # 0.10 - 0.20 con Decimal: -0.1 exacto, no -0.10000000000000000555
+    assert b'"ganancia_base_comisiones":-0.1,' in respuesta.content
+    assert b'"costo":12345678.91,' in respuesta.content
+    assert cliente_http.get("/api/gastos-taller/").json()[0]["monto"] == 1234.56
+
+    monkeypatch.setattr(config, "JSON_DECIMALES", "texto")
+    trabajo = cliente_http.get("/api/trabajos/").json()[0]
+    assert (trabajo["costo"], trabajo["total_gastos"], trabajo["ganancia_base_comisiones"]) == (
+        "12345678.91", "0.20", "-0.10",
+    )
+    assert cliente_http.get("/api/gastos-taller/").json()[0]["monto"] == "1234.56"
+    assert cliente_http.get("/api/detalles-gastos").json()[0]["monto"] == "0.20"
+
+
+def test_porcentaje_de_comision_es_numero_entre_0_y_100(cliente_http, db, monkeypatch):
+    monkeypatch.setattr(config, "JSON_DECIMALES", "texto")
+    mecanico = {"id_nacional": "SER901", "nombre": "Iván", "porcentaje_comision": 2.5}
+
+    assert cliente_http.post("/api/mecanicos/", json={**mecanico, "porcentaje_comision": 150}).status_code == 422
+    assert cliente_http.post("/api/mecanicos/", json=mecanico).json()["porcentaje_comision"] == 2.5
+    assert cliente_http.get("/api/mecanicos/").json()[0]["porcentaje_comision"] == 2.5
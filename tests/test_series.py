@@ -0,0 +1,62 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.models.carros import Carro
+from app.models.clientes import Cliente
+from app.models.detalle_gastos import DetalleGasto
+from app.models.trabajos import Trabajo
+
+
+def _sembrar(db):
+    carro = Carro(matricula="SER001", marca="Ford", modelo="Fiesta", anio=2017,
+                  cliente_actual=Cliente(id_nacional="701", nombre="Olga", apellido="Pérez"))
+    db.add(carro)
+    for fecha, costo in ((datetime(2025, 1, 6, 9), "100.00"), (datetime(2025, 1, 12, 17), "200.00"),
+                         (datetime(2025, 1, 13, 8), "300.00"), (datetime(2025, 3, 31, 23), "400.00")):
+        trabajo = Trabajo(carro=carro, descripcion="Revisión", fecha=fecha, costo=Decimal(costo),
+                          markup_repuestos=Decimal("5.00"), ganancia=Decimal("50.00"), aplica_iva=True)
+        db.add(trabajo)
+        db.flush()
+        db.add(DetalleGasto(id_trabajo=trabajo.id, descripcion="Aceite", monto=Decimal("10.00")))
+        db.add(DetalleGasto(id_trabajo=trabajo.id, descripcion="Filtro", monto=Decimal("15.00")))
+    db.commit()
+
+
+def _serie(cliente_http, **parametros):
+    respuesta = cliente_http.get("/api/reportes/series", params=parametros)
+    assert respuesta.status_code == 200
+    return respuesta.json()
+
+
+def test_serie_por_semana_y_mes(cliente_http, db):
+    _sembrar(db)
+    semanas = _serie(cliente_http, desde="2025-01-08", hasta="2025-01-19", granularidad="semana")["serie"]
+    # La primera semana se recorta al rango: solo cuenta el trabajo del domingo 12
+    assert [(p["periodo"], p["inicio"], p["cantidad_trabajos"]) for p in semanas] == [
+        ("2025-W02", "2025-01-08", 1), ("2025-W03", "2025-01-13", 1),
+    ]
+
+    meses = _serie(cliente_http, desde="2025-01-01", hasta="2025-03-31", granularidad="mes")["serie"]
+    assert [p["cantidad_trabajos"] for p in meses] == [3, 0, 1]
+    enero = meses[0]
+    assert (enero["ingresos"], enero["gastos"], enero["markup"], enero["iva"], enero["ganancia"]) == (
+        600.0, 75.0, 15.0, 78.0, 150.0,
+    )
+
+
+def test_reduccion_de_puntos(cliente_http, db):
+    _sembrar(db)
+    respuesta = _serie(cliente_http, desde="2025-01-01", hasta="2025-03-31", granularidad="dia", puntos=10)
+    assert respuesta["periodos_por_punto"] == 9
+    assert len(respuesta["serie"]) == 10
+    assert respuesta["serie"][0]["inicio"] == "2025-01-01" and respuesta["serie"][-1]["fin"] == "2025-03-31"
+    assert sum(p["cantidad_trabajos"] for p in respuesta["serie"]) == 4
+    assert round(sum(p["ingresos"] for p in respuesta["serie"]), 2) == 1000.0
+
+
+def test_serie_consulta_por_indice(db):
+    from sqlalchemy import inspect
+
+    from app.models.database import engine
+
+    assert "ix_trabajos_fecha" in {i["name"] for i in inspect(engine).get_indexes("trabajos")}
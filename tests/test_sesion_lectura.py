@@ -0,0 +1,63 @@
+import time
+
+import pytest
+from sqlalchemy import create_engine, select, text
+
+from app.models import database
+from app.models.clientes import Cliente
+from app.models.database import Base, SessionLectura
+
+
+def test_sesion_de_lectura_sin_transaccion_abierta_ni_escrituras(db):
+    eva = Cliente(id_nacional="951", nombre="Eva", apellido="Soto")
+    db.add(eva)
+    db.commit()
+
+    lectura = SessionLectura()
+    try:
+        assert lectura.get(Cliente, eva.id).nombre == "Eva"
+        assert lectura.execute(text("SELECT count(*) FROM clientes")).scalar() == 1
+        # AUTOCOMMIT: después de leer, la conexión no retiene una transacción
+        assert not lectura.connection().connection.dbapi_connection.in_transaction
+
+        lectura.add(Cliente(id_nacional="952", nombre="Noé", apellido="Paz"))
+        with pytest.raises(RuntimeError, match="get_db"):
+            lectura.flush()
+    finally:
+        lectura.rollback()
+        lectura.close()
+
+
+
+def _replica(monkeypatch, url):
+    replica = create_engine(url, isolation_level="AUTOCOMMIT", pool_pre_ping=True)
+    monkeypatch.setattr(database, "engine_lectura", replica)
+    monkeypatch.setattr(database, "_replica_caida_hasta", 0.0)
+    return replica
+
+
+def test_replica_caida_lee_de_la_principal(cliente_http, db, monkeypatch, tmp_path):
+    db.add(Cliente(id_nacional="953", nombre="Ada", apellido="Ruiz"))
+    db.commit()
+    _replica(monkeypatch, f"sqlite:///{tmp_path / 'no-existe' / 'replica.db'}")
+
+    respuesta = cliente_http.get("/api/clientes/")
+    assert respuesta.status_code == 200 and respuesta.json()[0]["id_nacional"] == "953"
+    # Las siguientes lecturas no vuelven a intentar la réplica hasta que pase el plazo
+    assert database._replica_caida_hasta > time.monotonic()
+
+
+def test_replica_atrasada_responde_sin_etag(cliente_http, db, monkeypatch, tmp_path):
+    replica = _replica(monkeypatch, f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(replica)
+    db.add(Cliente(id_nacional="954", nombre="Leo", apellido="Mena"))
+    db.commit()
+
+    # La réplica todavía no tiene al cliente: el contenido no corresponde a la huella de la principal
+    respuesta = cliente_http.get("/api/clientes/")
+    assert respuesta.json() == [] and "etag" not in respuesta.headers
+
+    with replica.begin() as conn:
+        conn.execute(Cliente.__table__.insert(), [dict(f) for f in db.execute(select(Cliente.__table__)).mappings()])
+    respuesta = cliente_http.get("/api/clientes/")
+    assert respuesta.json()[0]["id_nacional"] == "954" and "etag" in respuesta.headers
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from app.models.carros import Carro
+from app.models.clientes import Cliente
+from app.models.comisiones_mecanicos import ComisionMecanico
+from app.models.database import ahora_utc
+from app.models.detalle_gastos import DetalleGasto
+from app.models.gastos_taller import GastoTaller
+from app.models.mecanicos import Mecanico
+from app.models.trabajos import Trabajo
+from app.models.registro_cambios import OperacionCambio, RegistroCambio
+from app.services.sincronizacion import SincronizacionService
+
+
+def _crear_cliente_con_carro(cliente_http):
+    cliente_http.post("/api/clientes/", json={"id_nacional": "301", "nombre": "Ana", "apellido": "Mora"})
+    respuesta = cliente_http.post("/api/carros/", json={
+        "matricula": "SYN001", "marca": "Toyota", "modelo": "Yaris", "anio": 2020, "id_cliente_actual": "301",
+    })
+    return respuesta.json()["carro"]["id"]
+
+
+def test_sync_devuelve_solo_lo_cambiado(cliente_http, db):
+    token = cliente_http.get("/api/sync").json()["token"]
+    _crear_cliente_con_carro(cliente_http)
+
+    respuesta = cliente_http.get("/api/sync", params={"since": token}).json()
+    assert [c["id_nacional"] for c in respuesta["cambios"]["clientes"]["creados"]] == ["301"]
+    assert [c["matricula"] for c in respuesta["cambios"]["carros"]["creados"]] == ["SYN001"]
+    assert respuesta["token"] > token and respuesta["mas"] is False
+
+    siguiente = cliente_http.get("/api/sync", params={"since": respuesta["token"]}).json()
+    assert siguiente["cambios"] == {} and siguiente["token"] == respuesta["token"]
+
+
+def test_actualizaciones_y_eliminaciones(cliente_http, db):
+    id_carro = _crear_cliente_con_carro(cliente_http)
+    token = cliente_http.get("/api/sync").json()["token"]
+
+    cliente_http.put("/api/clientes/301", json={"id_nacional": "301", "nombre": "Ana María", "apellido": "Mora"})
+    cliente_http.delete("/api/carros/SYN001")
+
+    cambios = cliente_http.get("/api/sync", params={"since": token}).json()["cambios"]
+    assert cambios["clientes"]["actualizados"][0]["nombre"] == "Ana María"
+    assert cambios["carros"] == {"creados": [], "actualizados": [], "eliminados": [id_carro]}
+
+
+def test_filas_con_el_formato_de_los_listados(cliente_http, db):
+    token = cliente_http.get("/api/sync").json()["token"]
+    carro = Carro(matricula="SYN002", marca="Kia", modelo="Rio", anio=2021,
+                  cliente_actual=Cliente(id_nacional="302", nombre="Eva", apellido="Soto"))
+    mecanico = Mecanico(id_nacional="M302", nombre="Leo")
+    trabajo = Trabajo(carro=carro, descripcion="Frenos", fecha=datetime(2025, 6, 2),
+                      costo=Decimal("500.00"), mano_obra=Decimal("200.00"))
+    db.add_all([mecanico, trabajo])
+    db.flush()
+    db.add(DetalleGasto(id_trabajo=trabajo.id, descripcion="Pastillas", monto=Decimal("100.00")))
+    db.add(ComisionMecanico(id_trabajo=trabajo.id, id_mecanico=mecanico.id, ganancia_trabajo=Decimal("100.00"),
+                            monto_comision=Decimal("2.00"), mes_reporte="2025-06"))
+    db.add(GastoTaller(descripcion="Luz", monto=Decimal("90.00"), categoria="Servicios", fecha_gasto=datetime(2025, 6, 3)))
+    db.commit()
+
+    cambios = cliente_http.get("/api/sync", params={"since": token}).json()["cambios"]
+    listados = {
+        "trabajos": "/api/trabajos/", "detalles_gastos": "/api/detalles-gastos", "clientes": "/api/clientes/",
+        "carros": "/api/carros/", "comisiones_mecanicos": "/api/mecanicos/todas-comisiones/",
+        "gastos_taller": "/api/gastos-taller/",
+    }
+    assert set(cambios) == set(listados)
+    for tabla, url in listados.items():
+        creados = cambios[tabla]["creados"]
+        listado = cliente_http.get(url).json()
+        # La fecha de registro de los clientes es la hora de la consulta
+        for fila in creados + listado:
+            fila.pop("registration_date", None)
+        assert creados == listado, tabla
+    assert cambios["trabajos"]["creados"][0]["matricula_carro"] == "SYN002"
+    assert cambios["trabajos"]["creados"][0]["ganancia_total"] == 400.0
+
+
+def test_actualizacion_masiva_se_registra(db):
+    gasto = GastoTaller(descripcion="Luz", monto=Decimal("100.00"), categoria="Servicios", fecha_gasto=datetime(2025, 1, 5))
+    db.add(gasto)
+    db.commit()
+    servicio = SincronizacionService(db)
+    token = servicio.token_actual()
+
+    db.query(GastoTaller).filter(GastoTaller.categoria == "Servicios").update({"monto": Decimal("120.00")})
+    db.commit()
+
+    cambios = servicio.obtener_cambios(token)["cambios"]
+    assert [g["monto"] for g in cambios["gastos_taller"]["actualizados"]] == [Decimal("120.00")]
+
+
+def test_token_no_salta_huecos_recientes(db):
+    viejo = ahora_utc() - timedelta(hours=1)
+    for id_registro, fecha in ((1, viejo), (2, viejo), (4, ahora_utc())):
+        db.add(RegistroCambio(id=id_registro, tabla="clientes", id_fila=str(id_registro),
+                              operacion=OperacionCambio.ELIMINAR, fecha=fecha))
+    db.commit()
+    servicio = SincronizacionService(db)
+
+    resultado = servicio.obtener_cambios(0)
+    assert resultado["token"] == 2
+    assert resultado["cambios"]["clientes"]["eliminados"] == [1, 2, 4]
+    # El token inicial (sync sin since y /api/eventos) tampoco salta el hueco
+    assert servicio.token_actual() == 2
+
+    db.query(RegistroCambio).filter(RegistroCambio.id == 4).update({"fecha": viejo})
+    db.commit()
+    assert servicio.obtener_cambios(0)["token"] == 4
+    assert servicio.token_actual() == 4